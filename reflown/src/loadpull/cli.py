@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+import json
+import shutil
 import time
 
 import typer
 from rich import print
 
+from .core.calibration import CalibrationStore
+from .core.caltable import precompile
+from .core.checkpoint import Checkpointer
 from .core.registry import INSTRUMENTS
-from .core.sequencing import Context, Sequence
+from .core.reprocess import cal_at, reprocess_run
+from .core.sequencing import Context, Env, Sequence
 from .core.session import BenchConfig, Session
 from .core.transforms import default_registry
 
@@ -17,6 +23,11 @@ app = typer.Typer(no_args_is_help=True)
 
 _TRANSFORM_REGISTRY = default_registry()
 
+# Files kept in each run directory for `loadpull resume`
+_SPEC_COPY = "testspec.yaml"
+_BENCH_COPY = "bench.toml"
+_CHECKPOINT = "checkpoint.pkl"
+
 def transform_measurement(method: str, payload: dict, cal_cache: dict) -> dict:
     return _TRANSFORM_REGISTRY.apply(method, payload, cal_cache)
 
@@ -48,6 +59,88 @@ def run(
     sequence = Sequence.load(testspec)
     out = f"runs/{sequence.name}/{ts}"
     out_dir = Path(out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Keep the exact spec and bench with the run so it can be resumed
+    shutil.copyfile(testspec, out_dir / _SPEC_COPY)
+    shutil.copyfile(bench, out_dir / _BENCH_COPY)
+    _execute(sequence, bench_cfg, out_dir, {"testspec": str(testspec), "bench_file": str(bench)})
+
+
+@app.command()
+def resume(
+    run_dir: str = typer.Argument(..., help="Run directory of an interrupted run"),
+) -> None:
+    """Continue an interrupted run after its last checkpointed point, appending to its logs."""
+    out_dir = Path(run_dir)
+    cp_path = out_dir / _CHECKPOINT
+    if not cp_path.exists():
+        print(f"[red]No checkpoint in {out_dir} (none completed, or the testspec has no "
+              "'checkpoint:'); start it again with 'run'")
+        raise typer.Exit(1)
+    state = Checkpointer.load(cp_path)
+    if state.get("complete"):
+        print(f"[green]Run in {out_dir} already completed")
+        return
+    sequence = Sequence.load(out_dir / _SPEC_COPY)
+    bench_cfg = BenchConfig.from_toml(out_dir / _BENCH_COPY)
+    Checkpointer.cut_files(state, out_dir)
+    manifest = out_dir / "manifest.json"
+    extra = json.loads(manifest.read_text()) if manifest.exists() else {}
+    extra = {k: v for k, v in extra.items() if k in ("testspec", "bench_file")}
+    print(f"[cyan]Resuming {sequence.name} after point {state['cursor']} ({state['ts']})")
+    _execute(sequence, bench_cfg, out_dir, {**extra, "resumed": state["ts"]}, state)
+
+
+@app.command()
+def reprocess(
+    run_dir: str = typer.Argument(..., help="Run directory to reprocess"),
+    source: str = typer.Option("results", help="Records to reprocess: 'results' or 'log'"),
+    out: Optional[str] = typer.Option(None, help="Output JSONL (default: <run_dir>/derived.jsonl)"),
+    cal: Optional[str] = typer.Option(
+        None, help="Calibration store JSON (default: the run's bench store)"),
+    cal_at_ts: Optional[str] = typer.Option(
+        None, "--cal-at",
+        help="Use cal values in effect at this UTC time, e.g. 2025-01-31T12:00:00Z"),
+    method: Optional[List[str]] = typer.Option(
+        None, help="Only re-apply these transforms (repeatable)"),
+    batch_size: int = typer.Option(256, help="Records per transform batch"),
+) -> None:
+    """Recompute a finished run's transform outputs from its recorded raw data."""
+    out_dir = Path(run_dir)
+    spec_path = out_dir / _SPEC_COPY
+    if not spec_path.exists():
+        print(f"[red]No {_SPEC_COPY} in {out_dir}; only runs recorded with their testspec "
+              "can be reprocessed")
+        raise typer.Exit(1)
+    sequence = Sequence.load(spec_path)
+    manifest_path = out_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    bench_name = manifest.get("bench")
+    if (out_dir / _BENCH_COPY).exists():
+        bench_name = BenchConfig.from_toml(out_dir / _BENCH_COPY).bench_name
+    cal_path = Path(cal) if cal else Path("calibration") / f"{bench_name}.json"
+    store = CalibrationStore(cal_path, bench_name=bench_name)
+    summary = reprocess_run(
+        out_dir, sequence.spec, _TRANSFORM_REGISTRY.apply_many, cal_at(store, cal_at_ts),
+        source=source, out=out, methods=method, batch_size=batch_size,
+    )
+    summary.update({"cal": str(cal_path), "cal_at": cal_at_ts,
+                    "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+    if manifest:
+        manifest.setdefault("reprocessed", []).append(summary)
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+    print(f"[green]Reprocessed {summary['records']} records ({summary['transformed']} transforms, "
+          f"{summary['errors']} errors) -> {summary['out']}")
+
+
+def _execute(
+    sequence: Sequence,
+    bench_cfg: BenchConfig,
+    out_dir: Path,
+    manifest: dict,
+    resume_state: Optional[dict] = None,
+) -> None:
+    """Open instruments and writers for ``out_dir`` and run (or resume) the sequence."""
     session = Session(bench_cfg, out_dir)
 
     instruments = {}
@@ -77,9 +170,9 @@ def run(
         print(f"[red]Bench missing required instruments: {', '.join(missing)}")
         raise typer.Exit(1)
     # Set up dual writers: log (all steps) and results (explicit updates, drives plotting)
-    from .core.results import DualWriter, JsonlWriter as _JsonlWriter
+    from .core.results import DualWriter, JsonlWriter as _JsonlWriter, open_log_writer
     plot_cfg: Optional[dict[str, object]] = sequence.spec.get("plot")
-    log_writer = _JsonlWriter(out_dir / "log.jsonl")
+    log_writer = open_log_writer(out_dir / "log.jsonl", sequence.spec.get("log"))
     if plot_cfg:
         from .core.plotting import LivePlotWriter
         results_writer = LivePlotWriter(out_dir / "results.jsonl", plot_cfg)
@@ -112,11 +205,38 @@ def run(
         shutdown_order=shutdown_order,
     )
 
+    env = None
+    # Opt-in; a resumed run keeps checkpointing even if the spec does not ask for it
+    cp_cfg = sequence.spec.get("checkpoint", False) or resume_state is not None
+    if cp_cfg:
+        cp_cfg = cp_cfg if isinstance(cp_cfg, dict) else {}
+        depth = cp_cfg.get("depth")
+        ctx.checkpoint = Checkpointer(
+            out_dir / _CHECKPOINT,
+            every=int(cp_cfg.get("every", 1)),
+            depth=int(depth) if depth is not None else None,
+            files=[p for p in (getattr(log_writer, "path", None),
+                               getattr(results_writer, "path", None)) if p],
+        )
+        if resume_state is not None:
+            ctx.checkpoint.restore(resume_state)
+            ctx.cal_cache.update(resume_state.get("cal_cache") or {})
+            env = Env(resume_state["env"])
+
+    # Compile frequency-indexed cal tables once, before the first sweep point
+    for value in ctx.cal_cache.values():
+        precompile(value)
+
+    manifest = {"test": sequence.name, "out": str(out_dir), **manifest}
+    session.record_manifest({**manifest, "status": "running"})
     try:
-        sequence.run(ctx)
+        sequence.run(ctx, env)
     finally:
         if hasattr(writer, "close"):
             writer.close()
+        if ctx.checkpoint is not None:
+            # After the writers: the last checkpoints wait for their records to land
+            ctx.checkpoint.close()
         # Close the unused default session writer if it exists
         if hasattr(session, "writer") and hasattr(session.writer, "close"):
             try:
@@ -124,10 +244,5 @@ def run(
             except Exception:
                 pass
 
-    session.record_manifest(
-        {
-            "test": sequence.name,
-            "out": str(out_dir),
-        }
-    )
+    session.record_manifest({**manifest, "status": "complete"})
     print(f"[green]Run complete. Results at {out_dir}")
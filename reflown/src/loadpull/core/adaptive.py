@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def _design(z: np.ndarray) -> np.ndarray:
+    """Quadratic basis 1, x, y, x², xy, y² of complex points."""
+    x, y = z.real, z.imag
+    return np.stack([np.ones_like(x), x, y, x * x, x * y, y * y], axis=-1)
+
+
+class AdaptiveSearch:
+    """Adaptive Γ search: fit a quadratic surface and measure where it matters.
+
+    Starts with ``center`` and a ring of ``ring`` points at ``radius``. Every new
+    measurement refits value = c0 + c1·x + c2·y + c3·x² + c4·xy + c5·y² (least squares,
+    coordinates relative to the centre) and the next point maximises
+    ``prediction + kappa·std`` on a grid around the predicted optimum, so points
+    go near the optimum or where the fit is uncertain. The search stops when the
+    optimum moved less than ``tol`` (in Γ) and the prediction std inside the
+    ``contour`` band (value ≥ optimum − contour) is below ``contour_tol``, or
+    after ``max_points``. ``maximize=False`` searches for a minimum.
+    """
+
+    def __init__(
+        self,
+        center: complex = 0j,
+        radius: float = 0.3,
+        ring: int = 8,
+        maximize: bool = True,
+        max_points: int = 40,
+        tol: float = 0.02,
+        contour: float = 1.0,
+        contour_tol: float = 0.2,
+        kappa: float = 1.0,
+        max_mag: float = 0.95,
+        min_spacing: float | None = None,
+    ):
+        if ring < 5:
+            raise ValueError("adaptive search needs a ring of at least 5 points "
+                             "for the quadratic fit")
+        self.center = complex(center)
+        self.radius = float(radius)
+        self.sign = 1.0 if maximize else -1.0
+        self.max_points = int(max_points)
+        self.tol = float(tol)
+        self.contour = float(contour)
+        self.contour_tol = float(contour_tol)
+        self.kappa = float(kappa)
+        self.max_mag = float(max_mag)
+        self.min_spacing = float(min_spacing) if min_spacing is not None else self.radius / 10
+        self.gammas: List[complex] = []
+        self.values: List[float] = []
+        self.converged = False
+        self._seed = [self.center] + [
+            self.center + self.radius * complex(math.cos(a), math.sin(a))
+            for a in np.linspace(0, 2 * math.pi, ring, endpoint=False)
+        ]
+        self._seed = [self._clip(g) for g in self._seed]
+        self._coef: Optional[np.ndarray] = None
+        self._cov: Optional[np.ndarray] = None
+        self._opt: Optional[complex] = None
+        self._prev_opt: Optional[complex] = None
+
+    def _clip(self, g: complex) -> complex:
+        mag = abs(g)
+        return g * (self.max_mag / mag) if mag > self.max_mag else g
+
+    # ---- measurements ----
+    def add(self, gamma: complex, value: float) -> None:
+        """Record a measured point; non-finite values or Γ are ignored by the fit."""
+        self.gammas.append(complex(gamma))
+        self.values.append(float(value))
+        if len(self.gammas) >= len(self._seed):
+            self._fit()
+
+    def next_point(self) -> Optional[complex]:
+        """Γ to measure next, or None when converged or out of points."""
+        n = len(self.gammas)
+        if n < len(self._seed):
+            return self._seed[n]
+        if self.converged or n >= self.max_points or self._coef is None:
+            return None
+        cand = self._candidates(self._opt if self._opt is not None else self.center)
+        if not len(cand):
+            return None
+        mu, sd = self.predict(cand, signed=True)
+        # Keep new points away from measured ones
+        g = np.asarray(self.gammas)
+        g = g[np.isfinite(g)]
+        dist = np.abs(cand[:, None] - g[None, :]).min(axis=1, initial=np.inf)
+        score = np.where(dist >= self.min_spacing, mu + self.kappa * sd, -np.inf)
+        k = int(np.argmax(score))
+        return complex(cand[k]) if np.isfinite(score[k]) else None
+
+    # ---- model ----
+    def _signed_values(self) -> np.ndarray:
+        """sign·value per point, NaN where the value or its Γ is not finite."""
+        v = self.sign * np.asarray(self.values, dtype=float)
+        return np.where(np.isfinite(np.asarray(self.gammas, dtype=complex)), v, np.nan)
+
+    def _fit(self) -> None:
+        z = np.asarray(self.gammas) - self.center
+        v = self._signed_values()
+        ok = np.isfinite(v)
+        if ok.sum() < 6:
+            return
+        a = _design(z[ok])
+        coef, *_ = np.linalg.lstsq(a, v[ok], rcond=None)
+        dof = int(ok.sum()) - 6
+        resid = v[ok] - a @ coef
+        sigma2 = float(resid @ resid) / dof if dof > 0 else 1.0
+        self._coef = coef
+        self._cov = sigma2 * np.linalg.pinv(a.T @ a)
+        self._prev_opt, self._opt = self._opt, self._optimum()
+        self._check_converged()
+
+    def predict(self, gammas: Any, signed: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """Fitted value and its standard deviation at ``gammas``."""
+        if self._coef is None:
+            raise RuntimeError("adaptive search has no fit yet")
+        a = _design(np.asarray(gammas, dtype=complex) - self.center)
+        mu = a @ self._coef
+        sd = np.sqrt(np.maximum(np.einsum("...i,ij,...j->...", a, self._cov, a), 0.0))
+        return (mu if signed else self.sign * mu), sd
+
+    def _candidates(self, around: complex, n: int = 12) -> np.ndarray:
+        step = self.radius / n
+        offs = np.arange(-n, n + 1) * step
+        grid = (around + offs[:, None] + 1j * offs[None, :]).ravel()
+        grid = grid[np.abs(grid - around) <= self.radius]
+        return grid[np.abs(grid) <= self.max_mag]
+
+    def _optimum(self) -> complex:
+        c = self._coef
+        hess = np.array([[2 * c[3], c[4]], [c[4], 2 * c[5]]])
+        if np.all(np.linalg.eigvalsh(hess) < 0):
+            x, y = np.linalg.solve(hess, -c[1:3])
+            g = self.center + complex(x, y)
+            if abs(g) <= self.max_mag:
+                return g
+        # Saddle/bowl or stationary point off the chart: best fitted point nearby
+        best = self.gammas[int(np.nanargmax(self._signed_values()))]
+        cand = np.concatenate([self._candidates(best), self._candidates(self.center)])
+        mu, _ = self.predict(cand, signed=True)
+        return complex(cand[int(np.argmax(mu))])
+
+    def _check_converged(self) -> None:
+        if self._prev_opt is None or abs(self._opt - self._prev_opt) >= self.tol:
+            return
+        cand = self._candidates(self._opt)
+        mu, sd = self.predict(cand, signed=True)
+        peak, _ = self.predict([self._opt], signed=True)
+        band = mu >= peak[0] - self.contour
+        self.converged = bool(band.any() and sd[band].max() <= self.contour_tol)
+
+    # ---- results ----
+    def contour_points(self, drop: float | None = None, n: int = 36) -> List[complex]:
+        """Γ where the fit falls ``drop`` (default ``contour``) below the optimum, along n rays."""
+        drop = self.contour if drop is None else drop
+        c = self._coef
+        peak, _ = self.predict([self._opt], signed=True)
+        target = peak[0] - drop
+        out: List[complex] = []
+        for ang in np.linspace(0, 2 * math.pi, n, endpoint=False):
+            u = complex(math.cos(ang), math.sin(ang))
+            # value(opt + t·u) along the ray is quadratic in t
+            z0 = self._opt - self.center
+            qa = c[3] * u.real ** 2 + c[4] * u.real * u.imag + c[5] * u.imag ** 2
+            qb = (c[1] * u.real + c[2] * u.imag + 2 * c[3] * z0.real * u.real
+                  + c[4] * (z0.real * u.imag + z0.imag * u.real) + 2 * c[5] * z0.imag * u.imag)
+            if abs(qa) > 1e-12:
+                roots = np.roots([qa, qb, peak[0] - target])
+            else:
+                roots = np.array([drop / -qb]) if qb < 0 else np.array([])
+            ts = [r.real for r in np.atleast_1d(roots) if abs(r.imag) < 1e-9 and r.real > 0]
+            if ts:
+                g = self._opt + min(ts) * u
+                if abs(g) <= 1.0:
+                    out.append(g)
+        return out
+
+    def result(self) -> Dict[str, Any]:
+        """Optimum, best measured point and the fitted contour as plain values."""
+        vals = self._signed_values()
+        # Every point may have failed (NaN); then there is no best measured point
+        best = int(np.nanargmax(vals)) if len(vals) and not np.isnan(vals).all() else None
+        out: Dict[str, Any] = {"points": len(self.gammas), "converged": self.converged}
+        if best is not None:
+            g = self.gammas[best]
+            out["best_measured"] = {**_gamma_dict(g), "value": self.values[best]}
+        if self._coef is not None and self._opt is not None:
+            mu, sd = self.predict([self._opt])
+            out.update(_gamma_dict(self._opt))
+            out["value"] = float(mu[0])
+            out["std"] = float(sd[0])
+            out["coef"] = (self.sign * self._coef).tolist()
+            out["contour"] = [_gamma_dict(g) for g in self.contour_points()]
+        return out
+
+
+def _gamma_dict(g: complex) -> Dict[str, float]:
+    return {
+        "gamma_mag": abs(g),
+        "gamma_deg": math.degrees(math.atan2(g.imag, g.real)),
+        "real": g.real,
+        "imag": g.imag,
+    }
+
+
+def gamma_from(value: Any) -> complex:
+    """Γ from a complex, {real, imag}, {gamma_mag, gamma_deg}, {mag, deg} or {mag, angle_rad}.
+
+    List fields (e.g. corr_gamma over a trace) are averaged.
+    """
+    if isinstance(value, dict):
+        if "real" in value and "imag" in value:
+            return complex(scalar(value["real"]), scalar(value["imag"]))
+        mag = value.get("gamma_mag", value.get("mag"))
+        if "angle_rad" in value:
+            rad = scalar(value["angle_rad"])
+        else:
+            deg = value.get("gamma_deg", value.get("deg"))
+            rad = math.radians(scalar(deg)) if deg is not None else None
+        if mag is not None and rad is not None:
+            return scalar(mag) * complex(math.cos(rad), math.sin(rad))
+        raise ValueError(f"Cannot read a gamma from {value!r}")
+    return complex(value)
+
+
+def scalar(value: Any) -> float:
+    """A float from a number or the mean of the finite entries of a list/array."""
+    arr = np.asarray(value, dtype=float).ravel()
+    arr = arr[np.isfinite(arr)]
+    return float(arr.mean()) if arr.size else float("nan")
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Protocol
+
+from .scpi import ERR_POLICIES, Scpi, ScpiError, _is_error, _split_piggyback
+from .transport import Transport, VisaTransport, _block_parser
+
+
+class AsyncTransport(Protocol):
+    async def open(self) -> None: ...
+    async def close(self) -> None: ...
+    async def write(self, data: str) -> None: ...
+    async def read(self, timeout_s: float) -> str: ...
+    async def read_block(self, timeout_s: float) -> bytes: ...
+
+
+class AsyncSocketTransport:
+    """SCPI over a TCP socket with asyncio streams."""
+
+    def __init__(self, host: str, port: int = 5025, terminator: str = "\n"):
+        self._addr = (host, port)
+        self._term = terminator.encode()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def open(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(asyncio.open_connection(*self._addr), 5)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            try:
+                self._writer.close()
+                await self._writer.wait_closed()
+            finally:
+                self._reader = self._writer = None
+
+    async def write(self, data: str) -> None:
+        assert self._writer is not None, "Transport not open"
+        self._writer.write(data.encode() + self._term)
+        await self._writer.drain()
+
+    async def read(self, timeout_s: float) -> str:
+        assert self._reader is not None, "Transport not open"
+        line = await asyncio.wait_for(self._reader.readuntil(self._term), timeout_s)
+        return line[: -len(self._term)].decode()
+
+    async def read_block(self, timeout_s: float) -> bytes:
+        assert self._reader is not None, "Transport not open"
+        return await asyncio.wait_for(_aread_block(self._reader.readexactly), timeout_s)
+
+
+async def _aread_block(read_exact: Callable[[int], Any]) -> bytes:
+    """Async counterpart of transport._read_block (same _block_parser)."""
+    parser = _block_parser()
+    n = next(parser)
+    try:
+        while True:
+            n = parser.send(await read_exact(n))
+    except StopIteration as done:
+        return done.value
+
+
+class ThreadedTransport:
+    """Async adapter for a blocking Transport: every call runs on one dedicated thread.
+
+    A single thread keeps the calls ordered and satisfies drivers (VISA) that expect
+    a session to stay on one thread.
+    """
+
+    def __init__(self, transport: Transport):
+        self.transport = transport
+        self._pool = ThreadPoolExecutor(1, thread_name_prefix="loadpull-io")
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    async def open(self) -> None:
+        await self._call(self.transport.open)
+
+    async def close(self) -> None:
+        try:
+            await self._call(self.transport.close)
+        finally:
+            self._pool.shutdown(wait=False)
+
+    async def write(self, data: str) -> None:
+        await self._call(self.transport.write, data)
+
+    async def read(self, timeout_s: float) -> str:
+        return await self._call(self.transport.read, timeout_s)
+
+    async def read_block(self, timeout_s: float) -> bytes:
+        return await self._call(self.transport.read_block, timeout_s)
+
+
+class AsyncVisaTransport(ThreadedTransport):
+    """VisaTransport with its blocking PyVISA calls offloaded to a thread."""
+
+    def __init__(self, resource: str, timeout_ms: int = 3000):
+        super().__init__(VisaTransport(resource, timeout_ms=timeout_ms))
+
+
+class AsyncScpi:
+    """Awaitable SCPI session.
+
+    An asyncio lock keeps each command/response exchange whole when several
+    coroutines share the session. Error polling follows Scpi: ``query`` polls after
+    every query, ``piggyback`` appends ';:SYST:ERR?', other policies defer to
+    check_errors() (the sequencer drains them through the async engine). Batching
+    and the state cache are sync-Scpi only.
+    """
+
+    def __init__(self, transport: AsyncTransport, err_poll: bool = True, err_policy: str = "query"):
+        self.t = transport
+        self.err_poll = err_poll
+        if err_policy not in ERR_POLICIES:
+            raise ValueError(f"Unknown SCPI error policy '{err_policy}' "
+                             f"(expected one of {ERR_POLICIES})")
+        self.err_policy = err_policy
+        self._unchecked: List[str] = []
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending_check(self) -> bool:
+        """True if commands were sent since the last error check."""
+        return bool(self._unchecked)
+
+    async def write(self, cmd: str) -> None:
+        async with self._lock:
+            await self.t.write(cmd)
+            self._record(cmd)
+
+    async def query(self, cmd: str, timeout_s: float = 3.0) -> str:
+        async with self._lock:
+            if self.err_poll and self.err_policy == "piggyback":
+                await self.t.write(f"{cmd};:SYST:ERR?")
+                out, err = _split_piggyback(await self.t.read(timeout_s))
+                await self._raise_errors([cmd], err, timeout_s)
+                return out
+            await self.t.write(cmd)
+            out = await self.t.read(timeout_s)
+            await self._poll_error(cmd, timeout_s)
+            return out
+
+    async def query_block(self, cmd: str, timeout_s: float = 3.0) -> bytes:
+        return (await self.query_blocks(cmd, 1, timeout_s))[0]
+
+    async def query_blocks(self, cmd: str, count: int, timeout_s: float = 3.0) -> List[bytes]:
+        async with self._lock:
+            if self.err_poll and self.err_policy == "piggyback":
+                # The ';' after the last block is consumed by read_block; the error follows
+                await self.t.write(f"{cmd};:SYST:ERR?")
+                out = [await self.t.read_block(timeout_s) for _ in range(count)]
+                await self._raise_errors([cmd], await self.t.read(timeout_s), timeout_s)
+                return out
+            await self.t.write(cmd)
+            out = [await self.t.read_block(timeout_s) for _ in range(count)]
+            await self._poll_error(cmd, timeout_s)
+            return out
+
+    async def opc(self, timeout_s: float = 60.0) -> bool:
+        """Wait for pending operations (*OPC?) without holding up other instruments."""
+        return (await self.query("*OPC?", timeout_s)).strip() in ("1", "+1")
+
+    async def check_errors(self, timeout_s: float = 3.0, raise_on_error: bool = True) -> List[str]:
+        async with self._lock:
+            commands, self._unchecked = self._unchecked, []
+            errors = await self._drain(timeout_s)
+        if errors and raise_on_error:
+            raise ScpiError(errors, commands)
+        return errors
+
+    def _record(self, cmd: str) -> None:
+        if self.err_poll and self.err_policy != "query":
+            self._unchecked.append(cmd)
+            if len(self._unchecked) > Scpi.max_unchecked:
+                del self._unchecked[0]
+
+    async def _drain(self, timeout_s: float, first: str | None = None) -> List[str]:
+        errors: List[str] = []
+        err = first
+        if err is None:
+            await self.t.write("SYST:ERR?")
+            err = await self.t.read(timeout_s)
+        while _is_error(err) and len(errors) < 32:
+            errors.append(err)
+            await self.t.write("SYST:ERR?")
+            err = await self.t.read(timeout_s)
+        return errors
+
+    async def _poll_error(self, cmd: str, timeout_s: float) -> None:
+        if self.err_poll and self.err_policy == "query":
+            await self.t.write("SYST:ERR?")
+            await self._raise_errors([cmd], await self.t.read(timeout_s), timeout_s)
+        else:
+            self._record(cmd)
+
+    async def _raise_errors(self, commands: List[str], first: str, timeout_s: float) -> None:
+        errors = await self._drain(timeout_s, first=first)
+        if errors:
+            pending, self._unchecked = self._unchecked, []
+            raise ScpiError(errors, pending + commands)
+
+
+class AsyncEngine:
+    """Runs instrument calls on an asyncio loop in a background thread.
+
+    Each instrument is a lane: its calls run in submission order, while calls on
+    different instruments overlap. ``async def`` driver methods run on the loop;
+    blocking methods run on the instrument's own worker thread (executor shim).
+    Launched calls are tracked until ``join`` applies their results in launch order.
+    """
+
+    def __init__(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="loadpull-aio",
+                                        daemon=True)
+        self._thread.start()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._pending: List[tuple[str, Future, Callable[[Any], None]]] = []
+
+    def submit(self, key: str, fn: Callable[..., Any], *args: Any) -> Future:
+        """Schedule ``fn(*args)`` in lane ``key``; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(self._run(key, fn, args), self._loop)
+
+    def call(self, key: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` in lane ``key`` and wait for its result."""
+        return self.submit(key, fn, *args).result()
+
+    def launch(self, key: str, fn: Callable[..., Any], args: List[Any],
+               done: Callable[[Any], None]) -> None:
+        """Start ``fn(*args)`` now; ``done(result)`` runs on the caller's thread at join."""
+        self._pending.append((key, self.submit(key, fn, *args), done))
+
+    def busy(self, key: str) -> bool:
+        """True if calls launched in lane ``key`` have not been joined yet."""
+        return any(item[0] == key for item in self._pending)
+
+    def join(self, keys: Any = None) -> None:
+        """Wait for launched calls (all, or those in lanes ``keys``) and apply their results.
+
+        Every selected call is waited for; the first error is raised afterwards.
+        """
+        keep, ready = [], []
+        for item in self._pending:
+            (ready if keys is None or item[0] in keys else keep).append(item)
+        self._pending = keep
+        error: BaseException | None = None
+        for _key, fut, done in ready:
+            try:
+                result = fut.result()
+            except BaseException as exc:
+                error = error or exc
+                continue
+            if error is None:
+                done(result)
+        if error is not None:
+            raise error
+
+    def wait_all(self) -> None:
+        """Wait for launched calls without applying results or raising (shutdown path)."""
+        pending, self._pending = self._pending, []
+        for _key, fut, _done in pending:
+            try:
+                fut.result()
+            except BaseException:
+                pass
+
+    def close(self) -> None:
+        self.wait_all()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+
+    async def _run(self, key: str, fn: Callable[..., Any], args: tuple) -> Any:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        async with lock:
+            if inspect.iscoroutinefunction(fn):
+                return await fn(*args)
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = ThreadPoolExecutor(
+                    1, thread_name_prefix=f"loadpull-{key}")
+            return await self._loop.run_in_executor(pool, functools.partial(fn, *args))
@@ -7,6 +7,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional
 
+from .results import json_default
+
 _HISTORY_KEY = "__history__"
 _MAX_CAL_FILE_BYTES = 5 * 1024 * 1024  # 5 MB cap for calibration store
 
@@ -86,7 +88,7 @@ class CalibrationStore:
     def _trim_history_to_size(self, max_bytes: int) -> None:
         """Drop oldest history entries until serialized size fits under max_bytes."""
         def serialized_size() -> int:
-            payload = json.dumps(self._data, indent=2, sort_keys=True)
+            payload = json.dumps(self._data, indent=2, sort_keys=True, default=json_default)
             return len(payload.encode("utf-8"))
 
         # If no history bucket exists, nothing to trim.
@@ -128,7 +130,7 @@ class CalibrationStore:
     def save(self) -> None:
         """Persist the current calibration map to disk."""
         self._trim_history_to_size(_MAX_CAL_FILE_BYTES)
-        payload = json.dumps(self._data, indent=2, sort_keys=True)
+        payload = json.dumps(self._data, indent=2, sort_keys=True, default=json_default)
         tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
         tmp_path.write_text(payload + "\n", encoding="utf-8")
         tmp_path.replace(self.path)
@@ -143,6 +145,10 @@ class CalibrationStore:
         entries = history_bucket.get(name, [])
         return list(entries) if isinstance(entries, list) else []
 
+    def history_names(self) -> list[str]:
+        """Return the names that have archived entries for the active bench."""
+        return sorted(self._history_root().keys())
+
     def set(self, name: str, value: Any) -> None:
         """Save or update a calibration constant, archiving any previous value."""
         bucket = self._ensure_bucket()
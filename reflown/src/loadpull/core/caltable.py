@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping
+
+import numpy as np
+
+_FREQ_KEYS = ("freq_hz", "frequency", "freq")
+_MAX_MEMO = 64
+
+
+@dataclass(frozen=True)
+class CalTable:
+    """Immutable, frequency-indexed view of a calibration payload.
+
+    Every ``{real, imag}`` (or numeric list) entry with one value per frequency becomes
+    a read-only complex column in ``terms``; anything else (single values, metadata)
+    is kept in ``scalars``. Frequencies are sorted and indexed, so ``row(f)`` is a
+    dict lookup; frequencies off the grid can be interpolated linearly.
+    """
+    freq_hz: np.ndarray
+    terms: Mapping[str, np.ndarray]
+    scalars: Mapping[str, Any]
+    digest: str
+    _index: Dict[int, int] = field(default_factory=dict, repr=False, compare=False)
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any], digest: str | None = None) -> "CalTable":
+        freq = _axis(next((payload[k] for k in _FREQ_KEYS if k in payload), None))
+        order = np.argsort(freq, kind="stable")
+        freq = freq[order]
+        freq.flags.writeable = False
+        terms: Dict[str, np.ndarray] = {}
+        scalars: Dict[str, Any] = {}
+        for name, value in payload.items():
+            if name in _FREQ_KEYS or str(name).lower() == "csv":
+                continue
+            arr = _column(value)
+            if arr is not None and freq.size and arr.size == freq.size:
+                arr = arr[order]
+                arr.flags.writeable = False
+                terms[name] = arr
+            elif arr is not None and arr.size == 1:
+                scalars[name] = complex(arr[0])
+            else:
+                scalars[name] = value
+        return cls(
+            freq,
+            MappingProxyType(terms),
+            MappingProxyType(scalars),
+            digest or content_hash(payload),
+            {_key(f): i for i, f in enumerate(freq.tolist())},
+        )
+
+    # ---- lookups ----
+    def find(self, freq_hz: float, atol: float = 1.0) -> int | None:
+        """Grid index of ``freq_hz`` (within ``atol`` Hz), or None."""
+        i = self._index.get(_key(freq_hz))
+        if i is not None:
+            return i
+        j = int(grid_index(self.freq_hz, freq_hz, atol, is_sorted=True)[0])
+        return j if j >= 0 else None
+
+    def has(self, freq_hz: float, atol: float = 1.0) -> bool:
+        return self.find(freq_hz, atol) is not None
+
+    def row(self, freq_hz: float, interpolate: bool = False,
+            atol: float = 1.0) -> Dict[str, complex]:
+        """All terms at one frequency (plus the scalars)."""
+        i = self.find(freq_hz, atol)
+        if i is not None:
+            out: Dict[str, Any] = {name: complex(arr[i]) for name, arr in self.terms.items()}
+        elif interpolate and self.freq_hz.size:
+            out = {name: complex(v[0]) for name, v in self.at([freq_hz], interpolate=True).items()}
+        else:
+            raise KeyError(f"{freq_hz} Hz is not on the calibration grid")
+        for name, value in self.scalars.items():
+            out.setdefault(name, value)
+        return out
+
+    def at(self, freq_hz: Iterable[float], interpolate: bool = False,
+           atol: float = 1.0) -> Dict[str, np.ndarray]:
+        """Term columns on another frequency grid (exact matches, or linear interpolation)."""
+        want = np.atleast_1d(np.asarray(freq_hz, dtype=float))
+        if interpolate:
+            return {name: np.interp(want, self.freq_hz, arr.real)
+                    + 1j * np.interp(want, self.freq_hz, arr.imag)
+                    for name, arr in self.terms.items()}
+        take = grid_index(self.freq_hz, want, atol, is_sorted=True)
+        if (take < 0).any():
+            missing = want[take < 0][:5].tolist()
+            raise KeyError(f"frequencies not on the calibration grid: {missing}")
+        return {name: arr[take] for name, arr in self.terms.items()}
+
+    def term(self, name: str, freq_hz: float, interpolate: bool = False) -> complex:
+        """One term at one frequency; NaN if the table does not have it."""
+        if name in self.scalars:
+            return self.scalars[name]
+        if name not in self.terms:
+            return complex(np.nan, np.nan)
+        return self.row(freq_hz, interpolate)[name]
+
+    def derived(self, name: str, build: Callable[["CalTable"], Any]) -> Any:
+        """An object computed from this table (e.g. ErrorTerms), built once and kept with it."""
+        value = self._derived.get(name)
+        if value is None:
+            value = self._derived[name] = build(self)
+        return value
+
+
+def grid_index(grid: np.ndarray, freq_hz: Any, atol: float = 1.0,
+               is_sorted: bool = False) -> np.ndarray:
+    """Index of the nearest ``grid`` point for each frequency, -1 where none is within ``atol`` Hz.
+
+    The one frequency-matching rule for calibration data (CalTable, ErrorTerms).
+    """
+    want = np.atleast_1d(np.asarray(freq_hz, dtype=float))
+    if not grid.size:
+        return np.full(want.shape, -1, dtype=int)
+    order = np.arange(grid.size) if is_sorted else np.argsort(grid, kind="stable")
+    g = grid[order]
+    pos = np.searchsorted(g, want)
+    lo = np.clip(pos - 1, 0, g.size - 1)
+    hi = np.clip(pos, 0, g.size - 1)
+    near = np.where(np.abs(want - g[lo]) <= np.abs(want - g[hi]), lo, hi)
+    return np.where(np.abs(g[near] - want) <= atol, order[near], -1)
+
+
+def _key(freq_hz: float) -> int:
+    return int(round(float(freq_hz)))
+
+
+def _axis(value: Any) -> np.ndarray:
+    if isinstance(value, Mapping):
+        value = value.get("x_data")
+    if value is None:
+        return np.zeros(0)
+    return np.atleast_1d(np.asarray(value, dtype=float)).copy()
+
+
+def _column(value: Any) -> np.ndarray | None:
+    try:
+        if isinstance(value, Mapping):
+            if "real" not in value or "imag" not in value:
+                return None
+            real = np.asarray(value["real"], dtype=float)
+            return (real + 1j * np.asarray(value["imag"], dtype=float)).ravel()
+        if isinstance(value, (list, tuple, np.ndarray, int, float, complex, np.number)):
+            return np.atleast_1d(np.asarray(value, dtype=complex)).ravel().copy()
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def content_hash(value: Any) -> str:
+    """Stable digest of a calibration payload (dicts, lists, arrays, numbers, strings)."""
+    h = hashlib.sha1()
+    _feed(h, value)
+    return h.hexdigest()
+
+
+def _feed(h: Any, value: Any) -> None:
+    if isinstance(value, Mapping):
+        h.update(b"{")
+        for k in sorted(value, key=str):
+            h.update(str(k).encode() + b":")
+            _feed(h, value[k])
+        h.update(b"}")
+    elif isinstance(value, np.ndarray):
+        h.update(f"a{value.dtype.str}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for item in value:
+            _feed(h, item)
+            h.update(b",")
+        h.update(b"]")
+    else:
+        h.update(repr(value).encode())
+
+
+# Compiled tables: by payload identity (the object is kept to validate the id) and by content
+_BY_ID: Dict[int, tuple[Any, CalTable]] = {}
+_BY_HASH: Dict[str, CalTable] = {}
+
+
+def cal_table(payload: Any) -> CalTable:
+    """CalTable for a calibration payload, compiled once and memoized.
+
+    The same payload object (e.g. a cal_cache entry passed as ``${cal.name}``) is an
+    identity lookup; an equal payload loaded again is found by content hash. Payloads
+    are assumed not to be mutated in place after they are compiled.
+    """
+    if isinstance(payload, CalTable):
+        return payload
+    if not isinstance(payload, Mapping):
+        raise ValueError("calibration table payload must be a mapping, "
+                         f"got {type(payload).__name__}")
+    hit = _BY_ID.get(id(payload))
+    if hit is not None and hit[0] is payload:
+        return hit[1]
+    digest = content_hash(payload)
+    table = _BY_HASH.get(digest)
+    if table is None:
+        table = CalTable.from_payload(payload, digest)
+        if len(_BY_HASH) >= _MAX_MEMO:
+            _BY_HASH.clear()
+        _BY_HASH[digest] = table
+    if len(_BY_ID) >= _MAX_MEMO:
+        _BY_ID.clear()
+    _BY_ID[id(payload)] = (payload, table)
+    return table
+
+
+def precompile(value: Any) -> None:
+    """Compile the tables inside a cal value as it enters cal_cache.
+
+    The value itself and its direct mapping members are compiled if they have a
+    frequency axis, so the first transform at a sweep point does not pay for it.
+    """
+    if not isinstance(value, Mapping):
+        return
+    for item in (value, *value.values()):
+        if isinstance(item, Mapping) and any(k in item for k in _FREQ_KEYS):
+            cal_table(item)
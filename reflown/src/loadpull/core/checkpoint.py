@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import os
+import pickle
+import queue
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .sequencing import _copy_dicts
+
+_VERSION = 2
+
+
+class Checkpointer:
+    """Saves the sequencer's position after completed sweep points so a run can resume.
+
+    The cursor is the path through the action tree: the index of each action in its
+    ``do:`` list, and for loops the index of the iteration. A checkpoint is taken
+    after every ``every``-th completed point of loops at most ``depth`` levels deep.
+
+    The file is a chain of pickled frames: the first holds the full env and cal cache,
+    later ones only the cursor, the top-level env keys and cal entries that changed,
+    and the sizes of the log files once the point's records reached them (reported by
+    the writers' ``mark``, in write order). Pickling and fsync run on a checkpoint
+    thread, so the measurement thread never waits on disk; a torn last frame is
+    ignored on load. Values that cannot be pickled are left out with a warning.
+    """
+
+    compact_every = 256  # frames appended before the chain is rewritten as one frame
+
+    def __init__(self, path: str | Path, every: int = 1, depth: int | None = None,
+                 files: List[str | Path] | None = None):
+        if every < 1:
+            raise ValueError("checkpoint 'every' must be >= 1")
+        self.path = Path(path)
+        self.every = every
+        self.depth = depth
+        self.files = [Path(f) for f in files or []]
+        self.stack: List[int] = []
+        self.resume_at: List[int] | None = None
+        self.saved = 0
+        self._loops = 0
+        self._points = 0
+        # Measurement-thread view of what has been handed to the checkpoint thread
+        self._rev = -1  # env revision of the last save; -1 = nothing saved yet
+        self._keys: set = set()
+        self._cal_ids: Dict[str, int] = {}
+        # Frames waiting for their file sizes, in save order
+        self._waiting: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._q: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    # ---- cursor ----
+    def resume_index(self) -> int:
+        """First action to run in the ``do:`` list at the current depth."""
+        if self.resume_at is None or len(self.stack) >= len(self.resume_at):
+            return 0
+        return self.resume_at[len(self.stack)]
+
+    def resume_loop(self) -> int:
+        """First iteration to run for the loop at the current depth.
+
+        The iteration the checkpoint was taken after is skipped; an iteration that
+        was in progress at a deeper checkpoint is re-entered.
+        """
+        if self.resume_at is None or len(self.stack) >= len(self.resume_at):
+            return 0
+        depth = len(self.stack)
+        index = self.resume_at[depth]
+        if depth == len(self.resume_at) - 1:
+            self.resume_at = None  # caught up: run normally from here
+            return index + 1
+        return index
+
+    @property
+    def loop_depth(self) -> int:
+        """Number of loops the current position is inside."""
+        return self._loops
+
+    def enter(self, index: int, loop: bool = False) -> None:
+        self.stack.append(index)
+        self._loops += loop
+
+    def leave(self, loop: bool = False) -> None:
+        self.stack.pop()
+        self._loops -= loop
+
+    def point_done(self, env: Dict[str, Any], ctx: Any) -> None:
+        """Called after each loop iteration (the iteration index is on the stack)."""
+        if self.depth is not None and self._loops > self.depth:
+            return
+        self._points += 1
+        if self._points % self.every == 0:
+            self.save(env, ctx)
+
+    # ---- state ----
+    def save(self, env: Dict[str, Any], ctx: Any, complete: bool = False) -> None:
+        """Queue a checkpoint of the current position; returns without touching the disk."""
+        self._raise_pending()
+        frame = self._frame(env, ctx.cal_cache)
+        frame.update({
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "cursor": list(self.stack),
+            "complete": complete,
+            "files": {},
+            "missing": {p.name for p in self.files},
+        })
+        with self._lock:
+            self._waiting.append(frame)
+        self.saved += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name=f"checkpoint:{self.path}",
+                                            daemon=True)
+            self._thread.start()
+
+        def on_mark(path: Path, size: int) -> None:
+            with self._lock:
+                if path.name in frame["missing"]:
+                    frame["missing"].discard(path.name)
+                    frame["files"][path.name] = size
+                self._release()
+
+        mark = getattr(ctx.writer, "mark", None)
+        if mark is not None and self.files:
+            mark(on_mark)
+        else:
+            flush = getattr(ctx.writer, "flush", None)
+            if flush is not None:
+                flush()
+            for p in self.files:
+                on_mark(p, p.stat().st_size if p.exists() else 0)
+            with self._lock:
+                self._release()
+
+    def close(self) -> None:
+        """Wait until every checkpoint whose log records were written is on disk."""
+        if self._thread is not None:
+            self._q.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_pending()
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Arm the cursor from a loaded checkpoint; the next run skips what it covers."""
+        self.resume_at = list(state["cursor"]) or None
+
+    def _frame(self, env: Dict[str, Any], cal_cache: Dict[str, Any]) -> Dict[str, Any]:
+        """Env and cal entries changed since the last save (everything on the first)."""
+        delta = getattr(env, "delta", None)
+        if self._rev < 0 or delta is None:
+            keys, drop = set(env), set(self._keys) - set(env)
+        else:
+            changed, removed = delta(self._rev)
+            keys, drop = set(), set()
+            for flat in list(changed) + removed:
+                top = self._top_key(flat, env)
+                (keys if top in env else drop).add(top)
+        frame: Dict[str, Any] = {
+            "base": self._rev < 0,
+            # Nested dicts are still assigned into on the measurement thread after the save
+            "set": _copy_dicts({k: env[k] for k in keys}),
+            "drop": sorted(drop),
+        }
+        self._rev = getattr(env, "rev", 0)
+        self._keys = set(env)
+        cal_ids = {k: id(v) for k, v in cal_cache.items()}
+        frame["cal"] = {k: v for k, v in cal_cache.items() if self._cal_ids.get(k) != cal_ids[k]}
+        frame["cal_drop"] = [k for k in self._cal_ids if k not in cal_ids]
+        self._cal_ids = cal_ids
+        return frame
+
+    def _top_key(self, flat: str, env: Dict[str, Any]) -> str:
+        parts = flat.split(".")
+        for i in range(1, len(parts) + 1):
+            key = ".".join(parts[:i])
+            if key in env or key in self._keys:
+                return key
+        return flat
+
+    def _release(self) -> None:
+        # Hand complete frames over in save order (caller holds the lock)
+        while self._waiting and not self._waiting[0]["missing"]:
+            frame = self._waiting.pop(0)
+            del frame["missing"]
+            self._q.put(frame)
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise RuntimeError(f"Checkpoint writer for {self.path} failed") from err
+
+    def _loop(self) -> None:
+        state: Dict[str, Any] = {}
+        frames = 0
+        while True:
+            frame = self._q.get()
+            if frame is None:
+                return
+            try:
+                state = _apply(state, frame)
+                frames += 1
+                if frame["base"] or frames > self.compact_every:
+                    base = {k: state[k] for k in ("ts", "cursor", "complete", "files")}
+                    base.update(base=True, set=state["env"], drop=[], cal=state["cal_cache"],
+                                cal_drop=[])
+                    self._write(_dumps(base), replace=True)
+                    frames = 1
+                else:
+                    self._write(_dumps(frame), replace=False)
+            except BaseException as exc:  # surfaced on the next save()/close()
+                frames = self.compact_every  # the chain misses this frame: rewrite it whole next
+                if self._error is None:
+                    self._error = exc
+
+    def _write(self, data: bytes, replace: bool) -> None:
+        path = self.path.with_name(self.path.name + ".tmp") if replace else self.path
+        with open(path, "wb" if replace else "ab") as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        if replace:
+            os.replace(path, self.path)
+
+    @staticmethod
+    def cut_files(state: Dict[str, Any], directory: str | Path) -> None:
+        """Truncate the run's logs to their size at the checkpoint (before reopening them).
+
+        Records of the interrupted point are dropped so it is logged once when re-run.
+        Gzip logs cannot be cut mid-stream and keep those records.
+        """
+        for name, size in (state.get("files") or {}).items():
+            path = Path(directory) / name
+            if path.exists() and not name.endswith(".gz") and path.stat().st_size > size:
+                with open(path, "r+b") as fp:
+                    fp.truncate(size)
+
+    @staticmethod
+    def load(path: str | Path) -> Dict[str, Any]:
+        """Replay the frame chain into one state (cursor, env, cal_cache, files, ...)."""
+        state: Dict[str, Any] = {}
+        with open(path, "rb") as fp:
+            while True:
+                try:
+                    frame = pickle.load(fp)
+                except EOFError:
+                    break
+                except Exception:
+                    if not state:
+                        raise ValueError(f"Unsupported checkpoint file: {path}")
+                    break  # torn frame from an interrupted write
+                if not state and (not isinstance(frame, dict) or frame.get("version") != _VERSION
+                                  or not frame.get("base")):
+                    raise ValueError(f"Unsupported checkpoint file: {path}")
+                state = _apply(state, frame)
+        if not state:
+            raise ValueError(f"Unsupported checkpoint file: {path}")
+        return state
+
+
+def _apply(state: Dict[str, Any], frame: Dict[str, Any]) -> Dict[str, Any]:
+    if frame.get("base"):
+        env: Dict[str, Any] = {}
+        cal: Dict[str, Any] = {}
+    else:
+        env, cal = state["env"], state["cal_cache"]
+    for k in frame["drop"]:
+        env.pop(k, None)
+    env.update(frame["set"])
+    for k in frame["cal_drop"]:
+        cal.pop(k, None)
+    cal.update(frame["cal"])
+    return {
+        "version": _VERSION,
+        "ts": frame["ts"],
+        "cursor": frame["cursor"],
+        "complete": frame["complete"],
+        "env": env,
+        "cal_cache": cal,
+        "files": frame["files"],
+    }
+
+
+def _dumps(frame: Dict[str, Any]) -> bytes:
+    """Pickle a frame, leaving out (with a warning) env/cal values that cannot be pickled."""
+    frame = {**frame, "version": _VERSION}
+    try:
+        return pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        pass
+    for field in ("set", "cal"):
+        kept = {}
+        for k, v in frame[field].items():
+            try:
+                pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as exc:
+                warnings.warn(f"Checkpoint skips '{k}': cannot be pickled ({exc})", RuntimeWarning)
+                continue
+            kept[k] = v
+        frame[field] = kept
+    return pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)
+
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping
+
+import numpy as np
+
+from .caltable import CalTable, cal_table, grid_index
+
+# get_error_terms() keys (RSZVA) and the short names used in probe cal files
+_TERM_KEYS: Dict[str, tuple[str, ...]] = {
+    "ed1": ("directivity_input", "Ed1", "ed1"),
+    "es1": ("srcmatch_input", "Es1", "es1"),
+    "er1": ("refltrack_input", "Er1", "er1"),
+    "et1": ("abstrack_input", "E01_1", "e01_input"),
+    "ed2": ("directivity_output", "Ed2", "ed2"),
+    "es2": ("srcmatch_output", "Es2", "es2"),
+    "er2": ("refltrack_output", "Er2", "er2"),
+    "et2": ("abstrack_output", "E01_2", "e01_output"),
+}
+_EXTRA_KEYS = ("loadmatch_input", "transtrack_input2output", "loadmatch_output",
+               "transtrack_output2input")
+
+
+def _complex(value: Any) -> np.ndarray:
+    """Complex 1-D array from {real, imag}, a complex list/array or a scalar."""
+    if isinstance(value, Mapping):
+        return np.asarray(value["real"], dtype=float) + 1j * np.asarray(value["imag"], dtype=float)
+    return np.atleast_1d(np.asarray(value, dtype=complex))
+
+
+def _freq(value: Any) -> np.ndarray:
+    if isinstance(value, Mapping):
+        value = value.get("x_data", value.get("freq_hz"))
+    return np.atleast_1d(np.asarray(value, dtype=float))
+
+
+@dataclass(frozen=True)
+class ErrorBox:
+    """One-port error adapter between a port's receivers and the DUT plane.
+
+    ``ed`` directivity (e00), ``es`` source match (e11), ``er`` reflection tracking
+    (e10·e01) and ``et`` the absolute tracking e01 (ones without a power cal, which
+    leaves the corrected waves in receiver units). Arrays are indexed by frequency.
+    """
+    ed: np.ndarray
+    es: np.ndarray
+    er: np.ndarray
+    et: np.ndarray
+
+    def correct(self, a_m: np.ndarray, b_m: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """DUT-plane waves (a into the DUT, b out of it) from measured waves (..., F).
+
+        From b_m = e00·a_m + e01·b and a = e10·a_m + e11·b.
+        """
+        b = (b_m - self.ed * a_m) / self.et
+        a = (self.er / self.et) * a_m + self.es * b
+        return a, b
+
+    def gamma(self, gamma_m: np.ndarray) -> np.ndarray:
+        """Corrected reflection from a raw b_m/a_m ratio."""
+        d = gamma_m - self.ed
+        return d / (self.er + self.es * d)
+
+    def take(self, index: np.ndarray) -> "ErrorBox":
+        return ErrorBox(self.ed[index], self.es[index], self.er[index], self.et[index])
+
+
+@dataclass(frozen=True)
+class ErrorTerms:
+    """Frequency-aligned error terms for the input (port 1) and output (port 2) receivers.
+
+    Built once from RSZVA.get_error_terms() (or a stored cal with the same keys); the
+    match/transmission terms of the 12-term model are kept in ``extra`` since wave
+    correction with four receivers needs only the two one-port boxes.
+    """
+    freq_hz: np.ndarray
+    input: ErrorBox
+    output: ErrorBox
+    extra: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, terms: Mapping[str, Any]) -> "ErrorTerms":
+        if "freq_hz" not in terms and "frequency" not in terms:
+            raise ValueError("error terms need a 'freq_hz' axis")
+        return cls.from_table(CalTable.from_payload(terms))
+
+    @classmethod
+    def from_table(cls, table: CalTable) -> "ErrorTerms":
+        """Terms from a compiled cal table (frequency-sorted, see caltable.cal_table)."""
+        n = table.freq_hz.size
+        if not n:
+            raise ValueError("error terms need a 'freq_hz' axis")
+        arrays: Dict[str, np.ndarray] = {}
+        for name, keys in _TERM_KEYS.items():
+            arr = next((_table_column(table, k) for k in keys
+                        if k in table.terms or k in table.scalars), None)
+            if arr is None:
+                if name.startswith("et"):
+                    arrays[name] = np.ones(n, dtype=complex)
+                    continue
+                raise ValueError(f"error terms are missing '{keys[0]}'")
+            if arr.size == 1:
+                arr = np.full(n, arr[0])
+            if arr.size != n:
+                raise ValueError(f"error term '{keys[0]}' has {arr.size} points, expected {n}")
+            arrays[name] = arr
+        extra = {k: _table_column(table, k) for k in _EXTRA_KEYS
+                 if k in table.terms or k in table.scalars}
+        return cls(
+            table.freq_hz,
+            ErrorBox(arrays["ed1"], arrays["es1"], arrays["er1"], arrays["et1"]),
+            ErrorBox(arrays["ed2"], arrays["es2"], arrays["er2"], arrays["et2"]),
+            extra,
+        )
+
+    def index(self, freq_hz: Any, atol: float = 1.0) -> np.ndarray:
+        """Indices of ``freq_hz`` in the cal grid (nearest within ``atol`` Hz, no interpolation)."""
+        want = _freq(freq_hz)
+        idx = grid_index(self.freq_hz, want, atol)
+        if (idx < 0).any():
+            raise ValueError(f"frequencies not in the cal grid: {want[idx < 0][:5].tolist()}")
+        return idx
+
+    def at(self, freq_hz: Any, atol: float = 1.0) -> "ErrorTerms":
+        """Terms on the measurement's frequency grid."""
+        idx = self.index(freq_hz, atol)
+        return ErrorTerms(
+            self.freq_hz[idx], self.input.take(idx), self.output.take(idx),
+            {k: v[idx] for k, v in self.extra.items() if v.size == self.freq_hz.size},
+        )
+
+
+def _table_column(table: CalTable, key: str) -> np.ndarray:
+    if key in table.terms:
+        return table.terms[key]
+    value = table.scalars[key]
+    if isinstance(value, complex):
+        return np.atleast_1d(np.asarray(value, dtype=complex))
+    return _complex(value)
+
+
+def error_terms(raw: Any) -> ErrorTerms:
+    """ErrorTerms for a get_error_terms()-style dict, kept with its memoized CalTable."""
+    if isinstance(raw, ErrorTerms):
+        return raw
+    return cal_table(raw).derived("error_terms", ErrorTerms.from_table)
+
+
+def correct_waves(terms: ErrorTerms, a1: Any, b1: Any, a2: Any, b2: Any,
+                  scale: float = 1.0) -> Dict[str, np.ndarray]:
+    """Correct raw waves of shape (..., F) (any number of load points) in one pass.
+
+    Returns DUT-plane waves, Γ_in = b1/a1, Γ_L = a2/b2 (load seen by the DUT output),
+    delivered input power P_in = |a1|² − |b1|² and load power P_L = |b2|² − |a2|²,
+    times ``scale`` (e.g. 0.5 for peak-amplitude waves), in W and dBm.
+    """
+    a1, b1, a2, b2 = (np.asarray(w, dtype=complex) for w in (a1, b1, a2, b2))
+    a1c, b1c = terms.input.correct(a1, b1)
+    a2c, b2c = terms.output.correct(a2, b2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma_in = b1c / a1c
+        gamma_l = a2c / b2c
+        p_in = scale * (np.abs(a1c) ** 2 - np.abs(b1c) ** 2)
+        p_l = scale * (np.abs(b2c) ** 2 - np.abs(a2c) ** 2)
+        p_in_dbm = 10 * np.log10(p_in) + 30
+        p_l_dbm = 10 * np.log10(p_l) + 30
+    return {
+        "a1": a1c, "b1": b1c, "a2": a2c, "b2": b2c,
+        "gamma_in": gamma_in, "gamma_L": gamma_l,
+        "P_in_W": p_in, "P_L_W": p_l, "P_in_dBm": p_in_dbm, "P_L_dBm": p_l_dbm,
+        "gain_dB": p_l_dbm - p_in_dbm,
+    }
+
+
+def stack_waves(
+    captures: Any, keys: tuple[str, ...] = ("a1", "b1", "a2", "b2"),
+) -> tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Frequency axis and (N, F) wave arrays from one capture_point() dict or a list of them."""
+    single = isinstance(captures, Mapping)
+    items: List[Mapping[str, Any]] = [captures] if single else list(captures)
+    if not items:
+        raise ValueError("no wave captures to correct")
+    waves = {k: np.stack([_complex(_field(c, k)) for c in items]) for k in keys}
+    first = items[0]
+    x = first.get("x", first.get("x_axis", first.get("freq_hz")))
+    freq = _freq(x) if x is not None else None
+    if single:
+        waves = {k: v[0] for k, v in waves.items()}
+    return freq, waves
+
+
+def _field(capture: Mapping[str, Any], key: str) -> Any:
+    for k in (key, key.upper()):
+        if k in capture:
+            return capture[k]
+    raise ValueError(f"wave capture is missing '{key}'")
@@ -1,8 +1,11 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List
 import json
+import multiprocessing as mp
+import queue
+import time
 import matplotlib.pyplot as plt
 from .results import JsonlWriter
 import numpy as np
@@ -38,17 +41,31 @@ class _PanelState:
     y_series: List[List[float]]
     angles_series: List[List[float]]
     lines: List[Any]
+    dirty: bool = field(default=False)
 
 
-class LivePlotWriter(JsonlWriter):
-    """Live-updating plot writer with dynamic subplot grid.
+def panel_keys(layout: Dict[str, Any]) -> List[str]:
+    """Record keys read by the panels of a plot layout (what the renderer needs)."""
+    keys: List[str] = []
+    for p in (layout or {}).get('panels', []):
+        if isinstance(p, str):
+            keys.append(p)
+            continue
+        for name in ('x', 'y', 'angle_rad', 'mag'):
+            raw = p.get(name)
+            if isinstance(raw, (list, tuple)):
+                keys.extend(str(k) for k in raw)
+            elif raw is not None:
+                keys.append(str(raw))
+    return list(dict.fromkeys(keys))
 
 
-    Pass a layout dict from testspec['plot']: {'rows','cols','panels': [...]}
-    Each panel is either a string keypath (plotted vs index) or a dict with x/y keypaths.
+class PlotRenderer:
+    """Owns the figure and panel state; ``update`` ingests a record, ``draw`` repaints.
+
+    Updates only touch panel data, so bursts of records cost one redraw.
     """
-    def __init__(self, path: Path, layout: Dict[str, Any]):
-        super().__init__(path)
+    def __init__(self, layout: Dict[str, Any]):
         self.layout = layout or {}
         rows = int(self.layout.get('rows', 1))
         cols = int(self.layout.get('cols', 1))
@@ -136,11 +153,7 @@ class LivePlotWriter(JsonlWriter):
         self._panel_count = len(self.panels)
         self._idx = 0 # fallback x when no x_key
 
-    def write_point(self, test: str, step: str, data: dict) -> None:
-        # Save line to JSONL first
-        super().write_point(test, step, data)
-        # Update live plots
-        rec = data # already includes sweep vars
+    def update(self, rec: Dict[str, Any]) -> None:
         for st in self.panels:
             if not st.y_keys and not (st.polar and st.angle_keys and st.mag_keys):
                 continue
@@ -238,16 +251,21 @@ class LivePlotWriter(JsonlWriter):
                         st.y_series = [[] for _ in st.y_keys]
                     for i, yv in enumerate(y_scalars):
                         st.y_series[i].append(yv)
+            st.dirty = True
+        self._idx += 1
 
-            # Draw or update lines
+    def draw(self) -> None:
+        """Sync artists of changed panels, then repaint once."""
+        for st in self.panels:
+            if not st.dirty:
+                continue
+            st.dirty = False
             if not st.lines:
                 labels = st.mag_keys if (st.polar and st.mag_keys) else [yk for yk in st.y_keys]
                 st.lines = []
                 if st.polar:
-                    import numpy as _np
-                    data_pairs = zip(st.angles_series, st.y_series)
                     for angs, mags, label in zip(st.angles_series, st.y_series, labels):
-                        offs = _np.c_[angs, mags]
+                        offs = np.c_[angs, mags]
                         coll = st.ax.scatter(offs[:, 0], offs[:, 1], s=16, label=label)
                         st.lines.append(coll)
                 else:
@@ -259,41 +277,190 @@ class LivePlotWriter(JsonlWriter):
                     st.ax.set_ylabel(st.title)
                 if len(st.lines) > 1:
                     st.ax.legend(loc='best', fontsize='small')
-                if not st.polar:
-                    st.ax.relim(); st.ax.autoscale_view(tight=True)
             else:
                 if st.polar:
-                    import numpy as _np
                     for coll, angs, mags in zip(st.lines, st.angles_series, st.y_series):
-                        offs = _np.c_[angs, mags]
-                        coll.set_offsets(offs)
+                        coll.set_offsets(np.c_[angs, mags])
                 else:
                     for line, ys in zip(st.lines, st.y_series):
                         line.set_data(st.x_vals, ys)
-                if not st.polar:
-                    st.ax.relim(); st.ax.autoscale_view(tight=True)
-        self._idx += 1
+            if not st.polar:
+                st.ax.relim(); st.ax.autoscale_view(tight=True)
         self.fig.canvas.draw_idle()
-        # self.fig.canvas.draw()
-        # self.fig.canvas.flush_events()
-        plt.pause(1)
+        self.pump()
+
+    def pump(self) -> None:
+        """Process pending GUI events without the fixed sleep of plt.pause()."""
+        try:
+            self.fig.canvas.flush_events()
+        except Exception:
+            pass
+
+    def savefig(self, path: Path, **kwargs: Any) -> None:
+        self.draw()
+        self.fig.savefig(path, **kwargs)
+
+    def reset(self) -> None:
+        plt.close(self.fig)
+        self.__init__(self.layout)
+
+    def close(self) -> None:
+        try:
+            plt.close(self.fig)
+        finally:
+            plt.ioff()
 
 
+def _render_loop(layout: Dict[str, Any], inbox: Any, fps: float) -> None:
+    """Plot process: drain the inbox, coalesce points and redraw at most ``fps`` times a second."""
+    renderer = PlotRenderer(layout)
+    period = 1.0 / fps
+    last_draw = 0.0
+    dirty = False
+    while True:
+        try:
+            msg = inbox.get(timeout=period)
+        except queue.Empty:
+            msg = None
+        while msg is not None:
+            kind, arg = msg
+            if kind == "points":
+                for rec in arg:
+                    renderer.update(rec)
+                dirty = True
+            elif kind == "snapshot":
+                renderer.savefig(arg, dpi=150)
+            elif kind == "reset":
+                renderer.reset()
+                dirty = False
+            elif kind == "close":
+                if arg is not None:
+                    try:
+                        renderer.savefig(arg, dpi=150, bbox_inches='tight')
+                    except Exception:
+                        pass
+                renderer.close()
+                return
+            try:
+                msg = inbox.get_nowait()
+            except queue.Empty:
+                msg = None
+        now = time.monotonic()
+        if dirty and now - last_draw >= period:
+            renderer.draw()
+            last_draw = now
+            dirty = False
+        else:
+            renderer.pump()
+
+
+class LivePlotWriter(JsonlWriter):
+    """Live-updating plot writer with dynamic subplot grid.
+
+
+    Pass a layout dict from testspec['plot']: {'rows','cols','panels': [...]}
+    Each panel is either a string keypath (plotted vs index) or a dict with x/y keypaths.
+
+    Rendering never runs on the measurement thread's critical path:
+      - backend 'process' (default): a separate process owns the figure; records
+        (reduced to the panel keys) are handed over a queue without blocking and
+        redrawn at most ``fps`` (default 4) times a second.
+      - backend 'inline': same process, but redraws are rate-limited to ``fps``.
+    """
+    def __init__(self, path: Path, layout: Dict[str, Any]):
+        super().__init__(path)
+        self.layout = layout or {}
+        self.fps = float(self.layout.get('fps', 4)) or 4.0
+        self.backend = str(self.layout.get('backend', 'process')).lower()
+        self._keys = panel_keys(self.layout)
+        self._outbox: List[tuple] = []  # messages not yet accepted by the plot process
+        self._last_draw = 0.0
+        self.renderer: PlotRenderer | None = None
+        self._proc: Any = None
+        if self.backend == 'process':
+            self._inbox = mp.Queue(maxsize=int(self.layout.get('queue_size', 64)))
+            self._proc = mp.Process(
+                target=_render_loop, args=(self.layout, self._inbox, self.fps),
+                name="loadpull-plot", daemon=True,
+            )
+            self._proc.start()
+        elif self.backend == 'inline':
+            self.renderer = PlotRenderer(self.layout)
+        else:
+            raise ValueError(f"Unknown plot backend '{self.backend}' "
+                             "(expected 'process' or 'inline')")
+
+    def write_point(self, test: str, step: str, data: dict, ts: str | None = None) -> None:
+        # Save line to JSONL first
+        super().write_point(test, step, data, ts)
+        # Only the panel inputs cross to the renderer
+        rec = {k: _get(data, k) for k in self._keys}  # data already includes sweep vars
+        if self.renderer is not None:
+            self.renderer.update(rec)
+            now = time.monotonic()
+            if now - self._last_draw >= 1.0 / self.fps:
+                self.renderer.draw()
+                self._last_draw = now
+            return
+        self._post(("points", [rec]))
+
+    def _post(self, msg: tuple) -> None:
+        """Queue a message for the plot process and send what fits without blocking.
+
+        A busy renderer leaves messages in the outbox: consecutive points are sent as
+        one burst, and a reset drops the points and resets queued since the last
+        snapshot, which it would clear anyway.
+        """
+        if self._proc is None:
+            return
+        kind = msg[0]
+        if kind == "points" and self._outbox and self._outbox[-1][0] == "points":
+            self._outbox[-1][1].extend(msg[1])
+        else:
+            if kind == "reset":
+                while self._outbox and self._outbox[-1][0] in ("points", "reset"):
+                    self._outbox.pop()
+            self._outbox.append(msg)
+        self._drain(block=False)
+
+    def _drain(self, block: bool) -> None:
+        while self._outbox:
+            try:
+                self._inbox.put(self._outbox[0], block=block, timeout=5 if block else None)
+            except queue.Full:
+                return
+            self._outbox.pop(0)
+
     def snapshot(self, suffix):  # save PNG
-        self.fig.savefig(self.path.with_name(f"{self.path.stem}_{suffix}.png"), dpi=150)
-    def reset(self):             # close & reinit
-        import matplotlib.pyplot as plt; plt.close(self.fig); self.__init__(self.path, self.layout)
+        out_png = self.path.with_name(f"{self.path.stem}_{suffix}.png")
+        if self.renderer is not None:
+            self.renderer.savefig(out_png, dpi=150)
+        else:
+            self._post(("snapshot", out_png))
+
+    def reset(self):             # clear panels for the next sweep
+        if self.renderer is not None:
+            self.renderer.reset()
+        else:
+            self._post(("reset", None))
 
     def close(self):
+        # Save a snapshot alongside results
+        out_png = self.path.with_suffix('.png')
         try:
-            # Save a snapshot alongside results
-            out_png = self.path.with_suffix('.png')
-            self.fig.savefig(out_png, dpi=150, bbox_inches='tight')
-        except Exception:
-            pass
+            if self.renderer is not None:
+                try:
+                    self.renderer.savefig(out_png, dpi=150, bbox_inches='tight')
+                except Exception:
+                    pass
+                self.renderer.close()
+            elif self._proc is not None:
+                # Shutdown may wait for the renderer; the run is over
+                self._outbox.append(("close", out_png))
+                self._drain(block=True)
+                self._proc.join(timeout=30)
+                if self._proc.is_alive():
+                    self._proc.terminate()
+                self._proc = None
         finally:
-            try:
-                plt.ioff()
-            except Exception:
-                pass
-        super().close()
+            super().close()
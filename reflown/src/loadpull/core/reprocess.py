@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from .calibration import CalibrationStore
+from .caltable import precompile
+from .results import JsonlWriter, iter_records
+from .sequencing import Context, Env, Template, _compile_value
+
+# Record fields written by JsonlWriter.write_point around the flattened env
+_HEADER = ("schema", "ts", "test", "step")
+
+
+@dataclass
+class Stage:
+    """A ``transform`` action of the testspec, re-applied to recorded envs."""
+    method: str
+    args: List[tuple[str, Template]]
+    save_as: str
+
+    def applies(self, record: Dict[str, Any]) -> bool:
+        """The action ran before this record if its output is in the recorded env."""
+        prefix = self.save_as + "."
+        return self.save_as in record or any(k.startswith(prefix) for k in record)
+
+
+def transform_stages(spec: Dict[str, Any], methods: Iterable[str] | None = None) -> List[Stage]:
+    """Transform actions with a ``save_as`` in spec order, nested blocks included.
+
+    Calibration blocks are skipped: they run in their own env and are not recorded
+    in the results.
+    """
+    wanted = set(methods) if methods else None
+    stages: List[Stage] = []
+
+    def walk(actions: Any) -> None:
+        for action in actions or []:
+            if not isinstance(action, dict):
+                continue
+            for key, body in action.items():
+                if key == "transform" and isinstance(body, dict):
+                    method, save_as = body.get("method"), body.get("save_as")
+                    if method and save_as and (wanted is None or method in wanted):
+                        args = body.get("args") or {}
+                        compiled = [(k, _compile_value(v)) for k, v in args.items()]
+                        stages.append(Stage(method, compiled, save_as))
+                elif key == "calibrate":
+                    continue
+                elif isinstance(body, dict):
+                    walk(body.get("do"))
+                elif key == "parallel" and isinstance(body, list):
+                    walk(body)
+
+    walk(spec.get("steps"))
+    return stages
+
+
+def cal_at(store: CalibrationStore, ts: str | None = None) -> Dict[str, Any]:
+    """Calibration values in effect at ``ts`` (ISO UTC), or the current ones.
+
+    A history entry is stamped when its value was replaced, so the value in effect at
+    ``ts`` is the first entry archived after ``ts``, else the current value.
+    """
+    current = store.as_dict()
+    if ts is None:
+        return current
+    out: Dict[str, Any] = {}
+    for name in sorted(set(current) | set(store.history_names())):
+        later = [e for e in store.history(name) if str(e.get("ts", "")) > ts]
+        if later:
+            out[name] = later[0]["value"]
+        elif name in current:
+            out[name] = current[name]
+    return out
+
+
+class Reprocessor:
+    """Re-apply testspec transforms to recorded env snapshots in batches.
+
+    Records are read ``batch_size`` at a time and rebuilt into envs. Each stage
+    (in spec order) is then applied to every record of the batch that contains
+    its output, through one ``apply_many`` call, so later stages see recomputed
+    upstream values. A failing batch is retried one payload at a time; records
+    whose transform still fails keep their recorded values (counted in ``errors``).
+    """
+
+    def __init__(self, stages: List[Stage],
+                 apply_many: Callable[[str, List[dict], dict], List[dict]],
+                 cal_cache: Dict[str, Any], batch_size: int = 256):
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.stages = stages
+        self.apply_many = apply_many
+        self.ctx = Context(instruments={}, writer=None,  # type: ignore[arg-type]
+                           cal_store=None, cal_cache=cal_cache)
+        self.batch_size = batch_size
+        self.records = 0
+        self.transformed = 0
+        self.errors = 0
+
+    def run(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        it = iter(records)
+        while chunk := list(itertools.islice(it, self.batch_size)):
+            yield from self._chunk(chunk)
+
+    def _chunk(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        heads = [{k: rec[k] for k in _HEADER if k in rec} for rec in chunk]
+        envs = [_rebuild_env(rec) for rec in chunk]
+        for stage in self.stages:
+            hits = [i for i, rec in enumerate(chunk) if stage.applies(rec)]
+            if not hits:
+                continue
+            payloads = [{k: t(self.ctx, envs[i]) for k, t in stage.args} for i in hits]
+            for i, out in zip(hits, self._apply(stage.method, payloads)):
+                if isinstance(out, dict):
+                    envs[i].assign(stage.save_as.split("."), out)
+                    self.transformed += 1
+        self.records += len(chunk)
+        return [{**head, **env.flat} for head, env in zip(heads, envs)]
+
+    def _apply(self, method: str, payloads: List[dict]) -> List[Any]:
+        cal = self.ctx.cal_cache
+        try:
+            return self.apply_many(method, payloads, cal)
+        except Exception:
+            outs: List[Any] = []
+            for payload in payloads:
+                try:
+                    outs.append(self.apply_many(method, [payload], cal)[0])
+                except Exception:
+                    self.errors += 1
+                    outs.append(None)
+            return outs
+
+
+def _rebuild_env(record: Dict[str, Any]) -> Env:
+    """Nested env from a record's flat keys (plain keys first, so dotted paths win)."""
+    env = Env()
+    keys = [k for k in record if k not in _HEADER]
+    for key in sorted(keys, key=lambda k: "." in k):
+        env.assign(key.split("."), record[key])
+    return env
+
+
+def reprocess_run(
+    run_dir: str | Path,
+    spec: Dict[str, Any],
+    apply_many: Callable[[str, List[dict], dict], List[dict]],
+    cal_cache: Dict[str, Any],
+    source: str = "results",
+    out: str | Path | None = None,
+    methods: Iterable[str] | None = None,
+    batch_size: int = 256,
+) -> Dict[str, Any]:
+    """Stream ``results.jsonl`` (or ``log.jsonl``) of a run into a derived file.
+
+    Every record is written back with its transform outputs recomputed from the
+    recorded raw values and ``cal_cache``; returns a summary for the manifest.
+    """
+    run_dir = Path(run_dir)
+    if source not in ("results", "log"):
+        raise ValueError(f"Unknown reprocess source '{source}' (expected 'results' or 'log')")
+    src = run_dir / f"{source}.jsonl"
+    if not src.exists() and (run_dir / f"{source}.jsonl.gz").exists():
+        src = run_dir / f"{source}.jsonl.gz"
+    if not src.exists():
+        raise FileNotFoundError(f"No {source}.jsonl in {run_dir}")
+    default = "derived.jsonl" if source == "results" else "derived_log.jsonl"
+    dest = Path(out) if out else run_dir / default
+    if dest.resolve() == src.resolve():
+        raise ValueError("reprocess output must not overwrite its source")
+    for value in cal_cache.values():
+        precompile(value)
+    stages = transform_stages(spec, methods)
+    proc = Reprocessor(stages, apply_many, cal_cache, batch_size=batch_size)
+    if dest.exists():
+        dest.unlink()
+    writer = JsonlWriter(dest, flush_every=batch_size)
+    try:
+        for rec in proc.run(iter_records(src)):
+            data = {k: v for k, v in rec.items() if k not in _HEADER}
+            writer.write_point(rec.get("test", ""), rec.get("step", ""), data, ts=rec.get("ts"))
+    finally:
+        writer.close()
+    return {
+        "source": src.name,
+        "out": str(dest),
+        "stages": [f"{s.method}->{s.save_as}" for s in stages],
+        "records": proc.records,
+        "transformed": proc.transformed,
+        "errors": proc.errors,
+    }
@@ -1,29 +1,69 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-import gzip, json, time
+from typing import Any, Callable, Dict, Iterator
+import gzip, json, queue, threading, time
 import matplotlib.pyplot as plt
+import numpy as np
+
+
+def json_default(obj: Any) -> Any:
+    """json.dumps fallback for NumPy arrays/scalars (binary trace fetches) and complex values."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, complex):
+        return {"real": obj.real, "imag": obj.imag}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
 
 @dataclass
 class JsonlWriter:
     path: Path
+    flush_every: int = 1  # flush after this many lines (1 = every record)
+    flush_ms: float = 0  # also flush once the oldest unflushed line is this old (0 = off)
 
     def __post_init__(self):
         if str(self.path).endswith(".gz"):
             self._fp = gzip.open(self.path, mode="at")
         else:
             self._fp = open(self.path, mode="a", encoding="utf-8")
+        self._unflushed = 0
+        self._first_unflushed = 0.0
 
-    def write_point(self, test: str, step: str, data: dict) -> None:
+    def write_point(self, test: str, step: str, data: dict, ts: str | None = None) -> None:
         rec = {
             "schema": "1.0.0",
-            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "ts": ts or _timestamp(),
             "test": test,
             "step": step,
             **data,
             }
-        self._fp.write(json.dumps(rec) + "\n")
+        self._write_line(rec)
+
+    def _write_line(self, rec: dict) -> None:
+        self._fp.write(json.dumps(rec, default=json_default) + "\n")
+        if not self._unflushed:
+            self._first_unflushed = time.monotonic()
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or (
+            self.flush_ms and (time.monotonic() - self._first_unflushed) * 1e3 >= self.flush_ms
+        ):
+            self.flush()
+
+    def flush(self) -> None:
         self._fp.flush()
+        self._unflushed = 0
+
+    def mark(self, fn: Callable[[Path, int], None]) -> None:
+        """Call ``fn(path, size)`` once every record written so far is flushed to the file."""
+        self.flush()
+        fn(Path(self.path), Path(self.path).stat().st_size)
 
     def close(self):
         try:
@@ -32,6 +72,232 @@ class JsonlWriter:
             pass
 
 
+# Values compared by equality rather than identity when diffing delta records
+_SCALARS = (int, float, str, bool, type(None))
+
+
+def _is_large(value: Any, n: int) -> bool:
+    if isinstance(value, np.ndarray):
+        return value.size >= n
+    if isinstance(value, (list, tuple, dict, str)):
+        return len(value) >= n
+    return False
+
+
+@dataclass
+class DeltaJsonlWriter(JsonlWriter):
+    """JsonlWriter that stores each record as a delta against the previous one.
+
+    Lines carry a ``rec`` tag: ``begin`` resets the reader state, ``snap`` holds
+    changed values of at least ``snapshot_min`` elements (traces, error terms), and
+    ``delta`` holds the step header plus the small values that changed (``set``) and
+    the keys that disappeared (``drop``). Each line applies to the state left by the
+    lines before it; use iter_records() to read full records back.
+    """
+    snapshot_min: int = 64
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._prev: Dict[str, Any] = {}
+        self._write_line({"rec": "begin", "format": "delta", "version": 1})
+
+    def write_point(self, test: str, step: str, data: dict, ts: str | None = None) -> None:
+        prev = self._prev
+        small: Dict[str, Any] = {}
+        large: Dict[str, Any] = {}
+        for k, v in data.items():
+            if k in prev:
+                old = prev[k]
+                # Saved payloads are the same objects record to record; scalars compare by value
+                if old is v or (type(old) is type(v) and isinstance(v, _SCALARS) and old == v):
+                    continue
+            (large if _is_large(v, self.snapshot_min) else small)[k] = v
+        drop = [k for k in prev if k not in data]
+        self._prev = dict(data)
+        if large:
+            self._write_line({"rec": "snap", "set": large})
+        rec: Dict[str, Any] = {
+            "rec": "delta",
+            "schema": "1.0.0",
+            "ts": ts or _timestamp(),
+            "test": test,
+            "step": step,
+        }
+        if small:
+            rec["set"] = small
+        if drop:
+            rec["drop"] = drop
+        self._write_line(rec)
+
+
+def open_log_writer(path: Path, cfg: Dict[str, Any] | None = None) -> Any:
+    """Create the log writer selected by a testspec ``log:`` mapping.
+
+    ``format: delta`` selects DeltaJsonlWriter (``snapshot_min`` optional); anything
+    else writes full records. ``flush_every``/``flush_ms`` set the flush policy and
+    ``background: true`` moves serialization and I/O to a BackgroundWriter thread
+    (``queue_size``, ``flush_on_sweep``).
+    """
+    cfg = cfg or {}
+    fmt = str(cfg.get("format", "full")).lower()
+    flush = {"flush_every": int(cfg.get("flush_every", 1)),
+             "flush_ms": float(cfg.get("flush_ms", 0))}
+    if fmt == "delta":
+        writer: JsonlWriter = DeltaJsonlWriter(
+            Path(path), snapshot_min=int(cfg.get("snapshot_min", 64)), **flush
+        )
+    elif fmt == "full":
+        writer = JsonlWriter(Path(path), **flush)
+    else:
+        raise ValueError(f"Unknown log format '{fmt}' (expected 'full' or 'delta')")
+    if not cfg.get("background"):
+        return writer
+    return BackgroundWriter(
+        writer,
+        queue_size=int(cfg.get("queue_size", 4096)),
+        flush_on_sweep=bool(cfg.get("flush_on_sweep", True)),
+    )
+
+
+class BackgroundWriter:
+    """Runs a JsonlWriter on a dedicated thread behind a bounded queue.
+
+    write_point() only timestamps and enqueues the record; JSON encoding, gzip and
+    file I/O happen on the writer thread. A full queue blocks the caller
+    (backpressure, counted in ``stalls``). The wrapped writer's flush_every/flush_ms
+    apply on the thread, and an idle queue flushes after flush_ms. flush() and close()
+    wait until everything queued is on disk; errors on the thread are re-raised on
+    the next call. Records hold references, so payload objects must not be mutated
+    in place after they are written.
+    """
+
+    def __init__(self, writer: JsonlWriter, queue_size: int = 4096, flush_on_sweep: bool = True):
+        self.writer = writer
+        self.flush_on_sweep = flush_on_sweep
+        self.stalls = 0
+        self._q: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name=f"jsonl:{writer.path}", daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self) -> Path:
+        return self.writer.path
+
+    def write_point(self, test: str, step: str, data: dict, ts: str | None = None) -> None:
+        self._raise_pending()
+        self._put(("point", (test, step, data, ts or _timestamp())))
+
+    def flush(self) -> None:
+        """Block until every queued record is written and flushed."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._put(("flush", done))
+        done.wait()
+        self._raise_pending()
+
+    def mark(self, fn: Callable[[Path, int], None]) -> None:
+        """Queue ``fn(path, size)``; it runs on the writer thread after the records before it."""
+        self._raise_pending()
+        self._put(("mark", fn))
+
+    def sweep_boundary(self) -> None:
+        if self.flush_on_sweep:
+            self._put(("flush", None))
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._q.put(("close", None))
+        self._thread.join()
+        self._raise_pending()
+
+    def _put(self, item: tuple) -> None:
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            self.stalls += 1
+            self._q.put(item)
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise RuntimeError(f"Background writer for {self.writer.path} failed") from err
+
+    def _loop(self) -> None:
+        idle_s = self.writer.flush_ms / 1e3 if self.writer.flush_ms else None
+        while True:
+            try:
+                kind, arg = self._q.get(timeout=idle_s)
+            except queue.Empty:
+                self._guard(self.writer.flush)
+                continue
+            if kind == "point":
+                self._guard(self.writer.write_point, *arg)
+            elif kind == "flush":
+                self._guard(self.writer.flush)
+                if arg is not None:
+                    arg.set()
+            elif kind == "mark":
+                self._guard(self.writer.mark, arg)
+            else:
+                self._guard(self.writer.flush)
+                self.writer.close()
+                return
+
+    def _guard(self, fn, *args) -> None:
+        try:
+            fn(*args)
+        except BaseException as exc:  # surfaced on the caller's next write
+            if self._error is None:
+                self._error = exc
+
+
+def iter_records(path: str | Path) -> Iterator[dict]:
+    """Yield full records from a JSONL log, expanding delta-encoded lines.
+
+    Plain (full) records pass through unchanged, so mixed files read correctly.
+    """
+    path = Path(path)
+    if str(path).endswith(".gz"):
+        opener = gzip.open(path, mode="rt")
+    else:
+        opener = open(path, encoding="utf-8")
+    state: Dict[str, Any] = {}
+    with opener as fp:
+        for line in fp:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(rec, dict):
+                continue
+            kind = rec.get("rec")
+            if kind == "begin":
+                state = {}
+            elif kind == "snap":
+                state.update(rec.get("set") or {})
+            elif kind == "delta":
+                for k in rec.get("drop") or ():
+                    state.pop(k, None)
+                state.update(rec.get("set") or {})
+                yield {
+                    "schema": rec.get("schema"),
+                    "ts": rec.get("ts"),
+                    "test": rec.get("test"),
+                    "step": rec.get("step"),
+                    **state,
+                }
+            else:
+                yield rec
+
+
 @dataclass
 class DualWriter:
     """Facade that splits writes between a log and a results writer.
@@ -40,7 +306,7 @@ class DualWriter:
     - write_result(): writes to `results_writer` (used to drive plotting)
     - snapshot/reset/close: proxied to results_writer when available; close both
     """
-    log_writer: JsonlWriter
+    log_writer: Any  # JsonlWriter or BackgroundWriter
     results_writer: object  # JsonlWriter or LivePlotWriter
 
     def write_point(self, test: str, step: str, data: dict) -> None:
@@ -51,6 +317,27 @@ class DualWriter:
         # Results writer may be LivePlotWriter; just delegate
         self.results_writer.write_point(test, step, data)  # type: ignore[attr-defined]
 
+    def flush(self) -> None:
+        for w in (self.log_writer, self.results_writer):
+            if hasattr(w, "flush"):
+                getattr(w, "flush")()
+
+    def mark(self, fn: Callable[[Path, int], None]) -> None:
+        """Report each file's size to ``fn`` once the records written so far reach it."""
+        for w in (self.log_writer, self.results_writer):
+            if hasattr(w, "mark"):
+                getattr(w, "mark")(fn)
+            elif hasattr(w, "path"):
+                if hasattr(w, "flush"):
+                    getattr(w, "flush")()
+                path = Path(getattr(w, "path"))
+                fn(path, path.stat().st_size)
+
+    def sweep_boundary(self) -> None:
+        for w in (self.log_writer, self.results_writer):
+            if hasattr(w, "sweep_boundary"):
+                getattr(w, "sweep_boundary")()
+
     # Optional helpers used by sequencing when plotting is enabled
     def snapshot(self, suffix: str) -> None:
         if hasattr(self.results_writer, "snapshot"):
@@ -1,24 +1,280 @@
 from __future__ import annotations
+import re
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
 from .transport import Transport
 
+# When SYST:ERR? is polled (only if err_poll is on):
+#   query     - after every query (one extra round trip per query)
+#   piggyback - ';:SYST:ERR?' appended to every query, read back with the response
+#   action    - deferred; drained by the sequencer after every action
+#   point     - deferred; drained by the sequencer after every sweep point
+#   manual    - deferred; drained only when check_errors() is called
+ERR_POLICIES = ("query", "piggyback", "action", "point", "manual")
+
+# Commands after which no cached setting can be trusted any more
+_STATE_RESET_HEADERS = ("*RST", "*RCL", "SYST:PRES", "SYSTEM:PRESET", "MMEM:LOAD")
+
+
+class ScpiError(RuntimeError):
+    """Instrument error(s) read from SYST:ERR?, with the commands they may stem from."""
+
+    def __init__(self, errors: list[str], commands: list[str]):
+        self.errors = errors
+        self.commands = commands
+        if len(commands) == 1:
+            where = f"'{commands[0]}'"
+        else:
+            where = f"{len(commands)} commands {commands}"
+        super().__init__(f"SCPI error after {where}: {'; '.join(errors)}")
+
+
+def _norm_header(header: str) -> str:
+    return header.strip().lstrip(":").upper()
+
+
+def _headers(cmd: str) -> list[str]:
+    """Upper-case headers of each ';'-separated command in a program message."""
+    return [_norm_header(part).split(" ", 1)[0] for part in cmd.split(";") if part.strip()]
+
+
+def _norm_value(value: Any) -> str:
+    if isinstance(value, (tuple, list)):
+        return "|".join(_norm_value(v) for v in value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(float(value))
+    return "" if value is None else str(value).strip().upper()
+
+
+# Start of an error field "<code>,..." appended after a ';'
+_ERR_FIELD = re.compile(r";(?=[+-]?\d+,)")
+
+
+def _split_piggyback(reply: str) -> tuple[str, str]:
+    """Split a ``<response>;<code>,"<message>"`` reply into response and error.
+
+    The error is the last ``;<code>,`` field outside double quotes, so a ';' inside
+    the quoted message (common in R&S errors) does not cut it short.
+    """
+    for m in reversed(list(_ERR_FIELD.finditer(reply))):
+        if not reply.count('"', 0, m.start()) % 2:
+            return reply[: m.start()], reply[m.end():]
+    out, _, err = reply.rpartition(";")
+    return out, err
+
+
+def _is_error(err: str) -> bool:
+    err = err.strip()
+    return not err.startswith("0") and not err.startswith("+0")
+
+
 class Scpi:
-    def __init__(self, transport: Transport, terminator: str = "\n", err_poll: bool = True):
+    max_error_drain = 32  # SYST:ERR? reads per check before giving up on an endless queue
+    max_unchecked = 256  # commands kept for error attribution between checks
+
+    def __init__(
+        self,
+        transport: Transport,
+        terminator: str = "\n",
+        err_poll: bool = True,
+        err_policy: str = "query",
+        batch_limit: int = 1024,
+        state_cache: bool = False,
+    ):
         self.t = transport
         # self.term = terminator
         self.err_poll = err_poll
+        if err_policy not in ERR_POLICIES:
+            raise ValueError(f"Unknown SCPI error policy '{err_policy}' "
+                             f"(expected one of {ERR_POLICIES})")
+        self.err_policy = err_policy
+        self._unchecked: list[str] = []  # commands sent since the last error check
+        self.batch_limit = batch_limit  # max bytes per coalesced program message
+        self._batch_depth = 0
+        self._batched: list[str] = []
+        self.state_cache = state_cache  # skip write_setting() calls that change nothing
+        self._state: Dict[str, str] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def pending_check(self) -> bool:
+        """True if commands were sent since the last error check."""
+        return bool(self._unchecked)
 
     def write(self, cmd: str) -> None:
+        if self._batch_depth:
+            self._batched.append(cmd)
+            self._record(cmd)
+            return
+        self._send(cmd)
+
+    def write_setting(self, header: str, value: Any = None, key: str | None = None) -> bool:
+        """Write ``header value`` unless the state cache shows the instrument already holds it.
+
+        ``key`` names the cached setting when several headers set the same state
+        (e.g. CONF:RES / CONF:FRES both select the DMM function under "CONF").
+        Returns True if the command was sent. Without ``state_cache`` this is a plain write.
+        """
+        key = key or header
+        if self.is_cached(key, (header, value)):
+            return False
+        self.write(header if value is None else f"{header} {value}")
+        self.remember(key, (header, value))
+        return True
+
+    def is_cached(self, key: str, value: Any) -> bool:
+        """True (and counted as a hit) if ``key`` is known to hold ``value``."""
+        if not self.state_cache:
+            return False
+        if self._state.get(_norm_header(key)) == _norm_value(value):
+            self.cache_hits += 1
+            return True
+        self.cache_misses += 1
+        return False
+
+    def remember(self, key: str, value: Any) -> None:
+        """Record that the instrument now holds ``value`` for ``key``."""
+        if self.state_cache:
+            self._state[_norm_header(key)] = _norm_value(value)
+
+    def invalidate_state(self, prefix: str | None = None) -> None:
+        """Forget cached settings (e.g. after front-panel changes).
+
+        With ``prefix`` only that node and the settings below it are dropped, for
+        commands that reset a subsystem as a side effect (e.g. DMM CONF -> SENS).
+        """
+        if prefix is None:
+            self._state.clear()
+            return
+        node = _norm_header(prefix)
+        for k in [k for k in self._state if k == node or k.startswith(node + ":")]:
+            del self._state[k]
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counts of the state cache; hits are SCPI writes that were skipped."""
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "entries": len(self._state)}
+
+    def _invalidate(self, cmd: str) -> None:
+        for header in _headers(cmd):
+            if header.startswith(_STATE_RESET_HEADERS):
+                self._state.clear()
+                return
+            # A raw write also stales settings cached under parent or child nodes
+            # (SENS1:FREQ:STAR -> SENS1:FREQ, POW:ATT -> POW:ATT:4)
+            for k in [k for k in self._state if k.startswith(header + ":")]:
+                del self._state[k]
+            while header:
+                self._state.pop(header, None)
+                header = header.rpartition(":")[0]
+
+    @contextmanager
+    def batch(self) -> Iterator["Scpi"]:
+        """Coalesce writes into ';'-joined compound commands.
+
+        Writes are held until the outermost batch exits (or a query needs the bus)
+        and then sent as few program messages of at most ``batch_limit`` bytes.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def flush(self) -> None:
+        """Send any batched writes now."""
+        cmds, self._batched = self._batched, []
+        msg = ""
+        for cmd in cmds:
+            # A leading ':' resets the header path so each command is parsed from the root
+            part = cmd if cmd.startswith(("*", ":")) else f":{cmd}"
+            if msg and len(msg) + 1 + len(part) > self.batch_limit:
+                self.t.write(msg)
+                msg = ""
+            msg = f"{msg};{part}" if msg else cmd
+        if msg:
+            self.t.write(msg)
+
+    def _send(self, cmd: str) -> None:
+        if self._batched:
+            self.flush()
         self.t.write(cmd)
+        self._record(cmd)
+
+    def _record(self, cmd: str) -> None:
+        if self._state:
+            self._invalidate(cmd)
+        if self.err_poll and self.err_policy != "query":
+            self._unchecked.append(cmd)
+            # Under 'manual' nothing may drain the list for a long time; keep the latest
+            if len(self._unchecked) > self.max_unchecked:
+                del self._unchecked[0]
 
     def query(self, cmd: str, timeout_s: float = 3.0) -> str:
-        self.write(cmd)
+        if self.err_poll and self.err_policy == "piggyback":
+            self._send(f"{cmd};:SYST:ERR?")
+            out, err = _split_piggyback(self.t.read(timeout_s))
+            self._piggyback_result(cmd, err, timeout_s)
+            return out
+        self._send(cmd)
         out = self.t.read(timeout_s)
-        if self.err_poll:
-            err = self.query_no_poll("SYST:ERR?", timeout_s)
-            if not err.startswith("0") and not err.startswith("+0"):
-                raise RuntimeError(f"SCPI error after '{cmd}': {err}")
+        self._poll_error(cmd, timeout_s)
+        return out
+
+    def query_block(self, cmd: str, timeout_s: float = 3.0) -> bytes:
+        """Query a single IEEE 488.2 definite-length binary block."""
+        return self.query_blocks(cmd, 1, timeout_s)[0]
+
+    def query_blocks(self, cmd: str, count: int, timeout_s: float = 3.0) -> list[bytes]:
+        """Query ``count`` binary blocks, e.g. from a ';'-joined compound query."""
+        if self.err_poll and self.err_policy == "piggyback":
+            # The ';' after the last block is consumed by read_block; the error follows
+            self._send(f"{cmd};:SYST:ERR?")
+            out = [self.t.read_block(timeout_s) for _ in range(count)]
+            self._piggyback_result(cmd, self.t.read(timeout_s), timeout_s)
+            return out
+        self._send(cmd)
+        out = [self.t.read_block(timeout_s) for _ in range(count)]
+        self._poll_error(cmd, timeout_s)
         return out
 
+    def check_errors(self, timeout_s: float = 3.0, raise_on_error: bool = True) -> list[str]:
+        """Drain the SYST:ERR? queue and attribute errors to the commands since the last check."""
+        commands, self._unchecked = self._unchecked, []
+        errors = self._drain_errors(timeout_s)
+        if errors and raise_on_error:
+            raise ScpiError(errors, commands)
+        return errors
+
+    def _drain_errors(self, timeout_s: float, first: str | None = None) -> list[str]:
+        errors: list[str] = []
+        err = first if first is not None else self.query_no_poll("SYST:ERR?", timeout_s)
+        while _is_error(err) and len(errors) < self.max_error_drain:
+            errors.append(err)
+            err = self.query_no_poll("SYST:ERR?", timeout_s)
+        if errors:
+            self._state.clear()  # a rejected setting leaves the cache unreliable
+        return errors
+
+    def _piggyback_result(self, cmd: str, err: str, timeout_s: float) -> None:
+        commands, self._unchecked = self._unchecked, []
+        errors = self._drain_errors(timeout_s, first=err)
+        if errors:
+            # Strip the piggybacked suffix so errors point at the caller's command
+            raise ScpiError(errors, commands[:-1] + [cmd])
+
+    def _poll_error(self, cmd: str, timeout_s: float) -> None:
+        if self.err_poll and self.err_policy == "query":
+            err = self.query_no_poll("SYST:ERR?", timeout_s)
+            if _is_error(err):
+                self._state.clear()
+                raise ScpiError([err], [cmd])
+
     def query_no_poll(self, cmd: str, timeout_s: float = 3.0) -> str:
+        if self._batched:
+            self.flush()
         self.t.write(cmd)
-        return self.t.read(timeout_s)
\ No newline at end of file
+        return self.t.read(timeout_s)
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import csv
+import inspect
+import itertools
 import math
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Iterator, List
 
+import numpy as np
 import yaml
 
+from .adaptive import AdaptiveSearch, _gamma_dict, gamma_from, scalar
+from .aio import AsyncEngine, AsyncScpi
 from .calibration import CalibrationStore
+from .caltable import precompile
 from .results import JsonlWriter
+from .scpi import Scpi
 
 
 @dataclass
@@ -22,6 +32,159 @@ class Context:
     interrupt_policy: str = "pause"
     # Optional explicit shutdown order (instrument aliases)
     shutdown_order: List[str] | None = None
+    # core.aio.AsyncEngine when the spec sets ``engine: async``
+    engine: Any = None
+    # core.checkpoint.Checkpointer recording completed sweep points
+    checkpoint: Any = None
+
+class Env(dict):
+    """Nested test environment with an incrementally maintained flat view.
+
+    ``flat`` maps dotted keys to leaf values like ``_flat_env`` would, but is only
+    touched for the keys an assignment replaces, so records can copy it instead of
+    re-walking every saved payload. All dict methods that write keep the view in
+    sync; in-place mutation of stored dicts is not tracked. Nested dicts of ``data``
+    are copied, so the caller's data is never modified through the Env.
+    """
+
+    def __init__(self, data: Dict[str, Any] | None = None):
+        super().__init__(_copy_dicts(data or {}))
+        self.flat: Dict[str, Any] = _flat_env(self)
+        self.rev = 0
+        self._changed: Dict[str, int] = {}  # flat key -> revision of its last change
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.assign([key], value)
+
+    def __delitem__(self, key: str) -> None:
+        old = dict.pop(self, key)
+        self.rev += 1
+        self._drop(key, old)
+
+    def __ior__(self, other: Any) -> "Env":
+        self.update(other)
+        return self
+
+    def update(self, other: Any = (), /, **kwargs: Any) -> None:
+        for key, value in dict(other, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = dict.__getitem__(self, key)
+        del self[key]
+        return value
+
+    def popitem(self) -> tuple[str, Any]:
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def clear(self) -> None:
+        for key in list(self):
+            del self[key]
+
+    def copy(self) -> "Env":
+        # Nested dicts are copied too so assignments in the copy cannot leak back
+        other = Env.__new__(Env)
+        dict.__init__(other, _copy_dicts(self))
+        other.flat = dict(self.flat)
+        other.rev = self.rev
+        other._changed = dict(self._changed)
+        return other
+
+    def assign(self, parts: List[str], value: Any) -> None:
+        """Set the value at a pre-split dotted path, updating only the affected flat keys."""
+        cursor: Dict[str, Any] = self
+        prefix = ""
+        for part in parts[:-1]:
+            prefix = f"{prefix}.{part}" if prefix else part
+            next_val = cursor.get(part)
+            if not isinstance(next_val, dict):
+                if part in cursor:
+                    self._drop(prefix, next_val)
+                next_val = {}
+                dict.__setitem__(cursor, part, next_val)
+            cursor = next_val
+        last = parts[-1]
+        name = f"{prefix}.{last}" if prefix else last
+        old = cursor.get(last, _MISSING)
+        dict.__setitem__(cursor, last, value)
+        self.rev += 1
+        if not isinstance(old, dict) and not isinstance(value, dict):
+            # Leaf replaced by leaf: keep its position in the flat view
+            self.flat[name] = value
+            self._changed[name] = self.rev
+            return
+        if old is not _MISSING:
+            self._drop(name, old)
+        self._add(name, value)
+
+    def delta(self, since: int) -> tuple[Dict[str, Any], List[str]]:
+        """Flat keys set and removed after revision ``since``."""
+        changed: Dict[str, Any] = {}
+        removed: List[str] = []
+        for key, rev in self._changed.items():
+            if rev > since:
+                if key in self.flat:
+                    changed[key] = self.flat[key]
+                else:
+                    removed.append(key)
+        return changed, removed
+
+    def _drop(self, name: str, old: Any) -> None:
+        keys = _flat_env(old, name) if isinstance(old, dict) else {name: None}
+        for key in keys:
+            self.flat.pop(key, None)
+            self._changed[key] = self.rev
+
+    def _add(self, name: str, value: Any) -> None:
+        added = _flat_env(value, name) if isinstance(value, dict) else {name: value}
+        self.flat.update(added)
+        for key in added:
+            self._changed[key] = self.rev
+
+
+_MISSING = object()
+
+
+class _LaneEnv(Env):
+    """Private copy of an env for one parallel lane; records assignments for replay."""
+
+    def __init__(self, base: Env):
+        dict.__init__(self, _copy_dicts(base))
+        self.flat = dict(base.flat)
+        self.rev = base.rev
+        self._changed = dict(base._changed)
+        self.journal: List[tuple[List[str], Any]] = []
+
+    def assign(self, parts: List[str], value: Any) -> None:
+        super().assign(parts, value)
+        self.journal.append((list(parts), value))
+
+
+class _LaneWriter:
+    """Holds a lane's log records so they are written from the sequencer thread."""
+
+    def __init__(self) -> None:
+        self.records: List[tuple[str, str, Dict[str, Any]]] = []
+
+    def write_point(self, test_name: str, step: str, payload: Dict[str, Any]) -> None:
+        self.records.append((test_name, step, payload))
+
+
+def _copy_dicts(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: _copy_dicts(v) if isinstance(v, dict) else v for k, v in data.items()}
+
 
 class Sequence:
     def __init__(self, name: str, spec: Dict[str, Any]):
@@ -33,11 +196,425 @@ class Sequence:
         data = yaml.safe_load(Path(path).read_text())
         return Sequence(data["name"], data)
 
-    def run(self, ctx: Context) -> None:
-        params = self.spec.get("parameters", {})
+    def compile(self, ctx: Context) -> "Plan":
+        """Bind the steps to ctx's instruments once; raises ValueError on malformed specs."""
         steps: List[Dict[str, Any]] = self.spec.get("steps", []) or []
-        env: Dict[str, Any] = {k: v.get("default") for k, v in params.items()}
-        _run_actions(self.name, steps, env, ctx)
+        return Plan(self.name, _compile_actions(steps, ctx))
+
+    def run(self, ctx: Context, env: Dict[str, Any] | None = None) -> None:
+        """Run the spec; ``env`` (e.g. from a checkpoint) replaces the parameter defaults."""
+        engine_name = self.spec.get("engine", "sync")
+        if engine_name not in ("sync", "async"):
+            raise ValueError(f"Unknown engine '{engine_name}' (expected 'sync' or 'async')")
+        engine = None
+        if engine_name == "async" and ctx.engine is None:
+            engine = ctx.engine = AsyncEngine()
+        try:
+            # Compile first so structural errors surface before any instrument moves
+            plan = self.compile(ctx)
+            if env is None:
+                params = self.spec.get("parameters", {})
+                env = Env({k: v.get("default") for k, v in params.items()})
+            env = plan.run(ctx, env)
+            # Surface anything still queued by deferred error policies
+            _check_instrument_errors(ctx, "action", "point")
+            if ctx.checkpoint is not None:
+                ctx.checkpoint.save(env, ctx, complete=True)
+        finally:
+            if engine is not None:
+                ctx.engine = None
+                engine.close()
+
+
+# A compiled argument: resolves a spec value against (ctx, env) without re-parsing it
+Template = Callable[[Context, Dict[str, Any]], Any]
+
+
+class Node:
+    """A compiled action. ``run`` only evaluates what was prepared at compile time."""
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        raise NotImplementedError
+
+    def children(self) -> List["Node"]:
+        return []
+
+    def close(self) -> None:
+        """Release resources held between runs (worker threads); the node stays runnable."""
+        for child in self.children():
+            child.close()
+
+
+@dataclass
+class Plan:
+    """Compiled form of a Sequence: a tree of pre-bound action nodes."""
+    name: str
+    steps: List[Node]
+
+    def run(self, ctx: Context, env: Dict[str, Any]) -> Env:
+        """Execute the plan; a plain dict env is updated in place when the run ends."""
+        return _run_in_env(self.name, self.steps, env, ctx)
+
+    def close(self) -> None:
+        for node in self.steps:
+            node.close()
+
+
+@dataclass
+class SweepNode(Node):
+    var: str
+    start: Template
+    stop: Template
+    step: Template
+    body: List[Node]
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        start = float(self.start(ctx, env))
+        stop = float(self.stop(ctx, env))
+        step = float(self.step(ctx, env))
+        n = _num_points(start, stop, step)
+        cp = ctx.checkpoint
+        for i in range(cp.resume_loop() if cp else 0, n):
+            env[self.var] = start + i * step
+            _run_point(test_name, self.body, env, ctx, i)
+        boundary = getattr(ctx.writer, "sweep_boundary", None)
+        if boundary is not None:
+            boundary()
+
+    def children(self) -> List[Node]:
+        return self.body
+
+
+@dataclass
+class ForeachNode(Node):
+    """Iterate variables over value sources (lists, env arrays, CSV/NPY files, ranges).
+
+    ``product`` nests the variables in spec order (first outermost); inner sources are
+    resolved per outer value, so they may refer to outer variables. ``zip`` walks all
+    sources in lockstep and fails if their lengths differ. Values are drawn lazily.
+    """
+    vars: List[str]
+    sources: List[Template]
+    mode: str
+    body: List[Node]
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        if self.mode == "zip":
+            iters = [_iter_values(src(ctx, env)) for src in self.sources]
+            first = ctx.checkpoint.resume_loop() if ctx.checkpoint else 0
+            rows = itertools.islice(zip(*iters, strict=True), first, None)
+            for k, values in enumerate(rows, first):
+                for var, value in zip(self.vars, values):
+                    env[var] = value
+                _run_point(test_name, self.body, env, ctx, k)
+        else:
+            self._nest(0, test_name, env, ctx)
+        boundary = getattr(ctx.writer, "sweep_boundary", None)
+        if boundary is not None:
+            boundary()
+
+    def _nest(self, level: int, test_name: str, env: Env, ctx: Context) -> None:
+        cp = ctx.checkpoint
+        first = cp.resume_loop() if cp else 0
+        values = itertools.islice(_iter_values(self.sources[level](ctx, env)), first, None)
+        for k, value in enumerate(values, first):
+            env[self.vars[level]] = value
+            if level + 1 < len(self.vars):
+                if cp:
+                    cp.enter(k, loop=True)
+                try:
+                    self._nest(level + 1, test_name, env, ctx)
+                finally:
+                    if cp:
+                        cp.leave(loop=True)
+            else:
+                _run_point(test_name, self.body, env, ctx, k)
+
+    def children(self) -> List[Node]:
+        return self.body
+
+
+@dataclass
+class AdaptiveNode(Node):
+    """Adaptive load-pull search (core.adaptive.AdaptiveSearch) around ``center``.
+
+    Each proposed Γ is put in ``env[var]`` ({gamma_mag, gamma_deg, real, imag, index})
+    and the body runs to move the tuner and measure; ``value`` is then read as the
+    objective and ``gamma`` (optional, e.g. the corr_gamma result) as the measured Γ.
+    The optimum, best point and fitted contour are saved under ``save_as``. Points
+    inside the search are not checkpointed; a resumed run restarts the search.
+    """
+    var: str
+    center: Template
+    value: Template
+    gamma: Template | None
+    options: Dict[str, Template]
+    save_as: str | None
+    body: List[Node]
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        opts = {k: t(ctx, env) for k, t in self.options.items()}
+        search = AdaptiveSearch(center=gamma_from(self.center(ctx, env)), **opts)
+        inner = replace(ctx, checkpoint=None) if ctx.checkpoint is not None else ctx
+        while (target := search.next_point()) is not None:
+            env[self.var] = {**_gamma_dict(target), "index": len(search.gammas)}
+            _run_point(test_name, self.body, env, inner, len(search.gammas))
+            value = self.value(ctx, env)
+            if value is None:
+                raise ValueError(f"'adaptive' value is missing after point {len(search.gammas)}")
+            measured = self.gamma(ctx, env) if self.gamma is not None else None
+            gamma = gamma_from(measured) if measured is not None else target
+            # A failed Γ read-back falls back to the commanded point
+            search.add(gamma if np.isfinite(gamma) else target, scalar(value))
+        if self.save_as:
+            env[self.save_as] = search.result()
+        boundary = getattr(ctx.writer, "sweep_boundary", None)
+        if boundary is not None:
+            boundary()
+
+    def children(self) -> List[Node]:
+        return self.body
+
+
+@dataclass
+class ParallelNode(Node):
+    """Run child actions concurrently, one lane per group of instruments.
+
+    Children that share an instrument (or its transport) stay in one lane and run in
+    spec order, so no instrument is driven from two threads. Each lane works on a
+    private copy of the env; after all lanes finish, their assignments and log records
+    are applied in spec order of the lanes' first actions, and the first error raised.
+    """
+    lanes: List[List[Node]]
+    instruments: List[List[str]]
+    _pool: ThreadPoolExecutor | None = field(default=None, init=False, repr=False)
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        if ctx.engine is not None:
+            ctx.engine.join()  # lanes drive their instruments directly
+        envs = [_LaneEnv(env) for _ in self.lanes]
+        ctxs = [
+            replace(ctx, instruments={n: ctx.instruments[n] for n in names}, writer=_LaneWriter(),
+                    fail_policy="halt", engine=None, checkpoint=None)
+            for names in self.instruments
+        ]
+        if self._pool is None and len(self.lanes) > 1:
+            self._pool = ThreadPoolExecutor(len(self.lanes) - 1, thread_name_prefix="loadpull-lane")
+        # The first lane runs on this thread; the rest on the pool
+        futures = [
+            self._pool.submit(_run_nodes, test_name, nodes, lane_env, lane_ctx)
+            for nodes, lane_env, lane_ctx in zip(self.lanes[1:], envs[1:], ctxs[1:])
+        ]
+        errors: List[BaseException | None] = []
+        try:
+            _run_nodes(test_name, self.lanes[0], envs[0], ctxs[0])
+            errors.append(None)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            wait(futures)  # never leave a lane driving instruments behind
+        for fut in futures:
+            errors.append(fut.exception())
+        for lane_env, lane_ctx, err in zip(envs, ctxs, errors):
+            if err is None:
+                for parts, value in lane_env.journal:
+                    env.assign(parts, value)
+            for record in lane_ctx.writer.records:
+                ctx.writer.write_point(*record)
+        for err in errors:
+            if err is not None:
+                raise err
+
+    def children(self) -> List[Node]:
+        return [node for lane in self.lanes for node in lane]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        super().close()
+
+
+@dataclass
+class CallNode(Node):
+    inst_name: str
+    method_name: str
+    method: Callable[..., Any]
+    args: List[Template]
+    save_as: List[str] | None
+    inst: Any = None
+    background: bool = False  # ``async: true``: launch on the async engine, join later
+    replay: bool | None = None  # re-send on resume; None: only inside a loop (see _replay_setup)
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        def finish(out: Any) -> None:
+            if self.save_as:
+                env.assign(self.save_as, out)
+            payload = {"inst": self.inst_name, "method": self.method_name, "result": out}
+            payload.update(env.flat)
+            ctx.writer.write_point(test_name, f"call:{self.method_name}", payload)
+
+        _dispatch(self, [arg(ctx, env) for arg in self.args], finish, ctx)
+
+
+@dataclass
+class MeasureNode(Node):
+    inst_name: str
+    method_name: str
+    method: Callable[..., Any]
+    args: List[Template]
+    save_key: str
+    inst: Any = None
+    background: bool = False
+
+    def __post_init__(self) -> None:
+        self._save_path = self.save_key.split(".")
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        def finish(val: Any) -> None:
+            env.assign(self._save_path, val)
+            payload = {"inst": self.inst_name, "method": self.method_name, self.save_key: val}
+            payload.update(env.flat)
+            ctx.writer.write_point(test_name, f"measure:{self.method_name}", payload)
+
+        _dispatch(self, [arg(ctx, env) for arg in self.args], finish, ctx)
+
+
+def _dispatch(node: Any, args: List[Any], finish: Callable[[Any], None], ctx: Context) -> None:
+    """Call an instrument method directly, or through the async engine when one is set."""
+    if ctx.engine is None:
+        finish(node.method(*args))
+    elif node.background:
+        ctx.engine.launch(node.inst_name, node.method, args, finish)
+    else:
+        ctx.engine.join([node.inst_name])  # earlier launches on this instrument land first
+        finish(ctx.engine.call(node.inst_name, node.method, *args))
+
+
+@dataclass
+class JoinNode(Node):
+    """Wait for launched (``async: true``) actions, on some instruments or all."""
+    inst_names: List[str] | None
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        if ctx.engine is not None:
+            ctx.engine.join(self.inst_names)
+
+
+@dataclass
+class ResultsNode(Node):
+    step_name: str
+    limits: Template | None
+    shutdown: bool
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        if ctx.engine is not None:
+            ctx.engine.join()
+        payload = dict(env.flat)
+        violations: List[str] = []
+        if self.limits is not None:
+            violations = _evaluate_limits(payload, self.limits(ctx, env))
+            if violations:
+                # Graceful shutdown if requested (default True)
+                if self.shutdown:
+                    _safe_shutdown(ctx)
+                    raise SystemExit("Safety limits violated: " + "; ".join(violations))
+                # Record violations in the payload
+                payload = {**payload, "limit_violations": violations}
+        if hasattr(ctx.writer, "write_result"):
+            write_result = ctx.writer.write_result  # type: ignore[attr-defined]
+            write_result(test_name, self.step_name, payload)
+        else:
+            ctx.writer.write_point(test_name, self.step_name, payload)
+        if violations:
+            _flush_writer(ctx)
+
+
+@dataclass
+class TransformNode(Node):
+    method: str
+    args: List[tuple[str, Template]]
+    save_as: List[str] | None
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        resolved_args = {k: t(ctx, env) for k, t in self.args}
+        payload = ctx.transform(self.method, resolved_args, ctx.cal_cache)  # type: ignore[misc]
+        if not isinstance(payload, dict):
+            raise ValueError(f"Transform '{self.method}' returned non-dict payload")
+        if self.save_as:
+            env.assign(self.save_as, payload)
+        out_payload = {"method": self.method, **payload, **env.flat}
+        ctx.writer.write_point(test_name, f"transform:{self.method}", out_payload)
+
+
+@dataclass
+class BatchNode(Node):
+    body: List[Node]
+    targets: List[Scpi]
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        # Coalesce the writes of the wrapped actions into compound SCPI commands
+        with ExitStack() as stack:
+            for scpi in self.targets:
+                stack.enter_context(scpi.batch())
+            _run_nodes(test_name, self.body, env, ctx)
+
+    def children(self) -> List[Node]:
+        return self.body
+
+
+@dataclass
+class PlotResetNode(Node):
+    suffix: Template
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        if hasattr(ctx.writer, "snapshot"):
+            ctx.writer.snapshot(self.suffix(ctx, env))
+        if hasattr(ctx.writer, "reset"):
+            ctx.writer.reset()
+
+
+@dataclass
+class CalibrateNode(Node):
+    name: str
+    force: bool
+    body: List[Node]
+    save: Template
+
+    def run(self, test_name: str, env: Env, ctx: Context) -> None:
+        # cal constants from file in dict form
+        cached = ctx.cal_cache.get(self.name)
+        if cached is None and not self.force:
+            cached = ctx.cal_store.get(self.name)
+
+        if cached is not None and not self.force:
+            ctx.cal_cache[self.name] = cached
+            precompile(cached)
+            ctx.writer.write_point(
+                test_name,
+                f"calibration:{self.name}",
+                {"method": "calibration", "status": "reuse", "value": cached},
+            )
+            return
+
+        # Run calibration steps in an isolated env so calibration artifacts
+        # do not leak into the main test env.
+        cal_env = env.copy()
+        _run_nodes(test_name, self.body, cal_env, ctx)
+
+        value = self.save(ctx, cal_env)
+        ctx.cal_cache[self.name] = value
+        precompile(value)
+        ctx.cal_store.set(self.name, value)
+        ctx.cal_store.save()
+        ctx.writer.write_point(
+            test_name,
+            f"calibration:{self.name}",
+            {"method": "calibration", "status": "update", "value": value},
+        )
+
+    def children(self) -> List[Node]:
+        return self.body
 
 
 def _run_actions(
@@ -46,136 +623,85 @@ def _run_actions(
     env: Dict[str, Any],
     ctx: Context,
 ) -> None:
-    """Execute a list of actions with support for nested sweeps."""
-    if not actions:
+    """Compile and execute a list of actions with support for nested sweeps."""
+    _run_in_env(test_name, _compile_actions(actions, ctx), env, ctx)
+
+
+def _run_in_env(test_name: str, nodes: List[Node], env: Dict[str, Any], ctx: Context) -> Env:
+    """Run ``nodes`` on ``env``; a plain dict runs on an Env that is copied back into it.
+
+    Worker threads started by the nodes are shut down when the run ends.
+    """
+    wrapped = env if isinstance(env, Env) else Env(env)
+    try:
+        _run_nodes(test_name, nodes, wrapped, ctx)
+    finally:
+        for node in nodes:
+            node.close()
+        if wrapped is not env:
+            dict.clear(env)
+            dict.update(env, wrapped)
+    return wrapped
+
+
+def _run_point(test_name: str, body: List[Node], env: Env, ctx: Context, index: int) -> None:
+    """Run one loop iteration and checkpoint it once complete."""
+    cp = ctx.checkpoint
+    if cp is None:
+        _run_nodes(test_name, body, env, ctx)
+        _check_instrument_errors(ctx, "point")
         return
+    cp.enter(index, loop=True)
+    try:
+        _run_nodes(test_name, body, env, ctx)
+        _check_instrument_errors(ctx, "point")
+        cp.point_done(env, ctx)
+    finally:
+        cp.leave(loop=True)
+
+
+def _replay_setup(test_name: str, node: Node, env: Env, ctx: Context) -> None:
+    """On resume, re-send the settings of skipped actions; skip everything else.
 
-    for action in actions:
+    Settings are ``call`` actions without ``save_as`` in the body of a loop the resumed
+    point is inside (e.g. the outer bias of the current point), or any call marked
+    ``replay: true``; ``replay: false`` opts out. Top-level setup (presets, one-shot
+    init) is not repeated. Replayed calls write no log record, since the first run
+    already logged them; results come back with the restored env.
+    """
+    if isinstance(node, CallNode):
+        replay = node.replay if node.replay is not None else (
+            node.save_as is None and ctx.checkpoint.loop_depth > 0)
+        if replay:
+            args = [arg(ctx, env) for arg in node.args]
+            if ctx.engine is None:
+                node.method(*args)
+            else:
+                ctx.engine.call(node.inst_name, node.method, *args)
+    elif isinstance(node, BatchNode):
+        for child in node.body:
+            _replay_setup(test_name, child, env, ctx)
+
+
+def _run_nodes(test_name: str, nodes: List[Node], env: Env, ctx: Context) -> None:
+    """Execute compiled nodes, applying the context's fail and interrupt policies per action."""
+    cp = ctx.checkpoint
+    start = cp.resume_index() if cp else 0
+    if start:
+        # Resuming: actions before the checkpointed branch already ran
+        for node in nodes[:start]:
+            _replay_setup(test_name, node, env, ctx)
+    for index, node in enumerate(nodes[start:], start):
         try:
-            if "sweep" in action:
-                sweep = action["sweep"]
-                var = sweep["var"]
-                start = float(_resolve(ctx, env, sweep["from"]))
-                stop = float(_resolve(ctx, env, sweep["to"]))
-                step = float(_resolve(ctx, env, sweep["step"]))
-                n = _num_points(start, stop, step)
-                for i in range(n):
-                    env[var] = start + i * step
-                    _run_actions(test_name, sweep.get("do"), env, ctx)
-
-            elif "call" in action:
-                call_spec = action["call"]
-                inst_name = call_spec["inst"]
-                method_name = call_spec["method"]
-                inst = ctx.instruments[inst_name]
-                method = getattr(inst, method_name)
-                args = [_resolve(ctx, env, arg) for arg in call_spec.get("args", [])]
-                out = method(*args)
-                save_as = call_spec.get("save_as")
-                if save_as:
-                    _set_mapping_value(env, save_as, out)
-                payload = {"inst": inst_name, "method": method_name, "result": out}
-                payload.update(_flat_env(env))
-                ctx.writer.write_point(test_name, f"call:{method_name}", payload,)
-
-            elif "measure" in action:
-                measure = action["measure"]
-                inst_name = measure["inst"]
-                method_name = measure["method"]
-                inst = ctx.instruments[inst_name]
-                method = getattr(inst, method_name)
-                args = [_resolve(ctx, env, arg) for arg in measure.get("args", [])]
-                val = method(*args)
-                save_key = measure.get("save_as", method_name)
-                _set_mapping_value(env, save_key, val)
-                payload = {"inst": inst_name, "method": method_name, save_key: val}
-                payload.update(_flat_env(env))
-                ctx.writer.write_point(test_name, f"measure:{method_name}", payload)
-
-            elif "results_update" in action or "update_results" in action:
-                spec = action.get("results_update") or action.get("update_results") or {}
-                step_name = spec.get("step", "results:update") if isinstance(spec, dict) else "results:update"
-                payload = _flat_env(env)
-                if isinstance(spec, dict) and spec.get("limits") is not None:
-                    limits_spec = _resolve(ctx, env, spec.get("limits"))
-                    violations = _evaluate_limits(payload, limits_spec)
-                    if violations:
-                        # Graceful shutdown if requested (default True)
-                        do_shutdown = bool(spec.get("shutdown", True))
-                        if do_shutdown:
-                            _safe_shutdown(ctx)
-                            raise SystemExit("Safety limits violated: " + "; ".join(violations))
-                        else:
-                            # Record violations in the payload
-                            payload = {**payload, "limit_violations": violations}
-                if hasattr(ctx.writer, "write_result"):
-                    ctx.writer.write_result(test_name, step_name, payload)  # type: ignore[attr-defined]
-                else:
-                    ctx.writer.write_point(test_name, step_name, payload)
-
-            elif "transform" in action:
-                if ctx.transform is None:
-                    raise RuntimeError("Transform action requested but no transform handler configured")
-                spec = action["transform"]
-                method = spec["method"]
-                raw_args = spec.get("args", {})
-                if not isinstance(raw_args, dict):
-                    raise ValueError("Transform args must be a mapping")
-                resolved_args = {k: _resolve(ctx, env, v) for k, v in raw_args.items()}
-                payload = ctx.transform(method, resolved_args, ctx.cal_cache)
-                if not isinstance(payload, dict):
-                    raise ValueError(f"Transform '{method}' returned non-dict payload")
-                save_as = spec.get("save_as")
-                if save_as:
-                    _set_mapping_value(env, save_as, payload)
-                out_payload = {"method": method, **payload, **_flat_env(env)}
-                ctx.writer.write_point(test_name, f"transform:{method}", out_payload)
-
-            elif "plot_reset" in action:
-                suffix = action["plot_reset"].get("suffix", "snap")
-                if hasattr(ctx.writer, "snapshot"):
-                    ctx.writer.snapshot(_resolve(ctx, env, suffix))
-                if hasattr(ctx.writer, "reset"):
-                    ctx.writer.reset()
-                    
-            elif "calibrate" in action:
-                spec = action["calibrate"]
-                name = spec["name"]
-                force = bool(spec.get("force", False))
-
-                # cal constants from file in dict form 
-                cached = ctx.cal_cache.get(name)
-                if cached is None and not force:
-                    cached = ctx.cal_store.get(name)
-
-                if cached is not None and not force:
-                    ctx.cal_cache[name] = cached
-                    ctx.writer.write_point(
-                        test_name,
-                        f"calibration:{name}",
-                        {"method": "calibration", "status": "reuse", "value": cached},
-                    )
-                    continue
-
-                # Run calibration steps in an isolated env so calibration artifacts
-                # do not leak into the main test env.
-                cal_env = dict(env)
-                _run_actions(test_name, spec.get("do"), cal_env, ctx)
-
-                if "save" not in spec:
-                    raise ValueError(f"Calibration '{name}' must define a 'save' field")
-
-                value = _resolve(ctx, cal_env, spec["save"])
-                ctx.cal_cache[name] = value
-                ctx.cal_store.set(name, value)
-                ctx.cal_store.save()
-                ctx.writer.write_point(
-                    test_name,
-                    f"calibration:{name}",
-                    {"method": "calibration", "status": "update", "value": value},
-                )
+            if cp is None:
+                node.run(test_name, env, ctx)
             else:
-                raise ValueError(f"Unknown action: {action}")
+                cp.enter(index)
+                try:
+                    node.run(test_name, env, ctx)
+                finally:
+                    cp.leave()
+            _check_instrument_errors(ctx, "action")
         except KeyboardInterrupt as exc:
             if ctx.interrupt_policy == "shutdown":
                 _safe_shutdown(ctx)
@@ -195,6 +721,262 @@ def _run_actions(
             if ctx.fail_policy == "continue":
                 continue
             raise
+    if ctx.engine is not None:
+        # Launched actions finish within the block that started them
+        ctx.engine.join()
+
+
+# ---- Compilation ----
+def _compile_actions(actions: List[Dict[str, Any]] | None, ctx: Context) -> List[Node]:
+    nodes: List[Node] = []
+    for action in actions or []:
+        if not isinstance(action, dict):
+            raise ValueError(f"Action must be a mapping, got: {action!r}")
+        for key, build in _BUILDERS:
+            if key in action:
+                nodes.append(build(action[key], ctx))
+                break
+        else:
+            raise ValueError(f"Unknown action: {action}")
+    return nodes
+
+
+def _require(spec: Any, key: str, kind: str) -> Any:
+    if not isinstance(spec, dict) or key not in spec:
+        raise ValueError(f"'{kind}' action requires '{key}': {spec!r}")
+    return spec[key]
+
+
+def _bind(spec: Any, kind: str, ctx: Context) -> tuple[str, str, Any, Callable[..., Any]]:
+    inst_name = _require(spec, "inst", kind)
+    method_name = _require(spec, "method", kind)
+    if inst_name not in ctx.instruments:
+        raise ValueError(f"'{kind}' action uses unknown instrument '{inst_name}'")
+    inst = ctx.instruments[inst_name]
+    method = getattr(inst, method_name, None)
+    if not callable(method):
+        raise ValueError(f"'{kind}' action: instrument '{inst_name}' has no method '{method_name}'")
+    if ctx.engine is None and inspect.iscoroutinefunction(method):
+        raise ValueError(f"'{kind}' action: {inst_name}.{method_name} is async; "
+                         "set 'engine: async' in the spec")
+    return inst_name, method_name, inst, method
+
+
+def _compile_args(spec: Dict[str, Any], kind: str) -> List[Template]:
+    args = spec.get("args", [])
+    if not isinstance(args, list):
+        raise ValueError(f"'{kind}' args must be a list: {args!r}")
+    return [_compile_value(arg) for arg in args]
+
+
+def _build_sweep(spec: Any, ctx: Context) -> Node:
+    if isinstance(spec, dict) and any(k in spec for k in ("values", "in", "zip", "product")):
+        return _build_foreach(spec, ctx)
+    return SweepNode(
+        var=_require(spec, "var", "sweep"),
+        start=_compile_value(_require(spec, "from", "sweep")),
+        stop=_compile_value(_require(spec, "to", "sweep")),
+        step=_compile_value(_require(spec, "step", "sweep")),
+        body=_compile_actions(spec.get("do"), ctx),
+    )
+
+
+def _build_foreach(spec: Any, ctx: Context) -> Node:
+    if not isinstance(spec, dict):
+        raise ValueError(f"'foreach' action must be a mapping: {spec!r}")
+    mode = "zip" if "zip" in spec else "product"
+    if "zip" in spec or "product" in spec:
+        groups = spec[mode]
+        if not isinstance(groups, dict) or not groups:
+            raise ValueError(f"'{mode}' must map variable names to value sources: {groups!r}")
+        names, sources = list(groups), list(groups.values())
+    else:
+        names = [_require(spec, "var", "foreach")]
+        sources = [spec["in"] if "in" in spec else _require(spec, "values", "foreach")]
+    return ForeachNode(names, [_compile_value(src) for src in sources], mode,
+                       _compile_actions(spec.get("do"), ctx))
+
+
+_ADAPTIVE_OPTIONS = ("radius", "ring", "maximize", "max_points", "tol", "contour",
+                     "contour_tol", "kappa", "max_mag", "min_spacing")
+
+
+def _build_adaptive(spec: Any, ctx: Context) -> Node:
+    if not isinstance(spec, dict):
+        raise ValueError(f"'adaptive' action must be a mapping: {spec!r}")
+    unknown = set(spec) - {"var", "center", "value", "gamma", "save_as", "do", *_ADAPTIVE_OPTIONS}
+    if unknown:
+        raise ValueError(f"'adaptive' action has unknown keys: {sorted(unknown)}")
+    return AdaptiveNode(
+        var=spec.get("var", "gamma"),
+        center=_compile_value(_require(spec, "center", "adaptive")),
+        value=_compile_value(_require(spec, "value", "adaptive")),
+        gamma=_compile_value(spec["gamma"]) if "gamma" in spec else None,
+        options={k: _compile_value(spec[k]) for k in _ADAPTIVE_OPTIONS if k in spec},
+        save_as=spec.get("save_as"),
+        body=_compile_actions(spec.get("do"), ctx),
+    )
+
+
+def _build_parallel(spec: Any, ctx: Context) -> Node:
+    children = spec.get("do") if isinstance(spec, dict) else spec
+    nodes = _compile_actions(children, ctx)
+    for node in nodes:
+        _check_parallel_safe(node)
+    # Union children that share an instrument or transport into one lane
+    lanes: List[List[Node]] = []
+    keys: List[set] = []
+    names: List[set] = []
+    for node in nodes:
+        node_keys, node_names = _node_resources(node)
+        hits = [i for i, k in enumerate(keys) if k & node_keys]
+        if not hits:
+            lanes.append([node])
+            keys.append(node_keys)
+            names.append(node_names)
+            continue
+        first = hits[0]
+        for i in reversed(hits[1:]):
+            lanes[first].extend(lanes.pop(i))
+            keys[first] |= keys.pop(i)
+            names[first] |= names.pop(i)
+        lanes[first].append(node)
+        keys[first] |= node_keys
+        names[first] |= node_names
+    if not lanes:
+        lanes, names = [[]], [set()]
+    # Lanes keep the spec order of the actions they collected
+    order = {id(n): i for i, n in enumerate(nodes)}
+    for lane in lanes:
+        lane.sort(key=lambda n: order[id(n)])
+    return ParallelNode(lanes, [sorted(n) for n in names])
+
+
+def _check_parallel_safe(node: Node) -> None:
+    if isinstance(node, (ResultsNode, PlotResetNode, CalibrateNode, ParallelNode, JoinNode)):
+        kind = type(node).__name__.replace("Node", "").lower()
+        raise ValueError(f"'parallel' cannot contain '{kind}' actions; run them after the group")
+    if getattr(node, "background", False):
+        raise ValueError("'parallel' actions cannot be 'async: true'; "
+                         "the group already overlaps them")
+    for child in node.children():
+        _check_parallel_safe(child)
+
+
+def _node_resources(node: Node) -> tuple[set, set]:
+    """Instrument names and transports a node drives, including nested actions."""
+    keys: set = set()
+    names: set = set()
+    inst_name = getattr(node, "inst_name", None)
+    if inst_name is not None:
+        names.add(inst_name)
+        keys.add(inst_name)
+        transport = getattr(getattr(node.inst, "scpi", None), "t", None)
+        if transport is not None:
+            keys.add(id(transport))
+    for child in node.children():
+        child_keys, child_names = _node_resources(child)
+        keys |= child_keys
+        names |= child_names
+    if not keys:
+        keys.add(id(node))  # instrument-free actions (transforms) get a lane of their own
+    return keys, names
+
+
+def _build_call(spec: Any, ctx: Context) -> Node:
+    inst_name, method_name, inst, method = _bind(spec, "call", ctx)
+    save_as = spec.get("save_as")
+    replay = spec.get("replay")
+    if replay is not None and not isinstance(replay, bool):
+        raise ValueError(f"'call' replay must be true or false: {replay!r}")
+    return CallNode(
+        inst_name, method_name, method, _compile_args(spec, "call"),
+        save_as.split(".") if save_as else None, inst, bool(spec.get("async", False)), replay,
+    )
+
+
+def _build_measure(spec: Any, ctx: Context) -> Node:
+    inst_name, method_name, inst, method = _bind(spec, "measure", ctx)
+    return MeasureNode(
+        inst_name, method_name, method, _compile_args(spec, "measure"),
+        spec.get("save_as", method_name), inst, bool(spec.get("async", False)),
+    )
+
+
+def _build_join(spec: Any, ctx: Context) -> Node:
+    names = spec.get("inst") if isinstance(spec, dict) else spec
+    if isinstance(names, str):
+        names = [names]
+    for name in names or []:
+        if name not in ctx.instruments:
+            raise ValueError(f"'join' action uses unknown instrument '{name}'")
+    return JoinNode(list(names) if names else None)
+
+
+def _build_results(spec: Any, ctx: Context) -> Node:
+    if not isinstance(spec, dict):
+        return ResultsNode("results:update", None, True)
+    limits = spec.get("limits")
+    return ResultsNode(
+        spec.get("step", "results:update"),
+        _compile_value(limits) if limits is not None else None,
+        bool(spec.get("shutdown", True)),
+    )
+
+
+def _build_transform(spec: Any, ctx: Context) -> Node:
+    if ctx.transform is None:
+        raise RuntimeError("Transform action requested but no transform handler configured")
+    method = _require(spec, "method", "transform")
+    raw_args = spec.get("args", {})
+    if not isinstance(raw_args, dict):
+        raise ValueError("Transform args must be a mapping")
+    save_as = spec.get("save_as")
+    return TransformNode(
+        method,
+        [(k, _compile_value(v)) for k, v in raw_args.items()],
+        save_as.split(".") if save_as else None,
+    )
+
+
+def _build_batch(spec: Any, ctx: Context) -> Node:
+    children = spec.get("do") if isinstance(spec, dict) else spec
+    body = _compile_actions(children, ctx)
+    return BatchNode(body, _batch_targets(body))
+
+
+def _build_plot_reset(spec: Any, ctx: Context) -> Node:
+    return PlotResetNode(_compile_value((spec or {}).get("suffix", "snap")))
+
+
+def _build_calibrate(spec: Any, ctx: Context) -> Node:
+    name = _require(spec, "name", "calibrate")
+    if "save" not in spec:
+        raise ValueError(f"Calibration '{name}' must define a 'save' field")
+    return CalibrateNode(
+        name,
+        bool(spec.get("force", False)),
+        _compile_actions(spec.get("do"), ctx),
+        _compile_value(spec["save"]),
+    )
+
+
+# Checked in order; the first key present in an action selects its builder
+_BUILDERS: List[tuple[str, Callable[[Any, Context], Node]]] = [
+    ("sweep", _build_sweep),
+    ("foreach", _build_foreach),
+    ("adaptive", _build_adaptive),
+    ("call", _build_call),
+    ("measure", _build_measure),
+    ("results_update", _build_results),
+    ("update_results", _build_results),
+    ("transform", _build_transform),
+    ("batch", _build_batch),
+    ("parallel", _build_parallel),
+    ("join", _build_join),
+    ("plot_reset", _build_plot_reset),
+    ("calibrate", _build_calibrate),
+]
 
 
 def _num_points(start: float, stop: float, step: float) -> int:
@@ -203,30 +985,92 @@ def _num_points(start: float, stop: float, step: float) -> int:
     return int(math.floor((stop - start) / step)) + 1
 
 
-def _resolve(ctx: Context, env: Dict[str, Any], value: Any) -> Any:
+def _iter_values(source: Any) -> Iterator[Any]:
+    """Iterate a resolved foreach source.
+
+    Lists/tuples/arrays yield their items, a string is a CSV or NPY file path,
+    ``{file, column}`` selects one column of a file and ``{from, to, step}`` is a range.
+    """
+    if isinstance(source, (str, Path)):
+        return _iter_file(str(source), None)
+    if isinstance(source, dict):
+        if "file" in source:
+            return _iter_file(str(source["file"]), source.get("column"))
+        if "from" in source:
+            start, stop = float(source["from"]), float(source["to"])
+            step = float(source.get("step", 1))
+            return (start + i * step for i in range(_num_points(start, stop, step)))
+        raise ValueError(f"foreach source mapping needs 'file' or 'from'/'to': {source!r}")
+    if isinstance(source, np.ndarray):
+        return (_plain(row) for row in source)
+    if isinstance(source, (list, tuple)):
+        return iter(source)
+    raise ValueError(f"foreach source must be a list, array, file or range, got: {source!r}")
+
+
+def _iter_file(path: str, column: str | None) -> Iterator[Any]:
+    """Rows of a CSV (dicts, numeric fields as floats) or NPY file, read as they are consumed."""
+    if path.lower().endswith(".npy"):
+        for row in np.load(path, mmap_mode="r"):
+            yield _plain(row[column] if column else row)
+        return
+    with open(path, "r", encoding="utf-8", newline="") as fp:
+        for rec in csv.DictReader(fp):
+            row = {k: _number(v) for k, v in rec.items() if k is not None}
+            yield row[column] if column else row
+
+
+def _number(text: Any) -> Any:
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return text
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, np.void) and value.dtype.names:
+        return {name: _plain(value[name]) for name in value.dtype.names}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _compile_value(value: Any) -> Template:
+    """Precompile a spec value: constants, ``${env.path}`` and ``${cal.name.path}`` tokens."""
     if isinstance(value, str):
-        return _subst(ctx, env, value)
+        if value.startswith("${") and value.endswith("}"):
+            key = value[2:-1]
+            if key.startswith("cal."):
+                root, *rest = key[4:].split(".")
+                return lambda ctx, env: _walk(_cal_value(ctx, root), rest)
+            path = key.split(".")
+            if len(path) == 1:
+                return lambda ctx, env: env.get(key)
+            return lambda ctx, env: _walk(env, path)
+        return lambda ctx, env: value
     if isinstance(value, list):
-        return [_resolve(ctx, env, item) for item in value]
+        items = [_compile_value(item) for item in value]
+        return lambda ctx, env: [t(ctx, env) for t in items]
     if isinstance(value, dict):
-        return {k: _resolve(ctx, env, v) for k, v in value.items()}
-    return value
+        fields = [(k, _compile_value(v)) for k, v in value.items()]
+        return lambda ctx, env: {k: t(ctx, env) for k, t in fields}
+    return lambda ctx, env: value
 
 
-def _subst(ctx: Context, env: Dict[str, Any], token: str) -> Any:
-    if token.startswith("${") and token.endswith("}"):
-        key = token[2:-1]
-        if key.startswith("cal."):
-            path = key[4:]
-            root, *rest = path.split(".")
-            value = ctx.cal_cache.get(root)
-            if value is None:
-                value = ctx.cal_store.get(root)
-                if value is not None:
-                    ctx.cal_cache[root] = value
-            return _walk(value, rest)
-        return _walk(env, key.split("."))
-    return token
+def _resolve(ctx: Context, env: Dict[str, Any], value: Any) -> Any:
+    return _compile_value(value)(ctx, env)
+
+
+def _cal_value(ctx: Context, root: str) -> Any:
+    value = ctx.cal_cache.get(root)
+    if value is None and ctx.cal_store is not None:
+        value = ctx.cal_store.get(root)
+        if value is not None:
+            ctx.cal_cache[root] = value
+            precompile(value)
+    return value
 
 
 def _walk(value: Any, path: List[str]) -> Any:
@@ -242,7 +1086,10 @@ def _walk(value: Any, path: List[str]) -> Any:
 
 
 def _set_mapping_value(target: Dict[str, Any], dotted_key: str, value: Any) -> None:
-    parts = dotted_key.split(".")
+    _set_path(target, dotted_key.split("."), value)
+
+
+def _set_path(target: Dict[str, Any], parts: List[str], value: Any) -> None:
     cursor: Dict[str, Any] = target
     for part in parts[:-1]:
         next_val = cursor.get(part)
@@ -253,7 +1100,7 @@ def _set_mapping_value(target: Dict[str, Any], dotted_key: str, value: Any) -> N
     cursor[parts[-1]] = value
 
 
-def _flat_env(env: Dict[str, Any]) -> Dict[str, Any]:
+def _flat_env(env: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
     flat: Dict[str, Any] = {}
     def walk(prefix, data):
         for k, v in data.items():
@@ -262,16 +1109,71 @@ def _flat_env(env: Dict[str, Any]) -> Dict[str, Any]:
                 walk(name, v)
             else:
                 flat[name] = v
-    walk("", env)
+    walk(prefix, env)
     return flat
 
 
+def _batch_targets(nodes: List[Node]) -> List[Scpi]:
+    """Distinct Scpi sessions of the instruments driven by call/measure nodes."""
+    targets: List[Scpi] = []
+    for node in nodes:
+        scpi = getattr(getattr(node, "inst", None), "scpi", None)
+        if isinstance(scpi, Scpi) and all(scpi is not t for t in targets):
+            targets.append(scpi)
+    return targets
+
+
+def _check_instrument_errors(ctx: Context, *policies: str) -> None:
+    """Drain deferred SCPI error queues of instruments whose policy matches a boundary.
+
+    Only instruments that were sent commands since their last check are polled. With
+    the async engine the drain runs in the instrument's lane, after calls launched
+    there are done, so SYST:ERR? never cuts into their exchanges; AsyncScpi sessions
+    are drained the same way.
+    """
+    for name, inst in ctx.instruments.items():
+        scpi = getattr(inst, "scpi", None)
+        if not isinstance(scpi, (Scpi, AsyncScpi)):
+            continue
+        if not scpi.err_poll or scpi.err_policy not in policies:
+            continue
+        if ctx.engine is not None:
+            if scpi.pending_check or ctx.engine.busy(name):
+                drain = _adrain_errors if isinstance(scpi, AsyncScpi) else _drain_errors
+                ctx.engine.call(name, drain, scpi)
+        elif isinstance(scpi, Scpi) and scpi.pending_check:
+            scpi.check_errors()
+
+
+def _drain_errors(scpi: Scpi) -> None:
+    if scpi.pending_check:
+        scpi.check_errors()
+
+
+async def _adrain_errors(scpi: AsyncScpi) -> None:
+    if scpi.pending_check:
+        await scpi.check_errors()
+
+
+def _flush_writer(ctx: Context) -> None:
+    """Push buffered records to disk (shutdown and limit violations); never raises."""
+    flush = getattr(ctx.writer, "flush", None)
+    if flush is not None:
+        try:
+            flush()
+        except Exception:
+            pass
+
+
 def _safe_shutdown(ctx: Context) -> None:
     """Attempt a graceful, ordered shutdown of instruments.
 
     Respects ctx.shutdown_order if provided, then shuts down any remaining
     instruments in arbitrary order. Ignores errors from individual devices.
     """
+    if ctx.engine is not None:
+        ctx.engine.wait_all()  # let launched moves finish before switching things off
+    _flush_writer(ctx)
     seen: set[str] = set()
     order = ctx.shutdown_order or []
     # First, explicit order
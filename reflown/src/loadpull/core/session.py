@@ -5,7 +5,7 @@ import json
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict
 
 from .calibration import CalibrationStore
 from .results import JsonlWriter
@@ -15,6 +15,8 @@ try:
     from .transport import VisaTransport  # Optional dependency
 except ImportError:  # pragma: no cover - fallback when VISA support is absent
     VisaTransport = None  # type: ignore
+if TYPE_CHECKING:
+    from .aio import AsyncScpi
 
 
 @dataclass
@@ -85,7 +87,47 @@ class Session:
             transport = SocketTransport(resource, 5025)
 
         transport.open()
-        return Scpi(transport)
+        return Scpi(transport, **self.scpi_options(inst_name))
+
+    async def new_async_scpi(self, inst_name: str) -> "AsyncScpi":
+        """Async counterpart of new_scpi(): asyncio sockets, VISA offloaded to a thread."""
+        from .aio import AsyncScpi, AsyncSocketTransport, AsyncVisaTransport
+
+        resource = self.bench.instruments.get(inst_name)
+        if not isinstance(resource, str):
+            raise ValueError(f"No SCPI resource for instrument {inst_name}")
+        if resource.startswith("GPIB") or resource.startswith("TCPIP0::"):
+            transport = AsyncVisaTransport(resource)
+        elif ":" in resource:
+            host, port_str = resource.split(":", 1)
+            transport = AsyncSocketTransport(host, int(port_str))
+        else:
+            transport = AsyncSocketTransport(resource, 5025)
+        await transport.open()
+        # Batching, the state cache and the terminator are sync-Scpi options
+        options = {k: v for k, v in self.scpi_options(inst_name).items()
+                   if k not in ("terminator", "batch_limit", "state_cache")}
+        return AsyncScpi(transport, **options)
+
+    def scpi_options(self, inst_name: str) -> Dict[str, Any]:
+        """Return Scpi keyword options from the bench [scpi] table.
+
+        Top-level keys apply to every instrument; a sub-table named after the
+        instrument overrides them, e.g.::
+
+            [scpi]
+            err_policy = "action"
+            [scpi.VNA]
+            err_policy = "point"
+        """
+        table = (self.bench.extra_tables or {}).get("scpi")
+        if not isinstance(table, dict):
+            return {}
+        options = {k: v for k, v in table.items() if not isinstance(v, dict)}
+        override = table.get(inst_name)
+        if isinstance(override, dict):
+            options.update(override)
+        return options
 
     def instrument_config(self, name: str) -> Dict[str, Any] | None:
         """Return optional per-instrument config.
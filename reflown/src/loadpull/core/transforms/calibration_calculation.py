@@ -6,6 +6,7 @@ from typing import Optional
 import skrf
 import numpy as np
 
+from ..caltable import cal_table
 from .registry import TransformRegistry
 from .utils import _power_correction_cal, _to_array, _extract_frequency_vector, _convert_dbm_to_linear
 
@@ -78,83 +79,41 @@ def register_calibration_calculation_transforms(registry: TransformRegistry) ->
           - probe_calfile: mapping with per-frequency complex arrays for C10, E10, E11, Es2, Er2, Ed2 and frequency vector (freq_hz)
           - PM_s1p: path to a .s1p file (Gamma_L)
           - wave_values: VNA capture with b2 (complex)
+          - interpolate: allow frequencies between cal grid points (default: exact match)
         """
-        probe_terms_raw = payload.get("probe_calfile") or {}
-        pm_s1p = payload.get("pm_s1p") or {}
-        freq_pm = np.asarray(pm_s1p.get("freq_hz") or [], dtype=float)
-        pm_s11 = _to_array(pm_s1p.get("s11"), dtype=complex)
+        # Compiled once per cal payload (memoized), so each call is a per-frequency lookup
+        probe = cal_table(payload.get("probe_calfile") or {})
+        pm = cal_table(payload.get("pm_s1p") or {})
         wave_values = payload.get("wave_values") or {}
-
-        # Convert probe error terms to complex arrays
-        probe_terms = _load_error_terms(probe_terms_raw)
-        freq_probe = np.asarray(probe_terms_raw.get("freq_hz") or probe_terms_raw.get("frequency") or [], dtype=float)
+        interpolate = bool(payload.get("interpolate", False))
 
         # Measurement frequency (Hz)
         freq_wave = _extract_frequency_vector(wave_values)
         f_target = float(freq_wave.ravel()[0]) if freq_wave is not None and freq_wave.size else None
-        if f_target is None and freq_pm is not None and freq_pm.size:
-            f_target = float(freq_pm[0])
-        if f_target is None and freq_probe.size:
-            f_target = float(freq_probe[0])
+        if f_target is None and pm.freq_hz.size:
+            f_target = float(pm.freq_hz[0])
+        if f_target is None and probe.freq_hz.size:
+            f_target = float(probe.freq_hz[0])
         if f_target is None:
             return {}
 
-        # Require matching frequency grids; filter to intersection, no interpolation
-        common_freqs = freq_probe
-        if freq_pm.size:
-            common_freqs = np.intersect1d(freq_probe, freq_pm)
-            if common_freqs.size != freq_pm.size or common_freqs.size != freq_probe.size:
-                print("Warning: probe and PM frequency grids differ; filtering to common frequencies")
-        if common_freqs.size == 0:
-            print("Warning: no common frequencies between probe and PM data")
-            return {}
-        if f_target is not None and not np.isclose(common_freqs, f_target).any():
+        # Require the frequency on both grids unless interpolation is requested; either way
+        # the probe cal needs a frequency axis
+        on_grid = probe.has(f_target) and not (pm.freq_hz.size and not pm.has(f_target))
+        if not probe.freq_hz.size or (not interpolate and not on_grid):
             print(f"Warning: measurement frequency {f_target} not present in both probe/PM grids; skipping")
             return {}
-        # Choose target frequency
-        if f_target is None:
-            f_target = float(common_freqs[0])
-
-        # Masks for the selected frequency
-        probe_mask = np.isclose(freq_probe, f_target) if freq_probe.size else None
-        pm_mask = np.isclose(freq_pm, f_target) if freq_pm.size else None
-
-        # Extract probe terms at target frequency
-        def _get_term(name: str) -> complex:
-            arr = probe_terms.get(name)
-            if arr is None:
-                return complex(np.nan, np.nan)
-            # Normalize to ndarray for masking
-            if isinstance(arr, list):
-                arr = np.asarray(arr, dtype=complex)
-            if isinstance(arr, np.ndarray):
-                if arr.size == 0:
-                    return complex(np.nan, np.nan)
-                # Only use values at the common frequency index
-                if freq_probe.size and arr.size == freq_probe.size:
-                    if probe_mask is not None:
-                        arr = arr[probe_mask]
-                    if arr.size:
-                        return complex(arr.ravel()[0])
-                    return complex(np.nan, np.nan)
-                return complex(arr.ravel()[0])
-            return complex(arr)
-
-        C10 = _get_term("C10")
-        E10 = _get_term("E10")
-        E11 = _get_term("E11")
-        Es2 = _get_term("Es2")
-        Ed2 = _get_term("Ed2")
-        Er2 = _get_term("Er2")
+
+        C10 = probe.term("C10", f_target, interpolate)
+        E10 = probe.term("E10", f_target, interpolate)
+        E11 = probe.term("E11", f_target, interpolate)
+        Es2 = probe.term("Es2", f_target, interpolate)
+        Ed2 = probe.term("Ed2", f_target, interpolate)
+        Er2 = probe.term("Er2", f_target, interpolate)
 
         # PM reflection Gamma_pm at target frequency
-        gamma_pm = None
-        if isinstance(pm_s11, np.ndarray) and pm_s11.size and pm_mask is not None:
-            subset = pm_s11[pm_mask]
-            if subset.size:
-                gamma_pm = complex(subset.ravel()[0])
-        if gamma_pm is None:
-            gamma_pm = complex(np.nan, np.nan)
+        gamma_pm = (pm.term("s11", f_target, interpolate) if pm.freq_hz.size
+                    else complex(np.nan, np.nan))
 
         # Gamma_L same as PM reflection here (no interpolation)
         gamma_L = gamma_pm
@@ -227,18 +186,3 @@ def _onwafer_power_278582(payload: dict) -> dict:
 
     output_probe_power = abs(b2)^2*abs(C10/E10)*abs(1-E11*Gamma_t)^2*(1-abs(Gamma_L)^2)
     return {"output_probe_power": output_probe_power}
-
-def _load_error_terms(payload: dict) -> dict:
-    """Convert error-term real/imag pairs in the payload into complex values."""
-    terms: dict[str, object] = {}
-    for name, data in (payload or {}).items():
-        if str(name).lower() == "csv":
-            continue  # ignore any CSV path metadata
-        if not isinstance(data, dict):
-            continue
-        arr = _to_array({"real": data.get("real"), "imag": data.get("imag")}, dtype=complex)
-        if arr is None:
-            continue
-        terms[name] = complex(arr.ravel()[0]) if arr.size == 1 else [complex(x) for x in arr.ravel()]
-    return terms
-    
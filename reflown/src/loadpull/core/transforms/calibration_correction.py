@@ -1,16 +1,69 @@
 from __future__ import annotations
 
+from typing import Any, Mapping
+
 import numpy as np
 
+from ..errorcorrection import ErrorTerms, correct_waves, error_terms, stack_waves
 from .registry import TransformRegistry
 from .utils import _extract_array_field
 
 
+def _gamma_out(gamma: np.ndarray, lists: bool = True) -> dict:
+    out = {"real": gamma.real, "imag": gamma.imag, "mag": np.abs(gamma),
+           "angle_rad": np.angle(gamma)}
+    return {k: v.tolist() for k, v in out.items()} if lists else out
+
+
+def _waves_out(out: dict, freq_hz: np.ndarray, lists: bool = True) -> dict:
+    """corr_waves result fields from correct_waves() output."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma_s = 1.0 / out["gamma_in"]
+    conv = (lambda a: a.tolist()) if lists else (lambda a: a)
+    return {
+        "freq_hz": conv(freq_hz),
+        "gamma_L": _gamma_out(out["gamma_L"], lists),
+        "gamma_in": _gamma_out(out["gamma_in"], lists),
+        "gamma_S": _gamma_out(gamma_s, lists),
+        "P_L": {"W": conv(out["P_L_W"]), "dBm": conv(out["P_L_dBm"])},
+        "P_in": {"W": conv(out["P_in_W"]), "dBm": conv(out["P_in_dBm"])},
+        "gain_dB": conv(out["gain_dB"]),
+    }
+
+
+def _wave_columns(cols: dict) -> dict | None:
+    """Stacked (N, F) a1/b1/a2/b2 columns of a batch, {} if a wave is missing, None if unstacked."""
+    wave = cols.get("wave_data", cols)
+    if not isinstance(wave, Mapping):
+        return None
+    out = {}
+    for key in ("a1", "b1", "a2", "b2"):
+        arr = wave.get(key, wave.get(key.upper()))
+        if arr is None:
+            return {}
+        if not isinstance(arr, np.ndarray):
+            return None  # a capture shared by every payload is not stacked
+        out[key] = arr.reshape(arr.shape[0], -1)
+    return out
+
+
+def _same_rows(arr: Any) -> np.ndarray | None:
+    """The common row of an (N, F) column, or None if the rows differ."""
+    arr = np.asarray(arr, dtype=float)
+    arr = arr.reshape(arr.shape[0], -1) if arr.ndim else arr.reshape(1, 1)
+    return arr[0] if np.array_equal(arr, np.broadcast_to(arr[0], arr.shape)) else None
+
+
 def register_calibration_corrections_transforms(registry: TransformRegistry) -> None:
 
     def corr_gamma(payload: dict, _cal: dict) -> dict:
+        """Γ_L = a2/b2 and Γ_S = a1/b1; with ``terms`` (error terms) they are corrected."""
         b1_keys, a1_keys, b2_keys, a2_keys = ["b1", "B1"], ["a1", "A1"], ["b2", "B2"], ["a2", "A2"]
         wave_data = payload.get("wave_data") or payload
+        if payload.get("terms") is not None:
+            out = corr_waves({"wave_data": wave_data, "terms": payload["terms"],
+                              "freq_hz": payload.get("freq_hz")}, _cal)
+            return {"gamma_L": out["gamma_L"], "gamma_S": out["gamma_S"]} if out else {}
 
         b1_arr = _extract_array_field(wave_data, b1_keys, dtype=complex)
         a1_arr = _extract_array_field(wave_data, a1_keys, dtype=complex)
@@ -45,11 +98,90 @@ def register_calibration_corrections_transforms(registry: TransformRegistry) ->
             },
         }
 
-    registry.register("corr_gamma", corr_gamma)
+    def corr_gamma_batch(cols: dict, _cal: dict) -> dict | None:
+        if cols.get("terms") is not None:
+            sub = {"wave_data": cols.get("wave_data", cols), "terms": cols["terms"]}
+            if cols.get("freq_hz") is not None:
+                sub["freq_hz"] = cols["freq_hz"]
+            out = corr_waves_batch(sub, _cal)
+            return {"gamma_L": out["gamma_L"], "gamma_S": out["gamma_S"]} if out else out
+        waves = _wave_columns(cols)
+        if not waves:
+            return waves
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                "gamma_L": _gamma_out(waves["a2"] / waves["b2"], lists=False),
+                "gamma_S": _gamma_out(waves["a1"] / waves["b1"], lists=False),
+            }
+
+    registry.register("corr_gamma", corr_gamma, batch=corr_gamma_batch,
+                      per_row=("gamma_L", "gamma_S"))
+
+    def corr_waves(payload: dict, _cal: dict) -> dict:
+        """Error-correct a capture_point() dict, or a list of them, in one vectorized pass.
+
+        ``terms`` are the error terms (RSZVA.get_error_terms() or a stored cal with the
+        same keys); they are aligned to the capture's frequency axis. Returns corrected
+        Γ_L, Γ_in (and Γ_S = 1/Γ_in), P_L/P_in in W and dBm and the gain; with a list of
+        captures every field is nested [point][frequency].
+        """
+        wave_data = payload.get("wave_data")
+        raw_terms = payload.get("terms")
+        if wave_data is None or raw_terms is None:
+            return {}
+        terms = error_terms(raw_terms)
+        freq, waves = stack_waves(wave_data)
+        x = wave_data.get("x") if isinstance(wave_data, dict) else None
+        if payload.get("freq_hz") is not None:
+            # Given by the caller (e.g. the CW frequency of a power sweep): always align
+            terms = terms.at(np.atleast_1d(np.asarray(payload["freq_hz"], dtype=float)))
+        elif freq is not None and not (isinstance(x, dict) and x.get("type") == "pow"):
+            terms = terms.at(freq)
+        out = correct_waves(terms, waves["a1"], waves["b1"], waves["a2"], waves["b2"],
+                            scale=float(payload.get("scale", 1.0)))
+        return _waves_out(out, terms.freq_hz)
+
+    def corr_waves_batch(cols: dict, _cal: dict) -> dict | None:
+        """corr_waves over N single captures on one frequency grid: (N, F) arrays in one pass."""
+        raw_terms = cols.get("terms")
+        waves = _wave_columns(cols)
+        if raw_terms is None or waves == {}:
+            return {}
+        if waves is None or not isinstance(raw_terms, (Mapping, ErrorTerms)):
+            return None
+        terms = error_terms(raw_terms)
+        wave = cols.get("wave_data", cols)
+        n = waves["a1"].shape[0]
+        x = wave.get("x")
+        freq_col = cols.get("freq_hz")
+        if freq_col is None:
+            kind = np.asarray(x.get("type") if isinstance(x, Mapping) else None).ravel()
+            if kind.size and kind[0] == "pow":
+                x = None  # the x axis is power, not frequency
+            freq_col = x.get("x_data") if isinstance(x, Mapping) else x
+        if freq_col is not None:
+            freq = _same_rows(freq_col)
+            if freq is None:
+                return None  # captures on different grids: correct them one by one
+            terms = terms.at(freq)
+        scale = np.asarray(cols.get("scale", 1.0), dtype=float)
+        scale = scale.reshape(-1, 1) if scale.ndim else scale
+        out = correct_waves(terms, waves["a1"], waves["b1"], waves["a2"], waves["b2"], scale=scale)
+        return _waves_out(out, np.broadcast_to(terms.freq_hz, (n, terms.freq_hz.size)), lists=False)
+
+    registry.register("corr_waves", corr_waves, batch=corr_waves_batch,
+                      per_row=("freq_hz", "gamma_L", "gamma_in", "gamma_S", "P_L", "P_in",
+                               "gain_dB"))
     
     def corr_power(payload: dict, cal: dict) -> dict:
         if "power" in payload:
             return {"power_corr": payload["power"] - cal.get("power_offset", 0.0)}
         return {}
 
-    registry.register("corr_power", corr_power)
\ No newline at end of file
+    def corr_power_batch(cols: dict, cal: dict) -> dict:
+        if "power" in cols:
+            power = np.asarray(cols["power"], dtype=float)
+            return {"power_corr": power - cal.get("power_offset", 0.0)}
+        return {}
+
+    registry.register("corr_power", corr_power, batch=corr_power_batch, per_row=("power_corr",))
\ No newline at end of file
@@ -1,29 +1,54 @@
 from __future__ import annotations
 
 from .registry import TransformRegistry
-from .utils import _read_sweep_points
+from .utils import _sweep_table
 
 
 def register_loadpull_sweep_transforms(registry: TransformRegistry) -> None:
-    
+
     def loadpull_sweep_len(payload: dict, _cal: dict) -> dict:
         path = payload.get("file") or payload.get("path")
-        pts = _read_sweep_points(str(path))
-        return {"count": max(0, len(pts) - 1)}
+        return {"count": max(0, len(_sweep_table(str(path))) - 1)}
 
     registry.register("loadpull_sweep_len", loadpull_sweep_len)
 
     def loadpull_sweep_point(payload: dict, _cal: dict) -> dict:
+        """Sweep point ``index``; with ``order`` (e.g. from plan_sweep) the index is a
+        step in that order and ``orig_index`` is the file row it maps to."""
         path = payload.get("file") or payload.get("path")
         idx_raw = payload.get("index")
         try:
             idx = int(idx_raw)
         except Exception:
             return {}
-        pts = _read_sweep_points(str(path))
-        if idx < 0 or idx >= len(pts):
+        order = payload.get("order")
+        if order:
+            if idx < 0 or idx >= len(order):
+                return {}
+            idx = int(order[idx])
+        table = _sweep_table(str(path))
+        if idx < 0 or idx >= len(table):
             return {}
-        mag, deg = pts[idx]
-        return {"gamma_mag": mag, "gamma_deg": deg}
+        row = table[idx]
+        return {"gamma_mag": float(row["mag"]), "gamma_deg": float(row["deg"]), "orig_index": idx}
 
     registry.register("loadpull_sweep_point", loadpull_sweep_point)
+
+    def loadpull_sweep_table(payload: dict, _cal: dict) -> dict:
+        """Whole sweep file in one step: column lists plus ``points``, one
+        loadpull_sweep_point-style dict per row (in ``order`` if given)."""
+        path = payload.get("file") or payload.get("path")
+        table = _sweep_table(str(path))
+        order = payload.get("order")
+        rows = [int(i) for i in order] if order else range(len(table))
+        mags, degs = table["mag"].tolist(), table["deg"].tolist()
+        return {
+            "count": max(0, len(table) - 1),
+            "mag": mags,
+            "deg": degs,
+            "real": table["real"].tolist(),
+            "imag": table["imag"].tolist(),
+            "points": [{"gamma_mag": mags[i], "gamma_deg": degs[i], "orig_index": i} for i in rows],
+        }
+
+    registry.register("loadpull_sweep_table", loadpull_sweep_table)
@@ -34,7 +34,19 @@ def register_plot_transforms(registry: TransformRegistry) -> None:
             return {"angle_rad": float(ang.ravel()[0]), "mag": float(mag.ravel()[0])}
         return {"angle_rad": ang.tolist(), "mag": mag.tolist()}
 
-    registry.register("z2gamma", z2gamma)
+    def z2gamma_batch(cols: dict, _cal: dict) -> dict | None:
+        if "real" not in cols or "imag" not in cols:
+            return {}
+        pair = _aligned(cols["real"], cols["imag"])
+        if pair is None:
+            return None
+        z = pair[0] + 1j * pair[1]
+        z0 = np.asarray(cols.get("z0", 50.0), dtype=float)
+        z0 = z0.reshape(z0.shape + (1,) * (z.ndim - z0.ndim)) if z0.ndim else z0
+        gamma = (z - z0) / (z + z0)
+        return {"angle_rad": np.angle(gamma), "mag": np.abs(gamma)}
+
+    registry.register("z2gamma", z2gamma, batch=z2gamma_batch, per_row=("angle_rad", "mag"))
 
     def set_plot_gamma(payload: dict, _cal: dict) -> dict:
         if "mag" in payload and "rad" in payload:
@@ -62,4 +74,32 @@ def register_plot_transforms(registry: TransformRegistry) -> None:
             return {"angle_rad": ang.tolist(), "mag": mag.tolist()}
         return {}
 
-    registry.register("set_plot_gamma", set_plot_gamma)
+    def set_plot_gamma_batch(cols: dict, _cal: dict) -> dict | None:
+        if "mag" in cols and ("rad" in cols or "deg" in cols):
+            if "rad" in cols:
+                ang = np.asarray(cols["rad"], dtype=float)
+            else:
+                ang = np.deg2rad(np.asarray(cols["deg"], dtype=float))
+            return {"angle_rad": ang, "mag": np.asarray(cols["mag"])}
+        if "real" in cols and "imag" in cols:
+            pair = _aligned(cols["real"], cols["imag"])
+            if pair is None:
+                return None
+            z = pair[0] + 1j * pair[1]
+            return {"angle_rad": np.angle(z), "mag": np.abs(z)}
+        return {}
+
+    registry.register("set_plot_gamma", set_plot_gamma, batch=set_plot_gamma_batch,
+                      per_row=("angle_rad", "mag"))
+
+
+def _aligned(real: np.ndarray, imag: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+    """Batch columns (N, ...) with a per-row scalar broadcast against a per-row vector."""
+    r = np.asarray(real, dtype=float)
+    i = np.asarray(imag, dtype=float)
+    r = r.reshape(r.shape + (1,) * (i.ndim - r.ndim)) if r.ndim < i.ndim else r
+    i = i.reshape(i.shape + (1,) * (r.ndim - i.ndim)) if i.ndim < r.ndim else i
+    try:
+        return tuple(np.broadcast_arrays(r, i))  # type: ignore[return-value]
+    except ValueError:
+        return None
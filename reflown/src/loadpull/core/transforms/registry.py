@@ -1,24 +1,147 @@
 from __future__ import annotations
 
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, Iterable, List, Mapping
+
+import numpy as np
 
 TransformFunc = Callable[[dict, dict], dict]
+# Columns of N payloads in, a result dict out (None declines the batch); the keys registered
+# as ``per_row`` hold arrays with a leading axis of N, the others are shared by every payload
+BatchFunc = Callable[[Dict[str, Any], dict], "Dict[str, Any] | None"]
 
 
 class TransformRegistry:
-    """Registry for measurement post-processing callbacks."""
+    """Registry for measurement post-processing callbacks.
+
+    A transform may also register a ``batch`` implementation that works on columns
+    of many payloads at once; apply_many() uses it whenever it is handed a batch.
+    ``per_row`` names the batch output keys that are split into one value per payload.
+    """
 
     def __init__(self) -> None:
         self._transforms: Dict[str, TransformFunc] = {}
+        self._batch: Dict[str, BatchFunc] = {}
+        self._per_row: Dict[str, frozenset] = {}
 
-    def register(self, method: str, func: TransformFunc) -> None:
+    def register(self, method: str, func: TransformFunc, batch: BatchFunc | None = None,
+                 per_row: Iterable[str] = ()) -> None:
         self._transforms[method] = func
+        if batch is not None:
+            per_row = frozenset(per_row)
+            if not per_row:
+                raise ValueError(f"Transform '{method}': a batch implementation needs per_row keys")
+            self._batch[method] = batch
+            self._per_row[method] = per_row
+        else:
+            self._batch.pop(method, None)
+            self._per_row.pop(method, None)
 
     def get(self, method: str) -> TransformFunc | None:
         return self._transforms.get(method)
 
+    def get_batch(self, method: str) -> BatchFunc | None:
+        return self._batch.get(method)
+
     def apply(self, method: str, payload: dict, cal_cache: dict) -> dict:
         func = self.get(method)
         if not func:
             raise KeyError(f"Transform '{method}' not found in registry")
         return func(payload, cal_cache)
+
+    def apply_batch(self, method: str, columns: Dict[str, Any],
+                    cal_cache: dict) -> Dict[str, Any] | None:
+        """Run the vectorized implementation on payload columns (see columns())."""
+        batch = self.get_batch(method)
+        if not batch:
+            raise KeyError(f"Transform '{method}' has no batch implementation")
+        return batch(columns, cal_cache)
+
+    def apply_many(self, method: str, payloads: List[dict], cal_cache: dict) -> List[dict]:
+        """Apply a transform to a batch of payloads; results are in payload order.
+
+        With a batch implementation the payloads are turned into columns and split
+        back into one result per payload; payloads that do not stack (different
+        keys, ragged arrays) or a batch that returns None fall back to one call each.
+        """
+        func = self.get(method)
+        if not func:
+            raise KeyError(f"Transform '{method}' not found in registry")
+        batch = self.get_batch(method)
+        if batch is not None and payloads:
+            try:
+                cols = columns(payloads)
+            except ValueError:
+                cols = None
+            out = batch(cols, cal_cache) if cols is not None else None
+            if out is not None:
+                return rows(out, len(payloads), self._per_row[method])
+        return [func(payload, cal_cache) for payload in payloads]
+
+
+# Value types that always get a leading axis of N, even when every payload shares one
+_STACKED = (list, tuple, np.ndarray, np.generic, str, bytes, int, float, complex, bool, type(None))
+
+
+def columns(payloads: List[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Stack N payloads key by key.
+
+    Mappings and other objects shared by every payload (the same object, e.g.
+    ``${cal.name}``) are passed once as they are; other ``{real, imag}`` mappings become
+    complex arrays and other mappings nested columns; numbers, strings and arrays are
+    stacked with a leading axis of N.
+    Raises ValueError if the payloads do not have the same keys or do not stack.
+    """
+    keys = list(payloads[0])
+    if any(len(p) != len(keys) or any(k not in p for k in keys) for p in payloads[1:]):
+        raise ValueError("payloads have different keys")
+    out: Dict[str, Any] = {}
+    for key in keys:
+        values = [p[key] for p in payloads]
+        first = values[0]
+        if not isinstance(first, _STACKED) and all(v is first for v in values[1:]):
+            out[key] = first
+        elif all(isinstance(v, Mapping) for v in values):
+            if all("real" in v and "imag" in v for v in values):
+                real = _stack([v["real"] for v in values], float)
+                out[key] = real + 1j * _stack([v["imag"] for v in values], float)
+            else:
+                out[key] = columns(values)
+        else:
+            out[key] = _stack(values, None)
+    return out
+
+
+def _stack(values: List[Any], dtype: Any) -> np.ndarray:
+    try:
+        arr = np.asarray(values, dtype=dtype)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"values do not stack: {exc}") from exc
+    if arr.dtype == object:
+        raise ValueError("values do not stack into a numeric or string array")
+    return arr
+
+
+def rows(out: Mapping[str, Any], n: int, per_row: Iterable[str]) -> List[dict]:
+    """Split batch output into n result dicts with plain lists and numbers, like apply().
+
+    Arrays under the ``per_row`` keys have a leading axis of n and are split; the other
+    keys are shared and copied into every result.
+    """
+    per_row = set(per_row)
+    shared = {k: _plain(v) for k, v in out.items() if k not in per_row}
+    return [{**shared, **{k: _row(v, i, n, k) for k, v in out.items() if k in per_row}}
+            for i in range(n)]
+
+
+def _row(value: Any, i: int, n: int, key: str) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _row(v, i, n, f"{key}.{k}") for k, v in value.items()}
+    if not (isinstance(value, np.ndarray) and value.ndim and value.shape[0] == n):
+        raise ValueError(f"batch output '{key}' is not an array with one row per payload")
+    return value[i].tolist()
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _plain(v) for k, v in value.items()}
+    return value.tolist() if isinstance(value, (np.ndarray, np.generic)) else value
@@ -3,24 +3,52 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Iterable, Optional
 import csv
+import os
 
 import numpy as np
 import skrf
 
 
-def _read_sweep_points(path: str) -> list[tuple[float, float]]:
-    rows: list[tuple[float, float]] = []
-    with open(path, "r", encoding="utf-8") as fp:
-        reader = csv.DictReader(fp)
-        # Expect columns: mag, deg, real, imag (we only need mag/deg)
-        for rec in reader:
+_SWEEP_DTYPE = np.dtype([("mag", float), ("deg", float), ("real", float), ("imag", float)])
+_SWEEP_TABLES: dict[str, tuple[tuple[int, int], np.ndarray]] = {}
+
+
+def _sweep_table(path: str) -> np.ndarray:
+    """Sweep CSV (columns mag, deg, real, imag) as a read-only structured array.
+
+    Parsed once per file and cached by path, mtime and size, so per-point lookups
+    are O(1). Rows without a numeric mag/deg are skipped; missing real/imag are
+    derived from mag/deg.
+    """
+    full = os.path.abspath(path)
+    st = os.stat(full)
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _SWEEP_TABLES.get(full)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    rows: list[tuple[float, float, float, float]] = []
+    with open(full, "r", encoding="utf-8") as fp:
+        for rec in csv.DictReader(fp):
             try:
                 mag = float(rec.get("mag"))
                 deg = float(rec.get("deg"))
             except Exception:
                 continue
-            rows.append((mag, deg))
-    return rows
+            try:
+                re_, im = float(rec.get("real")), float(rec.get("imag"))
+            except Exception:
+                g = mag * np.exp(1j * np.radians(deg))
+                re_, im = float(g.real), float(g.imag)
+            rows.append((mag, deg, re_, im))
+    table = np.array(rows, dtype=_SWEEP_DTYPE)
+    table.flags.writeable = False
+    _SWEEP_TABLES[full] = (stamp, table)
+    return table
+
+
+def _read_sweep_points(path: str) -> list[tuple[float, float]]:
+    table = _sweep_table(path)
+    return list(zip(table["mag"].tolist(), table["deg"].tolist()))
 
 
 def _power_correction_cal(
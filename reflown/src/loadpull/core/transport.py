@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Protocol, Optional
+from typing import Callable, Generator, Protocol, Optional
 
 
 class Transport(Protocol):
@@ -7,8 +7,40 @@ class Transport(Protocol):
     def close(self) -> None: ...
     def write(self, data: str) -> None: ...
     def read(self, timeout_s: float) -> str: ...
+    def read_block(self, timeout_s: float) -> bytes: ...
     def query(self, data: str) -> str: ...
 
+
+def _block_parser() -> Generator[int, bytes, bytes]:
+    """Parse one IEEE 488.2 definite-length block ``#<n><length><payload>``.
+
+    Yields how many bytes to read next and is sent them back; returns the payload.
+    The byte following the block (';' between compound-query responses or the
+    line terminator after the last one) is consumed as well.
+    """
+    head = yield 2
+    if head[:1] != b"#":
+        raise ValueError(f"Expected IEEE 488.2 block header, got {head!r}")
+    ndigits = int(head[1:2])
+    if ndigits == 0:
+        raise ValueError("Indefinite-length (#0) blocks are not supported")
+    length = int((yield ndigits))
+    payload = yield length
+    if (yield 1) == b"\r":
+        yield 1
+    return payload
+
+
+def _read_block(read_exact: Callable[[int], bytes]) -> bytes:
+    """Read one IEEE 488.2 block (see _block_parser) with a blocking ``read_exact``."""
+    parser = _block_parser()
+    n = next(parser)
+    try:
+        while True:
+            n = parser.send(read_exact(n))
+    except StopIteration as done:
+        return done.value
+
 class VisaTransport(Transport):
     """
     Lightweight GPIB transport using PyVISA.
@@ -71,6 +103,15 @@ class VisaTransport(Transport):
         finally:
             self._inst.timeout = old
 
+    def read_block(self, timeout_s: float) -> bytes:
+        assert self._inst is not None, "Transport not open"
+        old = self._inst.timeout
+        try:
+            self._inst.timeout = int(timeout_s * 1000)
+            return _read_block(lambda n: bytes(self._inst.read_bytes(n, break_on_termchar=False)))
+        finally:
+            self._inst.timeout = old
+
     def query(self, data: str) -> str:
         assert self._inst is not None, "Transport not open"
         self._inst.write(data)
@@ -83,6 +124,7 @@ class SocketTransport:
         self._addr = (host, port)
         self._sock: Optional[socket.socket] = None
         self._term = terminator.encode()
+        self._buf = bytearray()
 
 
     def open(self) -> None:
@@ -107,17 +149,34 @@ class SocketTransport:
     def read(self, timeout_s: float) -> str:
         assert self._sock is not None, "Transport not open"
         self._sock.settimeout(timeout_s)
-        chunks = []
-        while True:
+        while self._term not in self._buf:
             b = self._sock.recv(4096)
             if not b:
                 break
-            chunks.append(b)
-            if b.endswith(self._term):
-                break
-        out = b"".join(chunks)
+            self._buf += b
+        end = self._buf.find(self._term)
+        end = len(self._buf) if end < 0 else end + len(self._term)
+        out = bytes(self._buf[:end])
+        del self._buf[:end]
         return out.rstrip(self._term).decode()
 
+
+    def read_block(self, timeout_s: float) -> bytes:
+        assert self._sock is not None, "Transport not open"
+        self._sock.settimeout(timeout_s)
+        return _read_block(self._read_exact)
+
+
+    def _read_exact(self, n: int) -> bytes:
+        while len(self._buf) < n:
+            b = self._sock.recv(max(4096, n - len(self._buf)))
+            if not b:
+                raise ConnectionError("Socket closed during block read")
+            self._buf += b
+        out = bytes(self._buf[:n])
+        del self._buf[:n]
+        return out
+
     def query(self, data: str) -> None:
         self.write(data)
         return self.read()
@@ -128,12 +187,14 @@ class FakeTransport:
 
 
     Provide a list of responses that will be returned sequentially on reads.
+    Responses consumed by read_block() may be bytes (binary block data).
     Writes are collected for debugging.
     """
-    def __init__(self, responses: list[str] | None = None):
+    def __init__(self, responses: list[str | bytes] | None = None):
         self.responses = responses or []
         self.writes: list[str] = []
         self._open = False
+        self._pending = b""
 
 
     def open(self) -> None:
@@ -153,4 +214,19 @@ class FakeTransport:
         assert self._open, "Transport not open"
         if not self.responses:
             return ""
-        return self.responses.pop(0)
\ No newline at end of file
+        out = self.responses.pop(0)
+        return out.decode() if isinstance(out, bytes) else out
+
+
+    def read_block(self, timeout_s: float) -> bytes:
+        assert self._open, "Transport not open"
+        if not self._pending and self.responses:
+            out = self.responses.pop(0)
+            self._pending = out if isinstance(out, bytes) else out.encode("latin-1")
+        return _read_block(self._read_exact)
+
+
+    def _read_exact(self, n: int) -> bytes:
+        # Missing trailing separators are tolerated so canned blocks can omit them
+        out, self._pending = self._pending[:n], self._pending[n:]
+        return out
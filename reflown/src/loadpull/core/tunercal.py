@@ -3,7 +3,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Optional
+import hashlib
 import math
+import os
+
+import numpy as np
+
+try:  # optional: KD-tree index for large cal files
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - scipy not installed
+    cKDTree = None
 
 
 @dataclass
@@ -20,6 +29,100 @@ class CalPoint:
         return complex(self.gamma_mag * math.cos(rad), self.gamma_mag * math.sin(rad))
 
 
+class _FreqTable:
+    """Cal points of one frequency bin as arrays, with a lazily built gamma index."""
+
+    kdtree_min = 256  # below this many points a brute-force scan is faster than a tree
+    chunk_elems = 4_000_000  # targets x points evaluated per brute-force block
+
+    def __init__(self, rows: np.ndarray, gamma: np.ndarray, x: np.ndarray, y: np.ndarray):
+        self.rows = rows  # indices into the TunerCal arrays (file order)
+        self.gamma = gamma
+        self.x = x
+        self.y = y
+        self.xy = np.column_stack([x, y]).astype(float)
+        self._tree: Any = None
+        self._xy_tree: Any = None
+
+    def query(self, targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest cal point (local index) and |Δgamma| for each complex target."""
+        if cKDTree is not None and len(self.gamma) >= self.kdtree_min:
+            if self._tree is None:
+                self._tree = cKDTree(np.column_stack([self.gamma.real, self.gamma.imag]))
+            dist, idx = self._tree.query(np.column_stack([targets.real, targets.imag]))
+            return np.asarray(idx, dtype=np.intp), np.asarray(dist, dtype=float)
+        idx = np.empty(len(targets), dtype=np.intp)
+        step = max(1, self.chunk_elems // max(1, len(self.gamma)))
+        for start in range(0, len(targets), step):
+            block = targets[start:start + step]
+            idx[start:start + step] = np.abs(self.gamma[None, :] - block[:, None]).argmin(axis=1)
+        return idx, np.abs(self.gamma[idx] - targets)
+
+    def knn_xy(self, pos: np.ndarray, k: int) -> np.ndarray:
+        """Indices (n, k) of the k cal points closest to each (x, y) position."""
+        xy = self.xy
+        if cKDTree is not None and len(xy) >= self.kdtree_min:
+            if self._xy_tree is None:
+                self._xy_tree = cKDTree(xy)
+            _, idx = self._xy_tree.query(pos, k=k)
+            return np.asarray(idx, dtype=np.intp).reshape(len(pos), k)
+        out = np.empty((len(pos), k), dtype=np.intp)
+        step = max(1, self.chunk_elems // max(1, len(xy)))
+        for start in range(0, len(pos), step):
+            d2 = ((pos[start:start + step, None, :] - xy[None, :, :]) ** 2).sum(axis=2)
+            if k < len(xy):
+                out[start:start + step] = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            else:
+                out[start:start + step] = np.arange(len(xy))
+        return out
+
+    def local_fit(self, pos: np.ndarray,
+                  k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Weighted quadratic fit Γ ≈ c + jx·u + jy·v + (u², uv, v² terms) around each position.
+
+        (u, v) are the steps from ``pos`` divided by ``scale`` (the neighbourhood extent
+        per axis) to keep the normal equations well conditioned; with fewer than 6
+        neighbours the fit is affine. Returns c (Γ at pos), J = (dΓ/du, dΓ/dv) (n, 2)
+        complex, scale (n, 2) and the weighted RMS residual of the fit.
+        """
+        nb = self.knn_xy(pos, k)
+        d = self.xy[nb] - pos[:, None, :]
+        scale = np.maximum(np.abs(d).max(axis=1), 1.0)
+        u = d / scale[:, None, :]
+        w = 1.0 / (np.linalg.norm(u, axis=2) + 0.25)  # inverse-distance weights
+        cols = [np.ones(u.shape[:2]), u[..., 0], u[..., 1]]
+        if k >= 6:
+            cols += [u[..., 0] ** 2, u[..., 0] * u[..., 1], u[..., 1] ** 2]
+        A = np.stack(cols, axis=2)
+        At_w = A.transpose(0, 2, 1) * w[:, None, :]
+        M = At_w @ A
+        M += 1e-9 * np.trace(M, axis1=1, axis2=2)[:, None, None] * np.eye(A.shape[2])
+        G = self.gamma[nb]
+        p = np.linalg.solve(M.astype(complex), (At_w @ G[..., None]))[..., 0]
+        resid = (A @ p[..., None])[..., 0] - G
+        rms = np.sqrt((w * np.abs(resid) ** 2).sum(axis=1) / w.sum(axis=1))
+        return p[:, 0], p[:, 1:3], scale, rms
+
+    def solve(self, targets: np.ndarray, k: int,
+              iterations: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Fractional (x, y) reaching each target Γ, the modelled Γ there and the fit RMS."""
+        k = min(k, len(self.gamma))
+        lo, hi = self.xy.min(axis=0), self.xy.max(axis=0)
+        idx, _ = self.query(targets)
+        pos = self.xy[idx]
+        for _ in range(iterations):
+            c, J, scale, _ = self.local_fit(pos, k)
+            # Newton step on the local model: solve [Re J; Im J]·step = Γt - c for real steps
+            Jr = np.stack([J.real, J.imag], axis=1)
+            r = targets - c
+            step = (np.linalg.pinv(Jr) @ np.stack([r.real, r.imag], axis=1)[..., None])[..., 0]
+            # Trust region: stay within the neighbourhood the model was fitted on
+            n = np.maximum(np.abs(step).max(axis=1, keepdims=True), 1.0)
+            pos = np.clip(pos + step / n * scale, lo, hi)
+        c, _, _, rms = self.local_fit(pos, k)
+        return pos, c, rms
+
+
 class TunerCal:
     """Lightweight parser/lookup for Focus tuner text exports.
 
@@ -27,20 +130,75 @@ class TunerCal:
       ! Probe    Frequency  Pt Number  X pos  Y pos  Gamma s11  Phi s11 ...
 
     and variants where only Axis/Limit tables exist are out of scope here.
+
+    Points are held as NumPy arrays grouped per frequency bin; gamma lookups use a
+    KD-tree (scipy, if installed) or a vectorized scan, and nearest_many() resolves
+    whole arrays of targets in one call. solve_many() interpolates between points.
     """
 
     def __init__(self, points: List[CalPoint]):
-        self._points = points
-        # index by frequency (GHz)
-        self._by_freq: Dict[float, List[CalPoint]] = {}
-        for p in points:
-            self._by_freq.setdefault(p.freq_ghz, []).append(p)
-        self._freqs = sorted(self._by_freq.keys())
+        y = [np.nan if p.y is None else p.y for p in points]
+        self._init_arrays(
+            np.array([p.freq_ghz for p in points], dtype=float),
+            np.array([p.x for p in points], dtype=np.int64),
+            np.array(y, dtype=float),
+            np.array([p.gamma_mag for p in points], dtype=float),
+            np.array([p.gamma_deg for p in points], dtype=float),
+        )
+
+    @classmethod
+    def from_arrays(cls, freq_ghz: Any, x: Any, y: Any, gamma_mag: Any,
+                    gamma_deg: Any) -> "TunerCal":
+        """Build from column arrays (y may contain NaN for 1-axis cals)."""
+        cal = cls.__new__(cls)
+        cal._init_arrays(
+            np.asarray(freq_ghz, dtype=float),
+            np.asarray(x, dtype=np.int64),
+            np.asarray(y, dtype=float),
+            np.asarray(gamma_mag, dtype=float),
+            np.asarray(gamma_deg, dtype=float),
+        )
+        return cal
+
+    def _init_arrays(self, freq: np.ndarray, x: np.ndarray, y: np.ndarray, mag: np.ndarray,
+                     deg: np.ndarray) -> None:
+        self.freq_ghz = freq
+        self.x = x
+        self.y = y
+        self.gamma_mag = mag
+        self.gamma_deg = deg
+        self.gamma = mag * np.exp(1j * np.radians(deg))
+        # index by frequency (GHz); stable sort keeps file order within a bin
+        self._freqs_arr, inverse = np.unique(freq, return_inverse=True)
+        self._freqs = self._freqs_arr.tolist()
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(self._freqs_arr) + 1))
+        self._tables: List[_FreqTable] = []
+        for i in range(len(self._freqs_arr)):
+            rows = order[bounds[i]:bounds[i + 1]]
+            self._tables.append(_FreqTable(rows, self.gamma[rows], x[rows], y[rows]))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @property
+    def points(self) -> List[CalPoint]:
+        return [self._point(i) for i in range(len(self))]
+
+    def _point(self, row: int) -> CalPoint:
+        y = self.y[row]
+        return CalPoint(
+            freq_ghz=float(self.freq_ghz[row]),
+            x=int(self.x[row]),
+            y=None if np.isnan(y) else int(y),
+            gamma_mag=float(self.gamma_mag[row]),
+            gamma_deg=float(self.gamma_deg[row]),
+        )
 
     @staticmethod
     def from_txt(path: str | Path) -> "TunerCal":
         p = Path(path)
-        rows: List[CalPoint] = []
+        cols: List[Tuple[float, int, int, float, float]] = []
         if not p.exists():
             raise FileNotFoundError(f"Tuner cal file not found: {p}")
         for raw in p.read_text(encoding="utf-8", errors="ignore").splitlines():
@@ -59,10 +217,58 @@ class TunerCal:
                 gd = float(parts[6])
             except Exception:
                 continue
-            rows.append(CalPoint(freq_ghz=freq_ghz, x=x, y=y, gamma_mag=gm, gamma_deg=gd))
-        if not rows:
+            cols.append((freq_ghz, x, y, gm, gd))
+        if not cols:
             raise ValueError(f"No calibration rows parsed from {p}")
-        return TunerCal(rows)
+        freq, x, y, gm, gd = zip(*cols)
+        return TunerCal.from_arrays(freq, x, y, gm, gd)
+
+    @staticmethod
+    def load(path: str | Path, cache: bool = True) -> "TunerCal":
+        """Load a Focus text export, reusing a parsed ``<file>.npz`` cache next to it.
+
+        The cache is valid while the source size and mtime match, or, if only the
+        mtime changed, while its SHA-256 still matches. Parsed cals are also memoized
+        per process. Cache write failures (read-only shares) fall back to parsing.
+        """
+        p = Path(path)
+        if not p.exists():
+            raise FileNotFoundError(f"Tuner cal file not found: {p}")
+        if not cache:
+            return TunerCal.from_txt(p)
+        st = p.stat()
+        memo_key = (str(p.resolve()), st.st_size, st.st_mtime_ns)
+        cal = _MEMO.get(memo_key)
+        if cal is not None:
+            return cal
+        cache_path = p.with_name(p.name + ".npz")
+        cal = _read_cache(cache_path, p, st)
+        if cal is None:
+            cal = TunerCal.from_txt(p)
+            _write_cache(cache_path, cal, st.st_size, st.st_mtime_ns, _sha256(p))
+        _MEMO[memo_key] = cal
+        return cal
+
+    def _freq_bins(self, freq_ghz: np.ndarray, freq_tolerance_ghz: float | None) -> np.ndarray:
+        """Index of the closest frequency bin for each requested frequency."""
+        if not self._freqs:
+            raise ValueError("Calibration has no frequency bins")
+        f = self._freqs_arr
+        if len(f) > 1:
+            hi = np.clip(np.searchsorted(f, freq_ghz), 1, len(f) - 1)
+            lo = hi - 1
+        else:
+            hi = lo = np.zeros(len(freq_ghz), dtype=np.intp)
+        # Ties go to the lower bin, as min() over the sorted bins did
+        bins = np.where(np.abs(f[lo] - freq_ghz) <= np.abs(f[hi] - freq_ghz), lo, hi)
+        if freq_tolerance_ghz is not None:
+            df = np.abs(f[bins] - freq_ghz)
+            bad = np.flatnonzero(df > freq_tolerance_ghz)
+            if len(bad):
+                i = bad[0]
+                raise ValueError(f"No cal near {freq_ghz[i]} GHz "
+                                 f"(nearest {f[bins[i]]} GHz, Δ={df[i]} GHz)")
+        return bins
 
     def nearest(self, freq_ghz: float, gamma: complex, freq_tolerance_ghz: float | None = None) -> Tuple[CalPoint, float, float]:
         """Return the nearest cal point to target gamma at the closest frequency.
@@ -71,16 +277,118 @@ class TunerCal:
         - freq_tolerance_ghz: if provided, raises if the nearest frequency exceeds this delta.
         Returns (CalPoint, freq_delta, gamma_distance).
         """
-        if not self._freqs:
-            raise ValueError("Calibration has no frequency bins")
-        # find nearest frequency
-        nearest_f = min(self._freqs, key=lambda f: abs(f - freq_ghz))
-        df = abs(nearest_f - freq_ghz)
-        if freq_tolerance_ghz is not None and df > freq_tolerance_ghz:
-            raise ValueError(f"No cal near {freq_ghz} GHz (nearest {nearest_f} GHz, Δ={df} GHz)")
-        candidates = self._by_freq[nearest_f]
-        def dist(pt: CalPoint) -> float:
-            g = pt.gamma_complex
-            return abs(g - gamma)
-        best = min(candidates, key=dist)
-        return best, df, dist(best)
\ No newline at end of file
+        b = int(self._freq_bins(np.array([float(freq_ghz)]), freq_tolerance_ghz)[0])
+        table = self._tables[b]
+        idx, dist = table.query(np.array([complex(gamma)]))
+        best = self._point(int(table.rows[idx[0]]))
+        return best, abs(self._freqs[b] - freq_ghz), float(dist[0])
+
+    def nearest_many(self, freq_ghz: Any, gammas: Any,
+                     freq_tolerance_ghz: float | None = None) -> Dict[str, np.ndarray]:
+        """Resolve many target gammas at once.
+
+        freq_ghz is a scalar or an array matching ``gammas`` (complex). Returns arrays
+        aligned with the targets: x, y (float, NaN if the cal has no Y), gamma (cal
+        point), dist (|Δgamma|), freq_ghz (bin used) and freq_delta.
+        """
+        targets = np.atleast_1d(np.asarray(gammas, dtype=complex))
+        freqs = np.broadcast_to(np.asarray(freq_ghz, dtype=float), targets.shape).ravel()
+        targets = targets.ravel()
+        bins = self._freq_bins(freqs, freq_tolerance_ghz)
+        rows = np.empty(len(targets), dtype=np.intp)
+        dist = np.empty(len(targets), dtype=float)
+        for b in np.unique(bins):
+            sel = np.flatnonzero(bins == b)
+            table = self._tables[b]
+            idx, d = table.query(targets[sel])
+            rows[sel] = table.rows[idx]
+            dist[sel] = d
+        return {
+            "x": self.x[rows],
+            "y": self.y[rows],
+            "gamma": self.gamma[rows],
+            "dist": dist,
+            "freq_ghz": self._freqs_arr[bins],
+            "freq_delta": np.abs(self._freqs_arr[bins] - freqs),
+        }
+
+    def solve_many(
+        self,
+        freq_ghz: Any,
+        gammas: Any,
+        k: int = 9,
+        iterations: int = 3,
+        freq_tolerance_ghz: float | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """Interpolating inverse model: fractional (x, y) positions that reach each target Γ.
+
+        Starting from the nearest cal point, a weighted quadratic model Γ(x, y) is fitted
+        to the ``k`` cal points around the current estimate and a Newton step solves it
+        for the target; this repeats ``iterations`` times (positions stay within the
+        characterized range). Returns arrays aligned with the targets: x, y (float),
+        gamma (modelled Γ at the solution), err (predicted |Γ error|: model miss
+        combined with the local fit residual) and freq_ghz (bin used). Cals without a
+        Y axis or with fewer than 3 points in a bin fall back to nearest_many().
+        """
+        targets = np.atleast_1d(np.asarray(gammas, dtype=complex))
+        freqs = np.broadcast_to(np.asarray(freq_ghz, dtype=float), targets.shape).ravel()
+        targets = targets.ravel()
+        bins = self._freq_bins(freqs, freq_tolerance_ghz)
+        x = np.empty(len(targets))
+        y = np.empty(len(targets))
+        gamma = np.empty(len(targets), dtype=complex)
+        err = np.empty(len(targets))
+        for b in np.unique(bins):
+            sel = np.flatnonzero(bins == b)
+            table = self._tables[b]
+            if len(table.gamma) < 3 or np.isnan(table.y).any():
+                idx, d = table.query(targets[sel])
+                x[sel], y[sel] = table.x[idx], table.y[idx]
+                gamma[sel], err[sel] = table.gamma[idx], d
+                continue
+            pos, g, rms = table.solve(targets[sel], k, iterations)
+            x[sel], y[sel], gamma[sel] = pos[:, 0], pos[:, 1], g
+            err[sel] = np.hypot(np.abs(targets[sel] - g), rms)
+        return {"x": x, "y": y, "gamma": gamma, "err": err, "freq_ghz": self._freqs_arr[bins]}
+
+
+_CACHE_VERSION = 1
+_MEMO: Dict[Tuple[str, int, int], TunerCal] = {}
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_cache(cache_path: Path, source: Path, st: os.stat_result) -> TunerCal | None:
+    try:
+        with np.load(cache_path, allow_pickle=False) as z:
+            if int(z["version"]) != _CACHE_VERSION or int(z["size"]) != st.st_size:
+                return None
+            if int(z["mtime_ns"]) != st.st_mtime_ns and str(z["sha256"]) != _sha256(source):
+                return None
+            return TunerCal.from_arrays(z["freq_ghz"], z["x"], z["y"], z["gamma_mag"],
+                                        z["gamma_deg"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_cache(cache_path: Path, cal: TunerCal, size: int, mtime_ns: int, sha256: str) -> None:
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as fp:
+            np.savez(
+                fp, version=_CACHE_VERSION, size=size, mtime_ns=mtime_ns, sha256=sha256,
+                freq_ghz=cal.freq_ghz, x=cal.x, y=cal.y, gamma_mag=cal.gamma_mag,
+                gamma_deg=cal.gamma_deg,
+            )
+        os.replace(tmp, cache_path)  # atomic for concurrent readers
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
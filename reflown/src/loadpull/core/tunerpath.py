@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+# Move cost between two tuner positions (rows of [x, y_low, y_high] in motor steps):
+#   l1  - total motor travel, axes moved one after another
+#   max - slowest axis, axes moved together
+METRICS = ("l1", "max")
+
+
+def _cost(a: np.ndarray, b: np.ndarray, metric: str, weights: np.ndarray) -> np.ndarray:
+    d = np.abs(a - b) * weights
+    return d.sum(axis=-1) if metric == "l1" else d.max(axis=-1)
+
+
+def _prepare(positions: Any, metric: str, weights: Any) -> Tuple[np.ndarray, np.ndarray]:
+    if metric not in METRICS:
+        raise ValueError(f"Unknown travel metric '{metric}' (expected one of {METRICS})")
+    pos = np.asarray(positions, dtype=float)
+    if pos.ndim != 2:
+        raise ValueError("positions must be a 2-D array of axis positions")
+    w = np.ones(pos.shape[1]) if weights is None else np.asarray(weights, dtype=float)
+    return pos, w
+
+
+def path_travel(positions: Any, order: Any = None, start: Any = None,
+                metric: str = "l1", weights: Any = None) -> float:
+    """Travel of ``positions`` visited in ``order`` (default: as given), from ``start`` if set."""
+    pos, w = _prepare(positions, metric, weights)
+    if order is not None:
+        pos = pos[np.asarray(order, dtype=int)]
+    if start is not None:
+        pos = np.vstack([np.asarray(start, dtype=float), pos])
+    if len(pos) < 2:
+        return 0.0
+    return float(_cost(pos[1:], pos[:-1], metric, w).sum())
+
+
+def order_positions(positions: Any, start: Any = None, metric: str = "l1", weights: Any = None,
+                    max_passes: int = 50) -> Tuple[np.ndarray, float]:
+    """Order tuner positions to minimise travel: nearest neighbour, then 2-opt.
+
+    The path is open: it begins at ``start`` (e.g. the current tuner position) or,
+    without one, at the first position, and does not return. ``weights`` scales
+    each axis (e.g. seconds per step). Returns ``(order, travel)`` where
+    ``positions[order]`` is the visiting sequence.
+    """
+    pos, w = _prepare(positions, metric, weights)
+    n = len(pos)
+    if n < 2:
+        order = np.arange(n)
+        return order, path_travel(pos, order, start, metric, w)
+    st = None if start is None else np.asarray(start, dtype=float)
+
+    # Nearest neighbour
+    left = np.ones(n, dtype=bool)
+    order = np.empty(n, dtype=int)
+    if st is None:
+        cur = 0
+    else:
+        cur = int(np.argmin(_cost(pos, st, metric, w)))
+    for k in range(n):
+        order[k] = cur
+        left[cur] = False
+        if k == n - 1:
+            break
+        idx = np.flatnonzero(left)
+        cur = int(idx[np.argmin(_cost(pos[idx], pos[cur], metric, w))])
+
+    # 2-opt: reversing order[i..j] swaps edges (prev, o_i) + (o_j, next)
+    # for (prev, o_j) + (o_i, next); the open ends cost nothing.
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 1):
+            p = pos[order]
+            j = np.arange(i + 1, n)
+            if i > 0:
+                prev = p[i - 1]
+            elif st is not None:
+                prev = st
+            else:
+                prev = None
+            nxt = p[np.minimum(j + 1, n - 1)]
+            old = _cost(p[j], nxt, metric, w)
+            new = _cost(p[i], nxt, metric, w)
+            old[-1] = new[-1] = 0.0  # j = n-1 has no next point
+            if prev is not None:
+                old = old + _cost(prev, p[i], metric, w)
+                new = new + _cost(prev, p[j], metric, w)
+            delta = new - old
+            k = int(np.argmin(delta))
+            if delta[k] < -1e-9:
+                order[i:j[k] + 1] = order[i:j[k] + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return order, path_travel(pos, order, start, metric, w)
+
+
+AXES = ("x", "y_low", "y_high")
+
+
+class MotionModel:
+    """Predict tuner move times from step distance and learn axis speeds from observed moves.
+
+    A move is modelled as ``overhead_s + travel``, where travel is the slowest axis
+    (``concurrent``) or the sum over axes, at ``speed`` steps/s per axis. Each observed
+    move updates the dominant axis speed or, for short moves, the fixed overhead
+    with an exponential moving average of weight ``alpha``.
+    """
+
+    def __init__(self, speed: Any = 2000.0, overhead_s: float = 0.05, concurrent: bool = True,
+                 alpha: float = 0.3):
+        if not isinstance(speed, dict):
+            speed = {a: speed for a in AXES}
+        self.speed = {a: float(speed.get(a, 2000.0)) for a in AXES}
+        self.overhead_s = float(overhead_s)
+        self.concurrent = concurrent
+        self.alpha = alpha
+        self.moves = 0
+        self.last: Dict[str, float] = {}
+        self._residual_sum = 0.0
+
+    def axis_times(self, cur: Dict[str, int], target: Dict[str, int]) -> Dict[str, float]:
+        return {a: abs(int(target.get(a, 0)) - int(cur.get(a, 0))) / self.speed[a] for a in AXES}
+
+    def predict(self, cur: Dict[str, int], target: Dict[str, int]) -> float:
+        t = self.axis_times(cur, target)
+        travel = max(t.values()) if self.concurrent else sum(t.values())
+        return self.overhead_s + travel
+
+    def observe(self, cur: Dict[str, int], target: Dict[str, int], elapsed_s: float,
+                predicted_s: float, early: bool = False) -> None:
+        """Fold a measured move time into the model.
+
+        ``early`` means the move was already done at the first poll, so ``elapsed_s`` is
+        only an upper bound and the implied speed a lower bound on the real one.
+        """
+        self.moves += 1
+        self._residual_sum += elapsed_s - predicted_s
+        self.last = {"predicted_s": predicted_s, "elapsed_s": elapsed_s,
+                     "residual_s": elapsed_s - predicted_s}
+        t = self.axis_times(cur, target)
+        axis = max(t, key=t.get)
+        steps = abs(int(target.get(axis, 0)) - int(cur.get(axis, 0)))
+        moving = elapsed_s - self.overhead_s
+        if steps and t[axis] >= self.overhead_s and moving > 0:
+            if early:
+                self.speed[axis] = max(self.speed[axis], steps / moving)
+            else:
+                self.speed[axis] += self.alpha * (steps / moving - self.speed[axis])
+        elif not early and (not steps or t[axis] < 0.1 * self.overhead_s):
+            self.overhead_s += self.alpha * (elapsed_s - self.overhead_s)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "moves": self.moves,
+            "speed": dict(self.speed),
+            "overhead_s": self.overhead_s,
+            "mean_residual_s": self._residual_sum / self.moves if self.moves else 0.0,
+            **self.last,
+        }
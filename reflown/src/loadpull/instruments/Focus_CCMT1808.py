@@ -57,13 +57,18 @@ class FocusCCMT1808(Instrument):
         self._cal = None
         self._connected = False
         self._tuner_cal: Optional["TunerCal"] = None  # optional preloaded tuner calibration
+        # Interpolate between cal points (TunerCal.solve_many) instead of snapping to the nearest
+        self.interpolate = bool(cfg.get("interpolate", False))
+        self.last_gamma_err: Optional[float] = None  # predicted |Γ error| of the last lookup
+        self.sweep_plan: Optional[Dict[str, Any]] = None  # last plan_sweep() result
+        self._init_motion(cfg)
 
         # Optionally preload a tuner calibration from bench config
         try:
             cal_path = cfg.get("tuner_cal_path") or cfg.get("tuner_calfile")
             if cal_path:
                 from ..core.tunercal import TunerCal as _TunerCal
-                self._tuner_cal = _TunerCal.from_txt(str(cal_path))
+                self._tuner_cal = _TunerCal.load(str(cal_path))
         except Exception:
             # Ignore preload errors; user can set later
             self._tuner_cal = None
@@ -79,6 +84,64 @@ class FocusCCMT1808(Instrument):
             raise
 
     # -------- low-level helpers --------
+    def _init_motion(self, cfg: Dict[str, Any]) -> None:
+        """Move timing: sleep for most of the predicted move, then poll STATUS? tightly.
+
+        Bench keys: axis_speed_sps (steps/s, number or per-axis table), move_overhead_s,
+        axes_concurrent, motion_sleep_frac, motion_poll_s, track_position.
+        """
+        from ..core.tunerpath import MotionModel
+        self.motion = MotionModel(
+            speed=cfg.get("axis_speed_sps", 2000.0),
+            overhead_s=float(cfg.get("move_overhead_s", 0.05)),
+            concurrent=bool(cfg.get("axes_concurrent", True)),
+        )
+        self.motion_sleep_frac = float(cfg.get("motion_sleep_frac", 0.8))
+        self.motion_poll_s = float(cfg.get("motion_poll_s", 0.02))
+        # Trust commanded positions after a completed move instead of re-reading POS?
+        self.track_position = bool(cfg.get("track_position", True))
+        self._commanded: Optional[Dict[str, int]] = None
+        self.pos_queries_skipped = 0
+
+    def _known_pos(self) -> Dict[str, int]:
+        if self.track_position and self._commanded is not None:
+            self.pos_queries_skipped += 1
+            return dict(self._commanded)
+        return self.pos()
+
+    def _move(self, cmd: str, cur: Dict[str, int], target: Dict[str, int],
+              timeout_s: float = 30.0) -> Dict[str, int]:
+        """Send a POS command and wait for the move using the motion model.
+
+        Raises TimeoutError if STATUS? does not report idle in time.
+        """
+        predicted = self.motion.predict(cur, target)
+        self._commanded = None  # unknown until the move is confirmed
+        t0 = time.perf_counter()
+        self._query(cmd)  # POS echoes result
+        pause = self.motion_sleep_frac * predicted - (time.perf_counter() - t0)
+        if pause > 0:
+            time.sleep(pause)
+        deadline = t0 + max(timeout_s, 2 * predicted)
+        code = self.status()
+        early = pause > 0 and code == 0  # done before the first poll: elapsed is an upper bound
+        while code != 0 and time.perf_counter() < deadline:
+            time.sleep(self.motion_poll_s)
+            code = self.status()
+        if code != 0:
+            # _commanded stays None: the next move re-reads POS? instead of trusting the target
+            elapsed = time.perf_counter() - t0
+            raise TimeoutError(f"Tuner move '{cmd}' not done after {elapsed:.1f} s (status {code})")
+        self.motion.observe(cur, target, time.perf_counter() - t0, predicted, early=early)
+        self._commanded = {a: int(target[a]) for a in ("x", "y_low", "y_high")}
+        if self.track_position:
+            return dict(self._commanded)
+        return self.pos()
+
+    def motion_stats(self) -> Dict[str, Any]:
+        """Learned axis speeds/overhead, last predicted vs measured move time, POS? reads saved."""
+        return {**self.motion.stats(), "pos_queries_skipped": self.pos_queries_skipped}
+
     def _clearbuffer(self) -> None:
         try:
             _ = self._inst.read()
@@ -102,6 +165,7 @@ class FocusCCMT1808(Instrument):
         """Clear/init session."""
         # CCMT uses INIT to handshake; *CLS/*RST not applicable
         self._clearbuffer()
+        self._commanded = None  # INIT re-homes the axes
         self._write("INIT")
         self.wait_ready(timeout_s = 60)
         self._clearbuffer()
@@ -139,8 +203,8 @@ class FocusCCMT1808(Instrument):
         if position < 0 or position > limit_val:
             raise ValueError(f"{axis} exceeds limit {limit_val}")
 
-                # Skip tiny moves
-        cur = self.pos()
+        # Skip tiny moves
+        cur = self._known_pos()
         if abs(cur[axis_lc] - int(position)) < self._step_size:
             print("step too small. no movement")
             return cur
@@ -148,8 +212,7 @@ class FocusCCMT1808(Instrument):
         # Use numeric axis IDs: 1=x, 2=y_low, 3=y_high
         axis_num = {"x": 1, "y_low": 2, "y_high": 3}[axis_lc]
         # print(f"POS {axis_num} {int(position)}")
-        self._query(f"POS {axis_num} {int(position)}")  # POS echoes result
-        return self.pos()
+        return self._move(f"POS {axis_num} {int(position)}", cur, {**cur, axis_lc: int(position)})
 
 
     def move_all(self, position: dict) -> Dict[str, int]:
@@ -162,7 +225,7 @@ class FocusCCMT1808(Instrument):
         Returns updated positions.
         """
         # Current positions and limits
-        cur = self.pos()
+        cur = self._known_pos()
         try:
             axmap = self._axis_limits or {}
             limits = {"x": int(axmap.get(1, 0)), "y_low": int(axmap.get(2, 0)), "y_high": int(axmap.get(3, 0))}
@@ -182,10 +245,7 @@ class FocusCCMT1808(Instrument):
                     to_send[name] = target
 
         cmd = f"POS 1 {to_send['x']} 2 {to_send['y_low']} 3 {to_send['y_high']}"
-        # print(breakhere)
-        self._query(cmd)
-        # print(breakhere)
-        return self.pos()
+        return self._move(cmd, cur, to_send)
 
     def status(self) -> int:
         """Return numeric status code (0 = ready)."""
@@ -292,7 +352,8 @@ class FocusCCMT1808(Instrument):
         x = int(a1.group(1)) if a1 else 0
         y_low = int(a2.group(1)) if a2 else 0
         y_high = int(a3.group(1)) if a3 else 0
-        return {"x": x, "y_low": y_low, "y_high": y_high}
+        self._commanded = {"x": x, "y_low": y_low, "y_high": y_high}
+        return dict(self._commanded)
 
     def wait_ready(self, timeout_s: float = 30.0, poll_s: float = 0.25) -> int:
         """Poll STATUS? until 0 or timeout; returns final status."""
@@ -310,10 +371,10 @@ class FocusCCMT1808(Instrument):
 
     # ---- Cal-assisted lookup helpers ----
     def set_tuner_cal_from_file(self, path: str) -> bool:
-        """Load and cache a tuner calibration TXT file for later lookups."""
+        """Load and cache a tuner calibration TXT file for later lookups (reuses the .npz cache)."""
         try:
             from ..core.tunercal import TunerCal as _TunerCal
-            self._tuner_cal = _TunerCal.from_txt(path)
+            self._tuner_cal = _TunerCal.load(path)
             return True
         except Exception:
             self._tuner_cal = None
@@ -336,23 +397,108 @@ class FocusCCMT1808(Instrument):
             return 'y_low'
         return 'y_low' if (freq_ghz * 1000.0) < cross_mhz else 'y_high'
         
-    def positions_for_s11(self, freq_ghz: float, gamma_mag: float, gamma_deg: float, z0: float = 50.0) -> Dict[str, int]:
+    def positions_for_s11(self, freq_ghz: float, gamma_mag: float, gamma_deg: float,
+                          z0: float = 50.0, interpolate: Optional[bool] = None) -> Dict[str, int]:
         """Look up nearest axis positions for a target S11 from a tuner cal text file.
 
         Returns a dict like {"x": int, "y_low": int, "y_high": int or 0}.
         For 2-axis cals, maps file "Y pos" to the active Y axis per crossover and sets the other to 0.
+        With interpolate (default: bench ``interpolate``) positions come from the
+        interpolating solver, rounded to whole steps; last_gamma_err holds its predicted error.
         """
 
         if self._tuner_cal is None:
-            raise ValueError("No tuner calibration available. Provide cal_path or preload with set_tuner_cal().")
+            raise ValueError("No tuner calibration available. "
+                             "Provide cal_path or preload with set_tuner_cal().")
         g = complex(gamma_mag * math.cos(math.radians(gamma_deg)), gamma_mag * math.sin(math.radians(gamma_deg)))
-        best, _, _ =  self._tuner_cal.nearest(freq_ghz, g)
+        if self.interpolate if interpolate is None else interpolate:
+            sol = self.solve_positions(freq_ghz, gamma_mag, gamma_deg)
+            y_axis = self._y_axis_for_freq(freq_ghz)
+            y = int(round(sol[y_axis]))
+            return {"x": int(round(sol["x"])), "y_low": y if y_axis == 'y_low' else 0,
+                    "y_high": y if y_axis == 'y_high' else 0}
+        best, _, dist =  self._tuner_cal.nearest(freq_ghz, g)
+        self.last_gamma_err = dist
         y_axis = self._y_axis_for_freq(freq_ghz)
         y_low = int(best.y or 0) if y_axis == 'y_low' else 0
         y_high = int(best.y or 0) if y_axis == 'y_high' else 0
         # print(breakhere)
         return {"x": int(best.x), "y_low": y_low, "y_high": y_high}
 
+    def solve_positions(self, freq_ghz: float, gamma_mag: float,
+                        gamma_deg: float) -> Dict[str, float]:
+        """Fractional axis positions for a target S11 from the interpolating cal solver.
+
+        Returns {"x", "y_low", "y_high"} as floats plus "gamma_err", the predicted |Γ error|.
+        """
+        if self._tuner_cal is None:
+            raise ValueError("No tuner calibration available. "
+                             "Provide cal_path or preload with set_tuner_cal().")
+        g = gamma_mag * np.exp(1j * np.radians(gamma_deg))
+        res = self._tuner_cal.solve_many(freq_ghz, [g])
+        y = float(res["y"][0])
+        y = 0.0 if math.isnan(y) else y
+        y_axis = self._y_axis_for_freq(freq_ghz)
+        self.last_gamma_err = float(res["err"][0])
+        return {"x": float(res["x"][0]), "y_low": y if y_axis == 'y_low' else 0.0,
+                "y_high": y if y_axis == 'y_high' else 0.0, "gamma_err": self.last_gamma_err}
+
+    def positions_for_s11_many(self, freq_ghz: Any, gamma_mag: Any, gamma_deg: Any,
+                               interpolate: Optional[bool] = None) -> list[Dict[str, int]]:
+        """Batch positions_for_s11(): resolve arrays of targets in one cal lookup.
+
+        freq_ghz may be a scalar or an array aligned with gamma_mag/gamma_deg, e.g. to
+        convert a whole load-pull sweep file to positions before moving.
+        """
+        if self._tuner_cal is None:
+            raise ValueError("No tuner calibration available. "
+                             "Provide cal_path or preload with set_tuner_cal().")
+        mags = np.atleast_1d(np.asarray(gamma_mag, dtype=float))
+        g = mags * np.exp(1j * np.radians(np.asarray(gamma_deg, dtype=float)))
+        freqs = np.broadcast_to(np.asarray(freq_ghz, dtype=float), mags.shape)
+        if self.interpolate if interpolate is None else interpolate:
+            res = self._tuner_cal.solve_many(freqs, g)
+        else:
+            res = self._tuner_cal.nearest_many(freqs, g)
+        out = []
+        for f, x, y in zip(freqs.tolist(), np.round(res["x"]).tolist(), res["y"].tolist()):
+            y = 0 if math.isnan(y) else int(round(y))
+            y_axis = self._y_axis_for_freq(f)
+            out.append({"x": int(x), "y_low": y if y_axis == 'y_low' else 0,
+                        "y_high": y if y_axis == 'y_high' else 0})
+        return out
+
+    def plan_sweep(self, freq_ghz: float, file: str, from_current: bool = True,
+                   metric: str = "l1", interpolate: Optional[bool] = None) -> Dict[str, Any]:
+        """Map a load-pull sweep file to positions and order it for minimum motor travel.
+
+        Returns {"order", "count", "travel", "travel_file"}: ``order[i]`` is the file row
+        visited at sweep step i (pass it to loadpull_sweep_point), ``count`` matches
+        loadpull_sweep_len, and the travels are in motor steps for the planned and file order.
+        """
+        from ..core.transforms.utils import _sweep_table
+        from ..core.tunerpath import order_positions, path_travel
+
+        table = _sweep_table(str(file))
+        if not len(table):
+            return {"order": [], "count": 0, "travel": 0.0, "travel_file": 0.0}
+        rows = self.positions_for_s11_many(freq_ghz, table["mag"], table["deg"],
+                                           interpolate=interpolate)
+        pos = np.array([[r["x"], r["y_low"], r["y_high"]] for r in rows], dtype=float)
+        start = None
+        if from_current:
+            cur = self.pos()
+            start = [cur["x"], cur["y_low"], cur["y_high"]]
+        order, travel = order_positions(pos, start=start, metric=metric)
+        plan = {
+            "order": order.tolist(),
+            "count": len(order) - 1,
+            "travel": travel,
+            "travel_file": path_travel(pos, start=start, metric=metric),
+        }
+        self.sweep_plan = plan
+        return plan
+
     def set_impedance(self, freq_ghz: float, z_real: float, z_imag: float, z0:float = 50) -> Dict[str, int]:
         """Move axes to the nearest cal positions for the requested S11.
 
@@ -367,13 +513,8 @@ class FocusCCMT1808(Instrument):
         Uses positions_for_s11() and issues POS moves for available axes.
         """
         pos = self.positions_for_s11(freq_ghz, gamma_mag, gamma_deg) #180/pi
-
-        self.move_all(pos)
-        # try:
-        #     self.move_all(pos)
-        # except Exception:
-        #     pass
-        return self.pos()
+        # move_all returns the confirmed (tracked) positions; no extra POS? needed
+        return self.move_all(pos)
 
     def close(self) -> None:
         try: self._inst.close()
@@ -10,29 +10,32 @@ class Keysight34400(Instrument):
 
     def preset(self) -> str:
         """Clear status and reset."""
-        self.scpi.write("*CLS")
-        self.scpi.write("*RST")
+        with self.scpi.batch():
+            self.scpi.write("*CLS")
+            self.scpi.write("*RST")
         return "OK"
 
     def set_low_power_mode(self, enable: bool, four_wire: bool = False) -> str:
         """Enable/disable low power resistance measurement."""
         if four_wire:
-            self.scpi.write(f"SENS:FRES:POW:LIM:STATE {'ON' if enable else 'OFF'}")
+            self.scpi.write_setting("SENS:FRES:POW:LIM:STATE", 'ON' if enable else 'OFF')
         else:
-            self.scpi.write(f"SENS:RES:POW:LIM:STATE {'ON' if enable else 'OFF'}")
+            self.scpi.write_setting("SENS:RES:POW:LIM:STATE", 'ON' if enable else 'OFF')
         return "OK"
 
+    def _configure(self, header: str) -> None:
+        """Select the measurement function; CONF resets range, NPLC and low-power settings."""
+        if self.scpi.write_setting(header, key="CONF"):
+            self.scpi.invalidate_state("SENS")
+
     def configure_resistance(self, four_wire: bool = False) -> str:
         """Configure 2-wire or 4-wire resistance mode."""
-        if four_wire:
-            self.scpi.write("CONF:FRES")
-        else:
-            self.scpi.write("CONF:RES")
+        self._configure("CONF:FRES" if four_wire else "CONF:RES")
         return "OK"
 
     def configure_voltage_dc(self) -> str:
         """Configure DC voltage measurement."""
-        self.scpi.write("CONF:VOLT:DC")
+        self._configure("CONF:VOLT:DC")
         return "OK"
 
     def measure_voltage(self) -> Dict[str, Any]:
@@ -41,10 +44,7 @@ class Keysight34400(Instrument):
 
     def measure_resistance(self, four_wire: bool = False) -> Dict[str, Any]:
         """Trigger and read a resistance measurement."""
-        if four_wire:
-            self.scpi.write("CONF:FRES")
-        else:
-            self.scpi.write("CONF:RES")
+        self._configure("CONF:FRES" if four_wire else "CONF:RES")
         val = float(self.scpi.query("READ?"))
         return {"R": val}
 
@@ -8,4 +8,27 @@ class Instrument:
 
 
     def idn(self) -> str:
-        return self.scpi.query("*IDN?")
\ No newline at end of file
+        return self.scpi.query("*IDN?")
+
+
+    def check_errors(self) -> list[str]:
+        """Drain the instrument error queue (on-demand checks for deferred error policies)."""
+        return self.scpi.check_errors()
+
+
+    def enable_state_cache(self, on: bool = True) -> bool:
+        """Turn the SCPI write-through state cache on/off (cleared either way)."""
+        self.scpi.state_cache = bool(on)
+        self.scpi.invalidate_state()
+        return self.scpi.state_cache
+
+
+    def invalidate_state(self) -> bool:
+        """Forget cached settings so the next setter always writes."""
+        self.scpi.invalidate_state()
+        return True
+
+
+    def state_cache_stats(self) -> dict:
+        """Return state cache hit/miss counts."""
+        return self.scpi.cache_stats()
@@ -12,12 +12,12 @@ class KeysightPNA(Instrument):
 
 
     def set_freq(self, f_ghz: float) -> str:
-        self.scpi.write(f"SENS1:FREQ {f_ghz}GHz")
+        self.scpi.write_setting("SENS1:FREQ", f"{f_ghz}GHz")
         return "OK"
 
 
     def set_power(self, p_dbm: float) -> str:
-        self.scpi.write(f"SOUR:POW {p_dbm}DBM")
+        self.scpi.write_setting("SOUR:POW", f"{p_dbm}DBM")
         return "OK"
 
 
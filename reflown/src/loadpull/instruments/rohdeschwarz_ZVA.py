@@ -1,6 +1,9 @@
 from __future__ import annotations
 import time
 from typing import Any, Dict, Tuple
+
+import numpy as np
+
 from .base import Instrument
 
 
@@ -11,11 +14,15 @@ class RSZVA(Instrument):
     Notes:
     - Uses common R&S VNA SCPI (ZVA/ZNB/ZNA share many mnemonics).
     - Frequency is set via channel 1. Adapt for multi-channel setups as needed.
-    - Data fetch returns formatted data (FDATA) or s-data (SDATA) as raw strings.
+    - Trace data is transferred as REAL,64 binary blocks and decoded with
+      np.frombuffer (zero-copy views); set_data_format("ASC") restores ASCII transfers.
     """
     channel = 1
     input_port = 1
     output_port = 4
+    wave_traces = {'a1': 'Trca1', 'b1': 'Trcb1', 'a2': 'Trca2', 'b2': 'Trcb2'}
+    data_format = "REAL,64"  # "REAL,64" (binary blocks) or "ASC"
+    _format_sent: str | None = None
 
     # ---- Basic setup / utility ----
     def preset(self):
@@ -24,6 +31,7 @@ class RSZVA(Instrument):
         except Exception:
             pass
         self.scpi.write("SYST:PRES")
+        self._format_sent = None  # preset restores ASCII transfers
         time.sleep(0.5)
         
     def clear_syserror(self):
@@ -37,36 +45,39 @@ class RSZVA(Instrument):
 
     # ---- Frequency / power ----
     def set_freq_center(self, f_hz: float) -> str:
-        self.scpi.write(f"SENS1:FREQ:CENT {f_hz}")
+        self.scpi.write_setting("SENS1:FREQ:CENT", f_hz, key="SENS1:FREQ")
         return 1
 
     def set_freq_span(self, span_hz: float) -> str:
-        self.scpi.write(f"SENS1:FREQ:SPAN {span_hz}")
+        self.scpi.write_setting("SENS1:FREQ:SPAN", span_hz, key="SENS1:FREQ")
         return 1
 
     def set_freq_fixed(self, f_hz: float, scale: str = "hz") -> str:
         # Fixed CW frequency: set start=stop=f
         if scale.lower() == "ghz":
-            self.scpi.write(f"SENS1:FREQ:STAR {f_hz*1e9}")
-            self.scpi.write(f"SENS1:FREQ:STOP {f_hz*1e9}")
-        else:
+            f_hz = f_hz*1e9
+        # Start/stop are one cached setting; center/span writes replace it
+        if self.scpi.is_cached("SENS1:FREQ", ("FIXED", f_hz)):
+            return 1
+        with self.scpi.batch():
             self.scpi.write(f"SENS1:FREQ:STAR {f_hz}")
             self.scpi.write(f"SENS1:FREQ:STOP {f_hz}")
+        self.scpi.remember("SENS1:FREQ", ("FIXED", f_hz))
         return 1
 
     def set_points(self, n: int) -> str:
-        self.scpi.write(f"SENS1:SWE:POIN {int(n)}")
+        self.scpi.write_setting("SENS1:SWE:POIN", int(n))
         return 1
 
     def set_power(self, p_dbm: float) -> str:
-        self.scpi.write(f"SOUR1:POW {p_dbm}")
+        self.scpi.write_setting("SOUR1:POW", p_dbm)
         return 1
 
     def set_atten(self, atten: float, port: int = output_port) -> str:
         atten_round = 5 * round(atten/5)
         if atten_round > 35: atten_round=35
         if atten_round < 0: atten_round=0
-        self.scpi.write(f"POW:ATT {port}, {atten_round}")
+        self.scpi.write_setting("POW:ATT", f"{port}, {atten_round}", key=f"POW:ATT:{port}")
         return 1
 
     # ---- Sweep control ----
@@ -76,15 +87,16 @@ class RSZVA(Instrument):
         return 1
 
     def set_continuous(self, on: bool) -> str:
-        self.scpi.write(f"INIT1:CONT {'ON' if on else 'OFF'}")
+        self.scpi.write_setting("INIT1:CONT", 'ON' if on else 'OFF')
         return 1
 
     # ---- Traces / parameters ----
     def select_parameter(self, name: str = "S11") -> str:
         # Ensure a trace exists and is selected
-        self.scpi.write("CALC1:PAR:DEL:ALL")
-        self.scpi.write(f"CALC1:PAR:DEF:EXT 'Trc1',{name}")
-        self.scpi.write("CALC1:PAR:SEL 'Trc1'")
+        with self.scpi.batch():
+            self.scpi.write("CALC1:PAR:DEL:ALL")
+            self.scpi.write(f"CALC1:PAR:DEF:EXT 'Trc1',{name}")
+            self.scpi.write("CALC1:PAR:SEL 'Trc1'")
         return 1
 
     def set_trace(self, name: str = "S11", tracename: str = "Trc1", channel: int = 1) -> str:
@@ -97,50 +109,55 @@ class RSZVA(Instrument):
         return 1
 
     def set_format_logmag(self) -> str:
-        self.scpi.write("CALC1:FORM MLOG")
+        self.scpi.write_setting("CALC1:FORM", "MLOG")
         return 1
 
     # ---- Data acquisition ----
-    def fetch_fdata(self) -> dict:
-        """Formatted data (e.g., magnitude in current format). Returns CSV-like string."""
-        data_str = self.scpi.query("CALC1:DATA? FDATA")
-        nums = [float(x.strip()) for x in data_str.split(',') if x.strip()]
-
-        return {"data": nums, "csv": data_str}
+    def set_data_format(self, fmt: str = "REAL,64") -> str:
+        """Select trace transfer format: "REAL,64" (binary) or "ASC"."""
+        fmt = fmt.strip().upper()
+        if fmt.startswith("ASC"):
+            fmt = "ASC"
+        elif fmt != "REAL,64":
+            raise ValueError(f"Unsupported data format '{fmt}'")
+        self.data_format = fmt
+        self._format_sent = None
+        return 1
 
-    def fetch_cmd_complex(self, cmd) -> dict:
-        """Formatted data (e.g., magnitude in current format). Returns CSV-like string."""
-        data_str = self.scpi.query(cmd)
-        nums = [float(x.strip()) for x in data_str.split(',') if x.strip()]
-        
-        # Separate real and imaginary parts
-        real = nums[0::2]   # even indices
-        imag = nums[1::2]   # odd indices
+    def _ensure_format(self) -> None:
+        if self._format_sent == self.data_format:
+            return
+        if self.data_format == "ASC":
+            self.scpi.write("FORM:DATA ASC")
+        else:
+            # R&S NORMal byte order is little endian (LSB first)
+            self.scpi.write("FORM:DATA REAL,64;:FORM:BORD NORM")
+        self._format_sent = self.data_format
 
-        return {"real": real, "imag": imag, "csv": data_str}
+    def _query_values(self, cmd: str, timeout_s: float = 3.0):
+        """Query a numeric array: float64 ndarray (binary) or list of floats (ASCII)."""
+        self._ensure_format()
+        if self.data_format == "ASC":
+            return _parse_ascii(self.scpi.query(cmd, timeout_s=timeout_s))
+        return np.frombuffer(self.scpi.query_block(cmd, timeout_s=timeout_s), dtype="<f8")
 
+    def fetch_fdata(self) -> dict:
+        """Formatted data (e.g., magnitude in current format)."""
+        return {"data": self._query_values("CALC1:DATA? FDATA")}
 
-    def fetch_sdata(self, channel=1) -> str:
-        """Complex S-parameter data (real,imag pairs). Returns CSV-like string."""
-        # Split by commas and strip whitespace
-        data_str = self.scpi.query(f"CALC{channel}:DATA? SDATA")
-        nums = [float(x.strip()) for x in data_str.split(',') if x.strip()]
-        
-        # Separate real and imaginary parts
-        real = nums[0::2]   # even indices
-        imag = nums[1::2]   # odd indices
+    def fetch_cmd_complex(self, cmd) -> dict:
+        """Complex data (real,imag pairs) returned by an arbitrary query."""
+        return _split_complex(self._query_values(cmd))
 
-        return {"real": real, "imag": imag, "csv": data_str}
+    def fetch_sdata(self, channel=1) -> dict:
+        """Complex S-parameter data (real,imag pairs)."""
+        return _split_complex(self._query_values(f"CALC{channel}:DATA? SDATA"))
 
-    def read_x_axis(self) -> str:
+    def read_x_axis(self) -> dict:
         """Return stimulus axis for channel 1."""
-        if self.scpi.query("SWE:TYPE?") == "POW":
-            return {'type': 'pow',
-                'x_data': [float(x.strip()) for x in self.scpi.query(f"CALC{self.channel}:DATA:STIM?").split(',') if x.strip()]}
-        else:
-            return {'type': 'frequency',
-                'x_data': [float(x.strip()) for x in self.scpi.query(f"CALC{self.channel}:DATA:STIM?").split(',') if x.strip()]}
-
+        sweep_type = self.scpi.query("SWE:TYPE?")
+        x_data = self._query_values(f"CALC{self.channel}:DATA:STIM?")
+        return {'type': 'pow' if sweep_type == "POW" else 'frequency', 'x_data': x_data}
 
     # ---- Convenience measurement ----
     def measure_trace(self, tracename, timeout_s=15) -> Dict[str, Any]:
@@ -168,34 +185,98 @@ class RSZVA(Instrument):
         self.set_continuous(on=True)
         return y
 
-    def capture_point(self) -> Dict[str, Any]:
-        return {'x': self.read_x_axis(),
-                'a1': self.measure_trace_ydata_complex('Trca1'), 
-                'b1': self.measure_trace_ydata_complex('Trcb1'), 
-                'a2': self.measure_trace_ydata_complex('Trca2'), 
-                'b2': self.measure_trace_ydata_complex('Trcb2')}
+    def measure_channel_complex(self, channel=1, timeout_s=5) -> Dict[str, Any]:
+        """Trigger one single sweep and fetch every trace of the channel in one transfer.
+
+        Stimulus axis and SDATA of all traces are read back with one compound query
+        (two binary blocks, or one ASCII response together with sweep type and trace
+        catalog), so all traces come from the same sweep.
+        Returns {"x": {...}, <tracename>: {"real": [...], "imag": [...]}, ...}.
+        """
+        self._ensure_format()
+        self.sweep_single(channel=channel)
+        self.scpi.query("*OPC?", timeout_s=timeout_s)
+        data_cmd = f"CALC{channel}:DATA:STIM?;:CALC{channel}:DATA:CALL? SDATA"
+        meta_cmd = f"SENS{channel}:SWE:TYPE?;:CALC{channel}:DATA:CALL:CAT?"
+        if self.data_format == "ASC":
+            resp = self.scpi.query(f"{meta_cmd};:{data_cmd}", timeout_s=timeout_s)
+            sweep_type, cat_str, stim_str, data_str = resp.split(";", 3)
+            x_data = _parse_ascii(stim_str)
+            nums = _parse_ascii(data_str)
+        else:
+            sweep_type, cat_str = self.scpi.query(meta_cmd, timeout_s=timeout_s).split(";", 1)
+            stim_blk, data_blk = self.scpi.query_blocks(data_cmd, 2, timeout_s=timeout_s)
+            x_data = np.frombuffer(stim_blk, dtype="<f8")
+            nums = np.frombuffer(data_blk, dtype="<f8")
+        self.set_continuous(on=True)
+
+        names = [n.strip() for n in cat_str.strip().strip("'\"").split(',') if n.strip()]
+        npts = len(x_data)
+        ntraces = len(nums) // (2 * npts) if npts else 0
+        if ntraces and len(names) == 2 * ntraces:
+            # Some firmware reports 'name,param' pairs in the catalog
+            names = names[0::2]
+        if not ntraces or len(names) != ntraces or len(nums) != 2 * npts * ntraces:
+            raise RuntimeError(
+                f"Unexpected CALL? SDATA layout: {len(nums)} values, {npts} points, traces {names}"
+            )
+
+        out: Dict[str, Any] = {
+            "x": {"type": "pow" if sweep_type.strip().upper().startswith("POW") else "frequency",
+                  "x_data": x_data}
+        }
+        for i, name in enumerate(names):
+            out[name] = _split_complex(nums[2 * npts * i: 2 * npts * (i + 1)])
+        return out
+
+    def capture_point(self, mode: str = "single", timeout_s=5) -> Dict[str, Any]:
+        """Capture a1/b1/a2/b2 waves plus the stimulus axis.
+
+        mode="single" (default) takes all four waves from one sweep via
+        measure_channel_complex(); mode="per_trace" keeps the legacy behaviour of one
+        sweep per wave trace.
+        """
+        if mode == "per_trace":
+            return {'x': self.read_x_axis(),
+                    'a1': self.measure_trace_ydata_complex('Trca1'),
+                    'b1': self.measure_trace_ydata_complex('Trcb1'),
+                    'a2': self.measure_trace_ydata_complex('Trca2'),
+                    'b2': self.measure_trace_ydata_complex('Trcb2')}
+        if mode != "single":
+            raise ValueError(f"Unknown capture mode '{mode}'")
+
+        data = self.measure_channel_complex(self.channel, timeout_s=timeout_s)
+        out: Dict[str, Any] = {'x': data['x']}
+        for wave, tracename in self.wave_traces.items():
+            if tracename not in data:
+                raise RuntimeError(f"Trace '{tracename}' not defined on channel {self.channel}; "
+                                   "run init_vector_receiver")
+            out[wave] = data[tracename]
+        return out
     
     def init_channel(self, channel:int = 1):
-        self.scpi.write(f":CONF:CHAN{channel}:STAT ON")
-        self.clear_syserror()
+        with self.scpi.batch():
+            self.scpi.write(f":CONF:CHAN{channel}:STAT ON")
+            self.clear_syserror()
 
     def init_vector_receiver(self, window:int = 2):
         
         # write to zva example: CALCulate1:PARameter:DEFine 'Trc3', 'A1D1'
         # manual has how to do external generator also. I am pretty sure these are returned as voltages but that needs to be confirmed
 
-        self.scpi.write(f"C:SENSe1:CORRection:EWAVe:STATe ON")
-        self.scpi.write(f"CALC{self.channel}:PAR:SDEF 'Trca1', 'A{self.input_port}D{self.input_port}'")
-        self.scpi.write(f"CALC{self.channel}:PAR:SDEF 'Trca2', 'A{self.output_port}D{self.input_port}'")
-        self.scpi.write(f"CALC{self.channel}:PAR:SDEF 'Trcb1', 'B{self.input_port}D{self.input_port}'")
-        self.scpi.write(f"CALC{self.channel}:PAR:SDEF 'Trcb2', 'B{self.output_port}D{self.input_port}'")
-        self.scpi.write(f"DISP:WIND{window}:STAT OFF")
-        self.clear_syserror()
-        self.scpi.write(f"DISP:WIND{window}:STAT ON")
-        self.scpi.write(f"DISP:WIND{window}:TRAC1:FEED 'Trca1'")
-        self.scpi.write(f"DISP:WIND{window}:TRAC2:FEED 'Trca2'")
-        self.scpi.write(f"DISP:WIND{window}:TRAC3:FEED 'Trcb1'")
-        self.scpi.write(f"DISP:WIND{window}:TRAC4:FEED 'Trcb2'")
+        with self.scpi.batch():
+            self.scpi.write(f"C:SENSe1:CORRection:EWAVe:STATe ON")
+            self.scpi.write(f"CALC{self.channel}:PAR:SDEF 'Trca1', 'A{self.input_port}D{self.input_port}'")
+            self.scpi.write(f"CALC{self.channel}:PAR:SDEF 'Trca2', 'A{self.output_port}D{self.input_port}'")
+            self.scpi.write(f"CALC{self.channel}:PAR:SDEF 'Trcb1', 'B{self.input_port}D{self.input_port}'")
+            self.scpi.write(f"CALC{self.channel}:PAR:SDEF 'Trcb2', 'B{self.output_port}D{self.input_port}'")
+            self.scpi.write(f"DISP:WIND{window}:STAT OFF")
+            self.clear_syserror()
+            self.scpi.write(f"DISP:WIND{window}:STAT ON")
+            self.scpi.write(f"DISP:WIND{window}:TRAC1:FEED 'Trca1'")
+            self.scpi.write(f"DISP:WIND{window}:TRAC2:FEED 'Trca2'")
+            self.scpi.write(f"DISP:WIND{window}:TRAC3:FEED 'Trcb1'")
+            self.scpi.write(f"DISP:WIND{window}:TRAC4:FEED 'Trcb2'")
 
     def get_error_terms(self, filename) -> Dict[str, Any]:
         self.set_cal_file(filename) 
@@ -235,4 +316,13 @@ class RSZVA(Instrument):
             return True
         except Exception as e:
             # Surface instrument/SCPI errors with context
-            raise RuntimeError(f"Failed to load setup '{cal_filename}': {e}") from e
\ No newline at end of file
+            raise RuntimeError(f"Failed to load setup '{cal_filename}': {e}") from e
+
+
+def _parse_ascii(data_str: str) -> list[float]:
+    return [float(x.strip()) for x in data_str.split(',') if x.strip()]
+
+
+def _split_complex(nums) -> Dict[str, Any]:
+    """Split interleaved real,imag values; slicing keeps ndarrays as zero-copy views."""
+    return {"real": nums[0::2], "imag": nums[1::2]}
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+
+from loadpull.core.adaptive import AdaptiveSearch, gamma_from
+from loadpull.core.results import JsonlWriter
+from loadpull.core.sequencing import AdaptiveNode, Context, Sequence
+
+OPT = complex(0.35, 0.25)
+
+
+def _pout(g: complex) -> float:
+    # Elliptical, tilted surface peaking at OPT with 20 dBm
+    d = g - OPT
+    return 20.0 - 40 * d.real ** 2 - 25 * d.imag ** 2 - 10 * d.real * d.imag
+
+
+class FakeTuner:
+    def __init__(self) -> None:
+        self.gamma = 0j
+        self.moves = 0
+
+    def set_gamma(self, freq_ghz: float, gamma_mag: float, gamma_deg: float) -> dict:
+        self.gamma = gamma_from({"gamma_mag": gamma_mag, "gamma_deg": gamma_deg})
+        self.moves += 1
+        return {}
+
+    def read_pout(self) -> dict:
+        gamma_l = {"real": [self.gamma.real], "imag": [self.gamma.imag]}
+        return {"dBm": _pout(self.gamma), "gamma_L": gamma_l}
+
+
+def test_search_converges_on_quadratic_surface() -> None:
+    search = AdaptiveSearch(center=0j, radius=0.3, max_points=40, tol=0.01, contour=1.0,
+                            contour_tol=0.05)
+    while (g := search.next_point()) is not None:
+        search.add(g, _pout(g))
+    res = search.result()
+    assert res["converged"]
+    assert res["points"] < 40
+    assert abs(complex(res["real"], res["imag"]) - OPT) < 1e-6
+    assert res["value"] == pytest.approx(20.0)
+    for pt in res["contour"]:
+        assert _pout(complex(pt["real"], pt["imag"])) == pytest.approx(19.0, abs=1e-6)
+
+
+def test_minimize_and_max_mag() -> None:
+    search = AdaptiveSearch(center=0.9 + 0j, radius=0.3, maximize=False, max_mag=0.95,
+                            max_points=25)
+    assert abs(search._seed[1]) <= 0.95  # ring point past the edge is pulled in
+    while (g := search.next_point()) is not None:
+        assert abs(g) <= 0.95 + 1e-12
+        search.add(g, -_pout(g))
+    res = search.result()
+    assert res["best_measured"]["value"] <= -19.0
+    assert abs(complex(res["real"], res["imag"]) - OPT) < 0.02
+
+
+def test_search_requires_ring_for_fit() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveSearch(ring=3)
+
+
+def test_adaptive_action_runs_body_per_point(tmp_path: Path) -> None:
+    tuner = FakeTuner()
+    ctx = Context(instruments={"TUNER": tuner}, writer=JsonlWriter(tmp_path / "out.jsonl"),
+                  cal_store=None, cal_cache={})
+    steps = [{"adaptive": {
+        "var": "load",
+        "center": {"gamma_mag": 0.0, "gamma_deg": 0.0},
+        "radius": 0.3,
+        "tol": 0.01,
+        "contour_tol": 0.05,
+        "value": "${meas.dBm}",
+        "gamma": "${meas.gamma_L}",
+        "save_as": "opt",
+        "do": [
+            {"call": {"inst": "TUNER", "method": "set_gamma",
+                      "args": [2.0, "${load.gamma_mag}", "${load.gamma_deg}"]}},
+            {"measure": {"inst": "TUNER", "method": "read_pout", "save_as": "meas"}},
+            {"results_update": {"record": {"i": "${load.index}", "pout": "${meas.dBm}"}}},
+        ],
+    }}]
+    plan = Sequence("adaptive", {"steps": steps}).compile(ctx)
+    assert isinstance(plan.steps[0], AdaptiveNode)
+    env = plan.run(ctx, {})
+    ctx.writer.close()
+    assert env["opt"]["converged"]
+    assert env["opt"]["points"] == tuner.moves
+    assert abs(complex(env["opt"]["real"], env["opt"]["imag"]) - OPT) < 1e-6
+    text = (tmp_path / "out.jsonl").read_text()
+    assert text.count('"step": "results:update"') == tuner.moves
+
+
+def test_adaptive_rejects_unknown_keys(tmp_path: Path) -> None:
+    ctx = Context(instruments={}, writer=JsonlWriter(tmp_path / "out.jsonl"), cal_store=None,
+                  cal_cache={})
+    with pytest.raises(ValueError, match="unknown keys"):
+        spec = {"adaptive": {"center": 0, "value": "${x}", "radius_max": 1}}
+        Sequence("a", {"steps": [spec]}).compile(ctx)
+    ctx.writer.close()
+
+
+def test_result_without_valid_measurements() -> None:
+    search = AdaptiveSearch()
+    while (g := search.next_point()) is not None:
+        search.add(g, float("nan"))
+    out = search.result()
+    assert out["points"] == len(search.gammas)
+    assert "best_measured" not in out
+
+
+def test_non_finite_gamma_is_left_out_of_the_fit() -> None:
+    search = AdaptiveSearch(center=0j, radius=0.3, max_points=40, tol=0.01, contour=1.0,
+                            contour_tol=0.05)
+    while (g := search.next_point()) is not None:
+        # The read-back of the fourth point failed; its finite value must not poison the fit
+        search.add(complex(float("nan"), 0.0) if len(search.gammas) == 3 else g, _pout(g))
+    res = search.result()
+    assert res["converged"]
+    assert abs(complex(res["real"], res["imag"]) - OPT) < 1e-6
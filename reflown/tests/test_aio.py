@@ -0,0 +1,214 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from loadpull.core.aio import AsyncEngine, AsyncScpi, ThreadedTransport
+from loadpull.core.results import JsonlWriter
+from loadpull.core.scpi import Scpi, ScpiError
+from loadpull.core.sequencing import Context, Sequence
+from loadpull.core.transport import FakeTransport
+from loadpull.instruments.base import Instrument
+
+
+class Tuner:
+    def __init__(self) -> None:
+        self.threads: set[str] = set()
+
+    def move(self, pos: int) -> int:
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.2)
+        return pos
+
+
+class Vna:
+    async def sweep(self) -> str:
+        await asyncio.sleep(0.2)
+        return "trace"
+
+
+class Dmm:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def read(self) -> float:
+        self.calls += 1
+        time.sleep(0.1)
+        return 1.5
+
+    def boom(self) -> None:
+        raise RuntimeError("boom")
+
+
+def _ctx(tmp_path: Path, engine=None) -> Context:
+    return Context(
+        instruments={"TUNER": Tuner(), "VNA": Vna(), "DMM": Dmm()},
+        writer=JsonlWriter(tmp_path / "log.jsonl"),
+        cal_store=None,
+        cal_cache={},
+        engine=engine,
+    )
+
+
+def test_launched_actions_overlap_within_a_point(tmp_path: Path) -> None:
+    body = [
+        {"call": {"inst": "TUNER", "method": "move", "args": ["${i}"], "save_as": "pos",
+                  "async": True}},
+        {"measure": {"inst": "VNA", "method": "sweep", "save_as": "trace", "async": True}},
+        {"measure": {"inst": "DMM", "method": "read", "save_as": "vdd"}},
+        {"results_update": {}},
+    ]
+    spec = {"name": "aio", "engine": "async",
+            "steps": [{"sweep": {"var": "i", "from": 0, "to": 1, "step": 1, "do": body}}]}
+    ctx = _ctx(tmp_path)
+    t0 = time.perf_counter()
+    Sequence("aio", spec).run(ctx)
+    elapsed = time.perf_counter() - t0
+    ctx.writer.close()
+    assert elapsed < 0.6  # two points of max(0.2, 0.2, 0.1) instead of 1.0 s serial
+    assert ctx.engine is None
+    assert all(name.startswith("loadpull-TUNER") for name in ctx.instruments["TUNER"].threads)
+    lines = (tmp_path / "log.jsonl").read_text().splitlines()
+    assert sum('"results:update"' in line and '"trace": "trace"' in line and '"pos": 1' in line
+               for line in lines) == 1
+
+
+def test_same_instrument_waits_for_launch_and_join(tmp_path: Path) -> None:
+    engine = AsyncEngine()
+    try:
+        ctx = _ctx(tmp_path, engine)
+        spec = {"steps": [
+            {"call": {"inst": "TUNER", "method": "move", "args": [1], "save_as": "a",
+                      "async": True}},
+            {"call": {"inst": "TUNER", "method": "move", "args": [2], "save_as": "b"}},
+            {"call": {"inst": "DMM", "method": "boom", "async": True}},
+            {"join": ["TUNER"]},
+        ]}
+        plan = Sequence("aio", spec).compile(ctx)
+        env = {}
+        with pytest.raises(RuntimeError, match="boom"):
+            plan.run(ctx, env)
+    finally:
+        engine.close()
+        ctx.writer.close()
+
+
+def test_async_method_needs_engine(tmp_path: Path) -> None:
+    spec = {"steps": [{"measure": {"inst": "VNA", "method": "sweep"}}]}
+    with pytest.raises(ValueError, match="engine: async"):
+        Sequence("aio", spec).compile(_ctx(tmp_path))
+
+
+def test_async_scpi_over_threaded_transport() -> None:
+    async def main() -> None:
+        fake = FakeTransport(["1.0", "+0,\"No error\"", "2.0", "-113,\"Undefined header\"",
+                              "+0,\"No error\""])
+        scpi = AsyncScpi(ThreadedTransport(fake))
+        await scpi.t.open()
+        results = await asyncio.gather(scpi.query("MEAS?"), scpi.query("MEAS?"),
+                                       return_exceptions=True)
+        await scpi.t.close()
+        assert results[0] == "1.0"
+        assert isinstance(results[1], ScpiError)
+        assert fake.writes == ["MEAS?", "SYST:ERR?", "MEAS?", "SYST:ERR?", "SYST:ERR?"]
+
+    asyncio.run(main())
+
+
+def test_async_scpi_piggyback_keeps_quoted_semicolons() -> None:
+    async def main() -> None:
+        fake = FakeTransport(['1.5;-222,"Data out of range;SOUR:POW 100"', '+0,"No error"'])
+        scpi = AsyncScpi(ThreadedTransport(fake), err_policy="piggyback")
+        await scpi.t.open()
+        with pytest.raises(ScpiError) as exc:
+            await scpi.query("SOUR:POW?")
+        await scpi.t.close()
+        assert exc.value.errors == ['-222,"Data out of range;SOUR:POW 100"']
+
+    asyncio.run(main())
+
+
+class SlowTransport(FakeTransport):
+    """FakeTransport whose reads take a while; logs writes and reads in bus order."""
+
+    def __init__(self, responses: list[str]):
+        super().__init__(responses)
+        self.bus: list[str] = []
+
+    def write(self, data: str) -> None:
+        super().write(data)
+        self.bus.append(data)
+
+    def read(self, timeout_s: float) -> str:
+        time.sleep(0.1)
+        out = super().read(timeout_s)
+        self.bus.append(f"<- {out}")
+        return out
+
+
+class Analyzer(Instrument):
+    def measure(self) -> float:
+        time.sleep(0.05)  # the query is still in flight at the next action boundary
+        return float(self.scpi.query("READ?"))
+
+
+def test_error_drain_waits_for_launched_exchange(tmp_path: Path) -> None:
+    ft = SlowTransport(["1.5", '0,"No error"'])
+    ft.open()
+    ctx = _ctx(tmp_path)
+    ctx.instruments["SA"] = Analyzer(Scpi(ft, err_policy="action"))
+    spec = {"name": "aio", "engine": "async", "steps": [
+        {"measure": {"inst": "SA", "method": "measure", "save_as": "p", "async": True}},
+        {"measure": {"inst": "DMM", "method": "read", "save_as": "vdd"}},
+        {"results_update": {}},
+    ]}
+    Sequence("aio", spec).run(ctx)
+    ctx.writer.close()
+    assert ft.bus == ["READ?", "<- 1.5", "SYST:ERR?", '<- 0,"No error"']
+    assert '"p": 1.5' in (tmp_path / "log.jsonl").read_text()
+
+
+class AsyncAnalyzer:
+    def __init__(self, scpi: AsyncScpi):
+        self.scpi = scpi
+
+    async def measure(self) -> float:
+        return float(await self.scpi.query("READ?"))
+
+
+def test_deferred_async_scpi_errors_are_drained_by_the_engine(tmp_path: Path) -> None:
+    fake = FakeTransport(["1.5", '-222,"Data out of range"', '0,"No error"'])
+    scpi = AsyncScpi(ThreadedTransport(fake), err_policy="action")
+    asyncio.run(scpi.t.open())
+    ctx = _ctx(tmp_path)
+    ctx.instruments["SA"] = AsyncAnalyzer(scpi)
+    spec = {"name": "aio", "engine": "async", "steps": [
+        {"measure": {"inst": "SA", "method": "measure", "save_as": "p"}},
+    ]}
+    with pytest.raises(ScpiError) as exc:
+        Sequence("aio", spec).run(ctx)
+    ctx.writer.close()
+    assert exc.value.commands == ["READ?"]
+    assert fake.writes == ["READ?", "SYST:ERR?", "SYST:ERR?"]
+
+
+def test_async_scpi_checks_options() -> None:
+    with pytest.raises(ValueError, match="error policy"):
+        AsyncScpi(ThreadedTransport(FakeTransport()), err_policy="sometimes")
+    with pytest.raises(TypeError):
+        AsyncScpi(ThreadedTransport(FakeTransport()), batch_limt=64)  # type: ignore[call-arg]
+
+
+def test_async_scpi_piggyback_query_blocks() -> None:
+    async def main() -> None:
+        fake = FakeTransport([b"#13abc;#12de\n", '-222,"Data out of range"', '0,"No error"'])
+        scpi = AsyncScpi(ThreadedTransport(fake), err_policy="piggyback")
+        await scpi.t.open()
+        with pytest.raises(ScpiError):
+            await scpi.query_blocks("TRAC1?;TRAC2?", 2)
+        await scpi.t.close()
+        assert fake.writes == ["TRAC1?;TRAC2?;:SYST:ERR?", "SYST:ERR?"]
+
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from loadpull.core import caltable
+from loadpull.core.caltable import CalTable, cal_table, content_hash, precompile
+from loadpull.core.errorcorrection import error_terms
+from loadpull.core.transforms import default_registry
+
+
+def _payload() -> dict:
+    return {
+        "freq_hz": [3e9, 1e9, 2e9],
+        "Es2": {"real": [0.3, 0.1, 0.2], "imag": [0.0, 0.0, 0.0]},
+        "Ed2": {"real": [0.0, 0.0, 0.0], "imag": [0.03, 0.01, 0.02]},
+        "Er2": {"real": [1.0, 1.0, 1.0], "imag": [0.0, 0.0, 0.0]},
+        "E10": {"real": [2.0], "imag": [0.0]},
+        "csv": "probe.csv",
+    }
+
+
+def test_table_sorted_indexed_and_read_only() -> None:
+    table = CalTable.from_payload(_payload())
+    assert table.freq_hz.tolist() == [1e9, 2e9, 3e9]
+    assert table.row(2e9)["Es2"] == 0.2
+    assert table.row(2e9 + 0.5)["Ed2"] == 0.02j  # within the 1 Hz tolerance
+    assert table.term("E10", 1e9) == 2.0
+    assert np.isnan(table.term("C10", 1e9))
+    assert "csv" not in table.scalars
+    with pytest.raises(ValueError):
+        table.terms["Es2"][0] = 5
+    with pytest.raises(TypeError):
+        table.terms["new"] = np.zeros(3)  # type: ignore[index]
+    with pytest.raises(KeyError):
+        table.row(1.5e9)
+    assert table.row(1.5e9, interpolate=True)["Es2"] == pytest.approx(0.15)
+    np.testing.assert_allclose(table.at([3e9, 1e9])["Es2"], [0.3, 0.1])
+
+
+def test_cal_table_memoized_by_identity_and_content(monkeypatch) -> None:
+    calls = []
+    original = CalTable.from_payload.__func__
+    counted = classmethod(lambda cls, p, d=None: calls.append(1) or original(cls, p, d))
+    monkeypatch.setattr(CalTable, "from_payload", counted)
+    caltable._BY_ID.clear()
+    caltable._BY_HASH.clear()
+    payload = _payload()
+    first = cal_table(payload)
+    assert cal_table(payload) is first
+    assert cal_table(_payload()) is first  # equal content, new object
+    assert len(calls) == 1
+    assert content_hash({"a": np.arange(3)}) != content_hash({"a": np.arange(3.0)})
+
+
+def test_cal_power_coupling_uses_table() -> None:
+    probe = _payload()
+    pm = {"freq_hz": np.array([1e9, 2e9]),
+          "s11": {"real": np.array([0.1, 0.2]), "imag": np.zeros(2)}}
+    out = default_registry().apply("cal_power_coupling", {
+        "probe_calfile": probe,
+        "pm_s1p": pm,
+        "wave_values": {"x": [2e9], "b2": {"real": [0.5], "imag": [0.0]}},
+        "PM_power": {"2000000000.0": {"dBm": 10.0}},
+    }, {})
+    assert out["freq_hz"] == 2e9
+    assert out["Es2"] == 0.2
+    assert out["gamma_pm"] == 0.2
+    gamma_t = (0.2 - 0.02j) / (1 + 0.2 * (0.2 - 0.02j))
+    assert out["gamma_t"] == pytest.approx(gamma_t)
+    # 3 GHz is on the probe grid but not the PM grid
+    miss = default_registry().apply("cal_power_coupling", {
+        "probe_calfile": probe, "pm_s1p": pm, "wave_values": {"x": [3e9], "b2": [0.5]},
+    }, {})
+    assert miss == {}
+
+
+def test_error_terms_share_the_precompiled_table() -> None:
+    raw = {
+        "freq_hz": [2e9, 1e9],
+        **{k: {"real": [0.1, 0.2], "imag": [0.0, 0.0]} for k in (
+            "directivity_input", "srcmatch_input", "refltrack_input",
+            "directivity_output", "srcmatch_output", "refltrack_output")},
+    }
+    precompile({"terms": raw})
+    table = cal_table(raw)
+    terms = error_terms(raw)
+    assert error_terms(raw) is terms
+    assert table.derived("error_terms", lambda t: None) is terms
+    assert terms.freq_hz.tolist() == [1e9, 2e9]
+    # Same matching rule as the table: nearest grid point within 1 Hz
+    assert terms.index([2e9 + 0.5]).tolist() == [table.find(2e9 + 0.5)]
+
+
+def test_cal_power_coupling_without_probe_axis_skips_both_ways() -> None:
+    probe = {k: v for k, v in _payload().items() if k != "freq_hz"}
+    for interpolate in (False, True):
+        out = default_registry().apply("cal_power_coupling", {
+            "probe_calfile": probe, "wave_values": {"x": [2e9], "b2": [0.5]},
+            "interpolate": interpolate,
+        }, {})
+        assert out == {}
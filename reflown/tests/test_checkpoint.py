@@ -0,0 +1,174 @@
+import pickle
+import threading
+from pathlib import Path
+
+import pytest
+
+from loadpull.core.checkpoint import Checkpointer
+from loadpull.core.results import BackgroundWriter, JsonlWriter, iter_records
+from loadpull.core.sequencing import Context, Env, Sequence
+
+
+class Bench:
+    def __init__(self, fail_at: tuple | None = None):
+        self.fail_at = fail_at
+        self.log: list[tuple] = []
+
+    def set_bias(self, v: float) -> None:
+        self.log.append(("bias", v))
+
+    def read_id(self) -> str:
+        self.log.append(("id",))
+        return "B-1"
+
+    def measure(self, v: float, p: float) -> float:
+        if (v, p) == self.fail_at:
+            raise RuntimeError("tuner timeout")
+        self.log.append(("meas", v, p))
+        return v * 10 + p
+
+
+SPEC = {"name": "cp", "steps": [
+    {"call": {"inst": "B", "method": "read_id", "save_as": "ident"}},
+    {"call": {"inst": "B", "method": "set_bias", "args": [0.0]}},
+    {"sweep": {"var": "v", "from": 1, "to": 2, "step": 1, "do": [
+        {"call": {"inst": "B", "method": "set_bias", "args": ["${v}"]}},
+        {"foreach": {"var": "p", "values": [0.1, 0.2, 0.3], "do": [
+            {"measure": {"inst": "B", "method": "measure", "args": ["${v}", "${p}"],
+                         "save_as": "m"}},
+            {"results_update": {}},
+        ]}},
+    ]}},
+]}
+
+
+def _ctx(tmp_path: Path, inst: Bench, **cp) -> Context:
+    log = tmp_path / "log.jsonl"
+    ctx = Context(instruments={"B": inst}, writer=JsonlWriter(log), cal_store=None,
+                  cal_cache={"k": 1})
+    ctx.checkpoint = Checkpointer(tmp_path / "checkpoint.pkl", files=[log], **cp)
+    return ctx
+
+
+def test_resume_skips_completed_points(tmp_path: Path) -> None:
+    first = Bench(fail_at=(2.0, 0.2))
+    ctx = _ctx(tmp_path, first)
+    with pytest.raises(RuntimeError):
+        Sequence("cp", SPEC).run(ctx)
+    ctx.writer.close()
+    ctx.checkpoint.close()
+    assert [e for e in first.log if e[0] == "meas"] == [
+        ("meas", 1.0, 0.1), ("meas", 1.0, 0.2), ("meas", 1.0, 0.3), ("meas", 2.0, 0.1)]
+
+    state = Checkpointer.load(tmp_path / "checkpoint.pkl")
+    assert state["cursor"] == [2, 1, 1, 0] and not state["complete"]
+    assert state["env"]["ident"] == "B-1"
+    Checkpointer.cut_files(state, tmp_path)
+
+    second = Bench()
+    ctx = _ctx(tmp_path, second)
+    ctx.checkpoint.restore(state)
+    ctx.cal_cache.update(state["cal_cache"])
+    Sequence("cp", SPEC).run(ctx, Env(state["env"]))
+    ctx.writer.close()
+    ctx.checkpoint.close()
+    # Settings of the interrupted loop iteration are re-sent, top-level setup and completed
+    # points are not repeated
+    assert second.log == [("bias", 2.0), ("meas", 2.0, 0.2), ("meas", 2.0, 0.3)]
+    records = list(iter_records(tmp_path / "log.jsonl"))
+    results = [r["m"] for r in records if r["step"] == "results:update"]
+    assert results == [10.1, 10.2, 10.3, 20.1, 20.2, 20.3]
+    # Replayed settings are not logged again
+    calls = [(r["step"], r["result"]) for r in records if r["step"].startswith("call:")]
+    assert calls == [("call:read_id", "B-1"), ("call:set_bias", None), ("call:set_bias", None),
+                     ("call:set_bias", None)]
+    assert Checkpointer.load(tmp_path / "checkpoint.pkl")["complete"]
+
+
+def test_replay_is_set_per_call(tmp_path: Path) -> None:
+    steps = [dict(SPEC["steps"][1]), dict(SPEC["steps"][2])]
+    steps[0]["call"] = {**steps[0]["call"], "replay": True}
+    body = [dict(a) for a in steps[1]["sweep"]["do"]]
+    body[0]["call"] = {**body[0]["call"], "replay": False}
+    steps[1] = {"sweep": {**steps[1]["sweep"], "do": body}}
+    spec = {"name": "cp", "steps": steps}
+    ctx = _ctx(tmp_path, Bench(fail_at=(2.0, 0.2)))
+    with pytest.raises(RuntimeError):
+        Sequence("cp", spec).run(ctx)
+    ctx.writer.close()
+    ctx.checkpoint.close()
+    state = Checkpointer.load(tmp_path / "checkpoint.pkl")
+
+    again = Bench()
+    ctx = _ctx(tmp_path, again)
+    ctx.checkpoint.restore(state)
+    Sequence("cp", spec).run(ctx, Env(state["env"]))
+    ctx.writer.close()
+    ctx.checkpoint.close()
+    assert again.log == [("bias", 0.0), ("meas", 2.0, 0.2), ("meas", 2.0, 0.3)]
+    with pytest.raises(ValueError, match="replay"):
+        bad = {"call": {"inst": "B", "method": "set_bias", "replay": "yes"}}
+        Sequence("cp", {"steps": [bad]}).compile(ctx)
+
+
+def test_outer_loop_granularity(tmp_path: Path) -> None:
+    inst = Bench(fail_at=(2.0, 0.3))
+    ctx = _ctx(tmp_path, inst, depth=1)
+    with pytest.raises(RuntimeError):
+        Sequence("cp", SPEC).run(ctx)
+    ctx.writer.close()
+    ctx.checkpoint.close()
+    state = Checkpointer.load(tmp_path / "checkpoint.pkl")
+    assert state["cursor"] == [2, 0]
+    assert ctx.checkpoint.saved == 1
+
+    again = Bench()
+    ctx = _ctx(tmp_path, again, depth=1)
+    ctx.checkpoint.restore(state)
+    Sequence("cp", SPEC).run(ctx, Env(state["env"]))
+    ctx.writer.close()
+    ctx.checkpoint.close()
+    assert [e[1:] for e in again.log if e[0] == "meas"] == [(2.0, 0.1), (2.0, 0.2), (2.0, 0.3)]
+
+
+def test_every_must_be_positive(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        Checkpointer(tmp_path / "cp.pkl", every=0)
+
+
+def test_frames_hold_changes_and_background_writer_sizes(tmp_path: Path) -> None:
+    log = tmp_path / "log.jsonl"
+    writer = BackgroundWriter(JsonlWriter(log))
+    ctx = Context(instruments={"B": Bench()}, writer=writer, cal_store=None, cal_cache={"k": 1})
+    ctx.checkpoint = Checkpointer(tmp_path / "checkpoint.pkl", files=[log])
+    env = Env({"big": list(range(1000)), "meas": {"a": 1}})
+    ctx.checkpoint.enter(0, loop=True)
+    ctx.checkpoint.save(env, ctx)
+    for i in range(1, 4):
+        env["v"] = float(i)
+        env.assign(["meas", "b"], i)
+        ctx.writer.write_point("cp", "x", {"v": env["v"]})
+        ctx.checkpoint.stack[-1] = i
+        ctx.checkpoint.save(env, ctx)
+    env.pop("big")
+    ctx.checkpoint.save(env, ctx, complete=True)
+    writer.close()
+    ctx.checkpoint.close()
+
+    state = Checkpointer.load(tmp_path / "checkpoint.pkl")
+    assert state["env"] == {"meas": {"a": 1, "b": 3}, "v": 3.0}
+    assert state["cursor"] == [3] and state["complete"]
+    assert state["files"]["log.jsonl"] == log.stat().st_size
+    # Only the base frame carries the large value
+    assert (tmp_path / "checkpoint.pkl").stat().st_size < 2 * len(pickle.dumps(list(range(1000))))
+
+
+def test_unpicklable_values_are_skipped(tmp_path: Path) -> None:
+    ctx = _ctx(tmp_path, Bench())
+    env = Env({"v": 1.0, "lock": threading.Lock()})
+    ctx.checkpoint.enter(0, loop=True)
+    with pytest.warns(RuntimeWarning, match="lock"):
+        ctx.checkpoint.save(env, ctx)
+        ctx.checkpoint.close()
+    ctx.writer.close()
+    assert Checkpointer.load(tmp_path / "checkpoint.pkl")["env"] == {"v": 1.0}
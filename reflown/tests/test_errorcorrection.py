@@ -0,0 +1,115 @@
+import copy
+
+import numpy as np
+import pytest
+
+from loadpull.core.errorcorrection import ErrorTerms, correct_waves
+from loadpull.core.transforms import default_registry
+from loadpull.core.transforms.registry import columns
+
+FREQ = np.array([1e9, 2e9, 3e9])
+
+
+def _c(arr) -> dict:
+    arr = np.asarray(arr, dtype=complex)
+    return {"real": arr.real.tolist(), "imag": arr.imag.tolist()}
+
+
+def _terms() -> dict:
+    rng = np.random.default_rng(1)
+    small = lambda: 0.1 * (rng.normal(size=3) + 1j * rng.normal(size=3))
+    return {
+        "freq_hz": {"type": "frequency", "x_data": FREQ.tolist()},
+        "directivity_input": _c(small()), "srcmatch_input": _c(small()),
+        "refltrack_input": _c(1 + small()),
+        "directivity_output": _c(small()), "srcmatch_output": _c(small()),
+        "refltrack_output": _c(1 + small()),
+        "loadmatch_input": _c(small()),
+    }
+
+
+def _measured(raw: dict, a: np.ndarray, b: np.ndarray, port: str) -> tuple[np.ndarray, np.ndarray]:
+    """Raw receiver waves that the error box maps to DUT-plane waves a, b."""
+    terms = ErrorTerms.from_dict(raw)
+    box = terms.input if port == "input" else terms.output
+    a_m = (a - box.es * b) * box.et / box.er
+    return a_m, box.ed * a_m + box.et * b
+
+
+def test_correct_waves_recovers_dut_plane_batch() -> None:
+    raw = _terms()
+    rng = np.random.default_rng(2)
+    n = 50
+    a1 = 0.1 * np.exp(1j * rng.uniform(0, 6, (n, 3)))
+    gamma_in = 0.3 * np.exp(1j * rng.uniform(0, 6, (n, 3)))
+    b2 = 0.5 * np.exp(1j * rng.uniform(0, 6, (n, 3)))
+    gamma_l = 0.6 * np.exp(1j * rng.uniform(0, 6, (n, 3)))
+    a1_m, b1_m = _measured(raw, a1, gamma_in * a1, "input")
+    a2_m, b2_m = _measured(raw, gamma_l * b2, b2, "output")
+
+    out = correct_waves(ErrorTerms.from_dict(raw), a1_m, b1_m, a2_m, b2_m)
+
+    np.testing.assert_allclose(out["gamma_in"], gamma_in, atol=1e-12)
+    np.testing.assert_allclose(out["gamma_L"], gamma_l, atol=1e-12)
+    np.testing.assert_allclose(out["P_L_W"], 0.25 * (1 - 0.36), rtol=1e-9)
+    np.testing.assert_allclose(out["P_in_W"], 0.01 * (1 - 0.09), rtol=1e-9)
+    assert out["gain_dB"].shape == (n, 3)
+
+
+def test_terms_align_to_capture_frequencies() -> None:
+    terms = ErrorTerms.from_dict(_terms())
+    sub = terms.at([3e9, 1e9])
+    assert sub.freq_hz.tolist() == [3e9, 1e9]
+    assert sub.input.ed[0] == terms.input.ed[2]
+    assert sub.extra["loadmatch_input"][1] == terms.extra["loadmatch_input"][0]
+    with pytest.raises(ValueError, match="not in the cal grid"):
+        terms.at([1.5e9])
+    with pytest.raises(ValueError, match="missing"):
+        ErrorTerms.from_dict({"freq_hz": [1e9]})
+
+
+def test_corr_waves_transform_single_and_list() -> None:
+    raw = _terms()
+    reg = default_registry()
+    b2 = np.full(2, 0.5 + 0j)
+    gamma_l = np.array([0.2, 0.5j])
+    sub = ErrorTerms.from_dict(raw).at([1e9, 2e9])
+    a1_m, b1_m = (np.full(2, 0.1 + 0j), np.zeros(2, complex))
+    a2_m = (gamma_l * b2 - sub.output.es * b2) * sub.output.et / sub.output.er
+    b2_m = sub.output.ed * a2_m + sub.output.et * b2
+    capture = {"x": {"type": "frequency", "x_data": [1e9, 2e9]},
+               "a1": _c(a1_m), "b1": _c(b1_m), "a2": _c(a2_m), "b2": _c(b2_m)}
+
+    one = reg.apply("corr_waves", {"wave_data": capture, "terms": raw}, {})
+    np.testing.assert_allclose(one["gamma_L"]["real"], gamma_l.real, atol=1e-12)
+    np.testing.assert_allclose(one["gamma_L"]["imag"], gamma_l.imag, atol=1e-12)
+    assert one["freq_hz"] == [1e9, 2e9]
+
+    many = reg.apply("corr_waves", {"wave_data": [capture, capture], "terms": raw}, {})
+    assert np.asarray(many["P_L"]["dBm"]).shape == (2, 2)
+    gam = reg.apply("corr_gamma", {"wave_data": capture, "terms": raw}, {})
+    assert gam["gamma_L"]["mag"] == pytest.approx(np.abs(gamma_l).tolist())
+
+
+def test_corr_waves_power_sweep_uses_given_frequency() -> None:
+    raw = _terms()
+    reg = default_registry()
+    b2 = np.full(3, 0.5 + 0j)
+    gamma_l = np.array([0.2, 0.5j, -0.3])
+    cw = ErrorTerms.from_dict(raw).at([2e9])
+    a2_m = (gamma_l * b2 - cw.output.es * b2) * cw.output.et / cw.output.er
+    b2_m = cw.output.ed * a2_m + cw.output.et * b2
+    capture = {"x": {"type": "pow", "x_data": [-10.0, -5.0, 0.0]},
+               "a1": _c(np.full(3, 0.1)), "b1": _c(np.zeros(3)), "a2": _c(a2_m), "b2": _c(b2_m)}
+    payload = {"wave_data": capture, "terms": raw, "freq_hz": 2e9}
+
+    one = reg.apply("corr_waves", payload, {})
+    np.testing.assert_allclose(one["gamma_L"]["real"], gamma_l.real, atol=1e-12)
+    np.testing.assert_allclose(one["gamma_L"]["imag"], gamma_l.imag, atol=1e-12)
+    assert one["freq_hz"] == [2e9]
+
+    cols = columns([{**payload, "wave_data": copy.deepcopy(capture)} for _ in range(2)])
+    batch = reg.apply_batch("corr_waves", cols, {})
+    np.testing.assert_allclose(batch["gamma_L"]["real"], np.tile(gamma_l.real, (2, 1)), atol=1e-12)
+    gam = reg.apply("corr_gamma", payload, {})
+    assert gam["gamma_L"]["mag"] == pytest.approx(np.abs(gamma_l).tolist())
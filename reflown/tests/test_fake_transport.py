@@ -3,8 +3,15 @@ from loadpull.core.scpi import Scpi
 
 
 def test_fake_transport_roundtrip():
-ft = FakeTransport(responses=["KEYSIGHT,PNA,0,0", "0,No error"])
-ft.open()
-scpi = Scpi(ft)
-out = scpi.query("*IDN?")
-assert "KEYSIGHT" in out
\ No newline at end of file
+    ft = FakeTransport(responses=["KEYSIGHT,PNA,0,0", "0,No error"])
+    ft.open()
+    scpi = Scpi(ft)
+    out = scpi.query("*IDN?")
+    assert "KEYSIGHT" in out
+
+
+def test_fake_transport_definite_length_blocks():
+    ft = FakeTransport(responses=[b"#15hello;#2100123456789\n", "0,No error"])
+    ft.open()
+    scpi = Scpi(ft)
+    assert scpi.query_blocks("DATA?;:DATA?", 2) == [b"hello", b"0123456789"]
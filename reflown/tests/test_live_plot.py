@@ -0,0 +1,77 @@
+import json
+import queue
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from loadpull.core.plotting import LivePlotWriter, panel_keys
+
+LAYOUT = {
+    "rows": 1,
+    "cols": 2,
+    "fps": 50,
+    "panels": [
+        {"title": "Pout", "x": "p", "y": "pout", "refresh": False},
+        {"title": "gamma", "mag": "g.mag", "angle_rad": "g.ang"},
+    ],
+}
+
+
+def _write(writer: LivePlotWriter, n: int) -> None:
+    for i in range(n):
+        writer.write_point("t", "results:update", {"p": float(i), "pout": 2.0 * i, "g.mag": [0.5],
+                                                   "g.ang": [0.1 * i], "big": list(range(500))})
+
+
+def test_panel_keys() -> None:
+    assert panel_keys(LAYOUT) == ["p", "pout", "g.ang", "g.mag"]
+
+
+def test_inline_backend_rate_limits_and_keeps_all_points(tmp_path: Path) -> None:
+    writer = LivePlotWriter(tmp_path / "results.jsonl", {**LAYOUT, "backend": "inline", "fps": 1})
+    t0 = time.monotonic()
+    _write(writer, 50)
+    assert time.monotonic() - t0 < 5  # no per-point pause
+    writer.snapshot("mid")
+    panel = writer.renderer.panels[0]
+    assert panel.x_vals == [float(i) for i in range(50)]
+    assert list(panel.lines[0].get_xdata()) == panel.x_vals
+    writer.close()
+    assert (tmp_path / "results_mid.png").exists()
+    assert (tmp_path / "results.png").exists()
+    assert len((tmp_path / "results.jsonl").read_text().splitlines()) == 50
+
+
+def test_process_backend_does_not_block(tmp_path: Path) -> None:
+    writer = LivePlotWriter(tmp_path / "results.jsonl", {**LAYOUT, "queue_size": 2})
+    t0 = time.monotonic()
+    _write(writer, 200)
+    assert time.monotonic() - t0 < 2
+    writer.snapshot("mid")
+    writer.close()
+    assert (tmp_path / "results_mid.png").exists()
+    assert (tmp_path / "results.png").exists()
+    recs = [json.loads(l) for l in (tmp_path / "results.jsonl").read_text().splitlines()]
+    assert [r["p"] for r in recs] == [float(i) for i in range(200)]
+
+
+def test_control_messages_never_wait_for_a_stalled_renderer(tmp_path: Path) -> None:
+    writer = LivePlotWriter(tmp_path / "results.jsonl", {**LAYOUT, "backend": "inline"})
+    writer.renderer = None
+    writer._proc = object()  # stands in for a plot process that stopped reading
+    writer._inbox = queue.Queue(maxsize=1)
+    writer._inbox.put(("points", []))
+    t0 = time.monotonic()
+    _write(writer, 3)
+    writer.snapshot("a")
+    _write(writer, 2)
+    writer.reset()
+    writer.reset()
+    assert time.monotonic() - t0 < 1
+    assert [m[0] for m in writer._outbox] == ["points", "snapshot", "reset"]
+    assert len(writer._outbox[0][1]) == 3
+    writer._proc = None
+    writer.close()
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from loadpull.core.transforms import default_registry
+from loadpull.core.transforms import utils
+
+
+def _write(path, rows) -> None:
+    path.write_text("mag,deg,real,imag\n" + "".join(f"{m},{d},,\n" for m, d in rows))
+
+
+def test_table_is_parsed_once(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "sweep.csv"
+    _write(path, [(0.1 * i, 10 * i) for i in range(20)])
+    reg = default_registry()
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **k: opened.append(a[0]) or real_open(*a, **k))
+    count = reg.apply("loadpull_sweep_len", {"file": str(path)}, {})["count"]
+    points = [reg.apply("loadpull_sweep_point", {"file": str(path), "index": i}, {})
+              for i in range(count + 1)]
+    assert len(opened) == 1
+    assert points[3] == {"gamma_mag": pytest.approx(0.3), "gamma_deg": 30.0, "orig_index": 3}
+
+
+def test_table_reloads_when_file_changes(tmp_path) -> None:
+    path = tmp_path / "sweep.csv"
+    _write(path, [(0.1, 0.0)])
+    assert len(utils._sweep_table(str(path))) == 1
+    _write(path, [(0.1, 0.0), (0.2, 90.0)])
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    table = utils._sweep_table(str(path))
+    assert len(table) == 2
+    assert table["imag"][1] == pytest.approx(0.2)
+    assert not table.flags.writeable
+
+
+def test_sweep_table_transform(tmp_path) -> None:
+    path = tmp_path / "sweep.csv"
+    path.write_text("mag,deg,real,imag\n0.1,0,0.1,0\nbad,row,,\n0.2,90,0,0.2\n")
+    out = default_registry().apply("loadpull_sweep_table", {"file": str(path), "order": [1, 0]}, {})
+    assert out["count"] == 1 and out["mag"] == [0.1, 0.2]
+    assert [p["orig_index"] for p in out["points"]] == [1, 0]
@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from loadpull.core.calibration import CalibrationStore
+from loadpull.core.reprocess import cal_at, reprocess_run, transform_stages
+from loadpull.core.results import DeltaJsonlWriter, DualWriter, JsonlWriter, iter_records
+from loadpull.core.sequencing import Context, Sequence
+from loadpull.core.transforms import TransformRegistry
+
+
+class Meter:
+    def read(self, p: float) -> float:
+        return p * 2
+
+
+def _registry(calls: list) -> TransformRegistry:
+    reg = TransformRegistry()
+
+    def scale(payload: dict, cal: dict) -> dict:
+        calls.append("scale")
+        if payload["x"] < 0:
+            raise ValueError("negative reading")
+        return {"value": payload["x"] * payload["gain"]}
+
+    def offset(payload: dict, cal: dict) -> dict:
+        calls.append("offset")
+        return {"value": payload["v"] + cal["offset"]}
+
+    reg.register("scale", scale)
+    reg.register("offset", offset)
+    return reg
+
+
+SPEC = {"name": "rp", "steps": [
+    {"sweep": {"var": "p", "values": [1.0, 2.0, 3.0], "do": [
+        {"measure": {"inst": "M", "method": "read", "args": ["${p}"], "save_as": "raw"}},
+        {"transform": {"method": "scale", "args": {"x": "${raw}", "gain": "${cal.gain}"},
+                       "save_as": "scaled"}},
+        {"transform": {"method": "offset", "args": {"v": "${scaled.value}"}, "save_as": "corr"}},
+        {"results_update": {}},
+    ]}},
+    {"calibrate": {"name": "c", "save": 1,
+                   "do": [{"transform": {"method": "scale", "args": {}, "save_as": "x"}}]}},
+]}
+
+
+def _record(run: Path, log_writer=None) -> None:
+    cal = {"gain": 10.0, "offset": 1.0}
+    writer = DualWriter(log_writer or JsonlWriter(run / "log.jsonl"),
+                        JsonlWriter(run / "results.jsonl"))
+    reg = _registry([])
+    ctx = Context(instruments={"M": Meter()}, writer=writer, cal_store=None, cal_cache=cal,
+                  transform=reg.apply)
+    spec = {**SPEC, "steps": SPEC["steps"][:1]}
+    Sequence("rp", spec).run(ctx)
+    writer.close()
+
+
+def test_stages_follow_spec_order_and_skip_calibration() -> None:
+    stages = transform_stages(SPEC)
+    assert [(s.method, s.save_as) for s in stages] == [("scale", "scaled"), ("offset", "corr")]
+    assert [s.method for s in transform_stages(SPEC, ["offset"])] == ["offset"]
+
+
+def test_reprocess_results_with_new_cal_chains_and_batches(tmp_path: Path) -> None:
+    _record(tmp_path)
+    calls: list = []
+    summary = reprocess_run(tmp_path, SPEC, _registry(calls).apply_many,
+                            {"gain": 100.0, "offset": 0.5}, batch_size=2)
+    rows = list(iter_records(tmp_path / "derived.jsonl"))
+    assert [r["corr.value"] for r in rows] == [200.5, 400.5, 600.5]
+    assert [r["raw"] for r in rows] == [2.0, 4.0, 6.0]
+    assert rows[0]["step"] == "results:update"
+    assert summary["records"] == 3 and summary["transformed"] == 6 and summary["errors"] == 0
+    # Stages run batch by batch: both scale calls of a batch come before its offset calls
+    assert calls == ["scale", "scale", "offset", "offset", "scale", "offset"]
+
+
+def test_reprocess_failed_payloads_keep_recorded_values(tmp_path: Path) -> None:
+    head = {"schema": "1.0.0", "ts": "t", "test": "rp", "step": "results:update"}
+    (tmp_path / "results.jsonl").write_text("".join(json.dumps(r) + "\n" for r in [
+        {**head, "raw": 1.0, "scaled.value": 10.0},
+        {**head, "raw": -1.0, "scaled.value": -10.0},
+    ]))
+    summary = reprocess_run(tmp_path, SPEC, _registry([]).apply_many, {"gain": 2.0, "offset": 0.0},
+                            methods=["scale"])
+    rows = list(iter_records(tmp_path / "derived.jsonl"))
+    assert [r["scaled.value"] for r in rows] == [2.0, -10.0]
+    assert summary["errors"] == 1
+
+
+def test_reprocess_delta_log(tmp_path: Path) -> None:
+    _record(tmp_path, DeltaJsonlWriter(tmp_path / "log.jsonl"))
+    reprocess_run(tmp_path, SPEC, _registry([]).apply_many, {"gain": 1.0, "offset": 0.0},
+                  source="log")
+    rows = [r for r in iter_records(tmp_path / "derived_log.jsonl")
+            if r["step"] == "transform:offset"]
+    assert [r["corr.value"] for r in rows] == [2.0, 4.0, 6.0]
+    with pytest.raises(ValueError):
+        reprocess_run(tmp_path, SPEC, _registry([]).apply_many, {}, source="log",
+                      out=tmp_path / "log.jsonl")
+
+
+def test_cal_at_picks_value_in_effect(tmp_path: Path) -> None:
+    store = CalibrationStore(tmp_path / "cal.json", bench_name="b")
+    store.set("gain", 1.0)
+    store._history_root()["gain"] = [{"ts": "2025-01-01T00:00:00Z", "value": 0.5}]
+    store.set("gain", 2.0)  # archives 1.0 now
+    assert cal_at(store)["gain"] == 2.0
+    assert cal_at(store, "2024-06-01T00:00:00Z")["gain"] == 0.5
+    assert cal_at(store, "2025-06-01T00:00:00Z")["gain"] == 1.0
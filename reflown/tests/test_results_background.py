@@ -0,0 +1,88 @@
+import gzip
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from loadpull.core.results import BackgroundWriter, JsonlWriter, iter_records, open_log_writer
+from loadpull.core.sequencing import Context, Sequence
+
+
+class SlowWriter(JsonlWriter):
+    """JsonlWriter whose writes block until released, like a stalled network share."""
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.release = threading.Event()
+        self.flushes = 0
+
+    def write_point(self, test, step, data, ts=None):
+        self.release.wait(5)
+        super().write_point(test, step, data, ts)
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def test_caller_does_not_wait_on_disk_and_close_drains(tmp_path: Path) -> None:
+    inner = SlowWriter(tmp_path / "log.jsonl")
+    w = BackgroundWriter(inner, queue_size=8)
+    for i in range(5):
+        w.write_point("t", "s", {"i": i})  # returns although the disk is "stuck"
+    assert (tmp_path / "log.jsonl").read_text() == ""
+    inner.release.set()
+    w.close()
+    assert [r["i"] for r in iter_records(tmp_path / "log.jsonl")] == list(range(5))
+    assert w.stalls == 0
+
+
+def test_full_queue_applies_backpressure(tmp_path: Path) -> None:
+    inner = SlowWriter(tmp_path / "log.jsonl")
+    w = BackgroundWriter(inner, queue_size=2)
+    threading.Timer(0.2, inner.release.set).start()
+    for i in range(6):
+        w.write_point("t", "s", {"i": i})
+    w.close()
+    assert w.stalls > 0
+    assert len(list(iter_records(tmp_path / "log.jsonl"))) == 6
+
+
+def test_flush_every_and_gzip(tmp_path: Path) -> None:
+    w = open_log_writer(tmp_path / "log.jsonl.gz", {"background": True, "flush_every": 3})
+    for i in range(7):
+        w.write_point("t", "s", {"i": i})
+    w.flush()
+    w.close()
+    with gzip.open(tmp_path / "log.jsonl.gz", "rt") as fp:
+        assert [json.loads(line)["i"] for line in fp] == list(range(7))
+
+
+def test_writer_errors_surface_on_caller(tmp_path: Path) -> None:
+    w = BackgroundWriter(JsonlWriter(tmp_path / "log.jsonl"))
+    w.write_point("t", "s", {"bad": object()})
+    with pytest.raises(RuntimeError):
+        w.flush()
+    w.close()
+
+
+class Src:
+    def read(self) -> float:
+        return 1.0
+
+
+def test_sweep_boundary_flushes(tmp_path: Path) -> None:
+    inner = SlowWriter(tmp_path / "log.jsonl", flush_every=1000)
+    inner.release.set()
+    w = BackgroundWriter(inner)
+    spec = {"name": "bg", "steps": [
+        {"sweep": {"var": "p", "from": 0, "to": 1, "step": 1,
+                   "do": [{"measure": {"inst": "S", "method": "read"}}]}},
+    ]}
+    ctx = Context(instruments={"S": Src()}, writer=w, cal_store=None, cal_cache={})
+    Sequence(spec["name"], spec).run(ctx)
+    w.flush()
+    assert inner.flushes >= 2
+    w.close()
+    assert len(list(iter_records(tmp_path / "log.jsonl"))) == 2
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from loadpull.core.results import DeltaJsonlWriter, JsonlWriter, iter_records
+from loadpull.core.sequencing import Context, Sequence
+
+
+def _records() -> list[tuple[str, dict]]:
+    wave = np.linspace(0, 1, 201)
+    terms = list(range(100))
+    recs = []
+    for i in range(5):
+        env = {"p": float(i), "wave.a1": wave, "cal.terms": terms}
+        if i == 3:
+            wave = wave * 2  # new trace -> new snapshot
+            env["wave.a1"] = wave
+        recs.append(("call:set_power", {"inst": "VNA", "result": 1, **env}))
+        recs.append(("measure:read", {"inst": "VNA", "read": i * 0.5, **env}))
+    return recs
+
+
+def test_delta_log_round_trips_and_shrinks(tmp_path: Path) -> None:
+    full, delta = tmp_path / "full.jsonl", tmp_path / "delta.jsonl"
+    w_full, w_delta = JsonlWriter(full), DeltaJsonlWriter(delta)
+    for step, data in _records():
+        w_full.write_point("t", step, data)
+        w_delta.write_point("t", step, data)
+    w_full.close()
+    w_delta.close()
+
+    expected = [json.loads(line) for line in full.read_text().splitlines()]
+    got = list(iter_records(delta))
+    for e, g in zip(expected, got):
+        e.pop("ts"), g.pop("ts")
+    assert got == expected
+    assert delta.stat().st_size * 4 < full.stat().st_size
+    snaps = [json.loads(l) for l in delta.read_text().splitlines() if '"rec": "snap"' in l]
+    assert len(snaps) == 2
+
+
+def test_appended_sessions_reset_state(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    for value in (1, 2):
+        w = DeltaJsonlWriter(path)
+        w.write_point("t", "a", {"x": value, "only_first": value} if value == 1 else {"x": value})
+        w.close()
+    recs = list(iter_records(path))
+    assert [r.get("only_first") for r in recs] == [1, None]
+    assert [r["x"] for r in recs] == [1, 2]
+
+
+class Source:
+    def read(self) -> list:
+        return list(range(200))
+
+
+def test_sequence_log_reconstructs(tmp_path: Path) -> None:
+    spec = {
+        "name": "delta",
+        "steps": [
+            {"measure": {"inst": "SRC", "method": "read", "save_as": "trace"}},
+            {"sweep": {"var": "p", "from": 0, "to": 3, "step": 1, "do": [
+                {"call": {"inst": "SRC", "method": "read"}},
+            ]}},
+        ],
+    }
+    writer = DeltaJsonlWriter(tmp_path / "log.jsonl")
+    ctx = Context(instruments={"SRC": Source()}, writer=writer, cal_store=None, cal_cache={})
+    Sequence(spec["name"], spec).run(ctx)
+    writer.close()
+    recs = list(iter_records(tmp_path / "log.jsonl"))
+    assert [r["step"] for r in recs] == ["measure:read"] + ["call:read"] * 4
+    assert all(r["trace"] == list(range(200)) for r in recs)
+    assert [r["p"] for r in recs[1:]] == [0.0, 1.0, 2.0, 3.0]
+    assert "p" not in recs[0]
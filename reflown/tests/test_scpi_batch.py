@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from loadpull.core.results import JsonlWriter
+from loadpull.core.scpi import Scpi
+from loadpull.core.sequencing import Context, Sequence
+from loadpull.core.transport import FakeTransport
+from loadpull.instruments.base import Instrument
+
+
+def _scpi(responses: list[str] | None = None, **kwargs) -> tuple[Scpi, FakeTransport]:
+    ft = FakeTransport(responses=responses or [])
+    ft.open()
+    return Scpi(ft, err_poll=False, **kwargs), ft
+
+
+def test_batch_joins_writes_into_compound_command() -> None:
+    scpi, ft = _scpi()
+    with scpi.batch():
+        scpi.write("SENS1:FREQ:STAR 1e9")
+        scpi.write("SENS1:FREQ:STOP 1e9")
+        scpi.write("*WAI")
+        assert ft.writes == []
+    assert ft.writes == ["SENS1:FREQ:STAR 1e9;:SENS1:FREQ:STOP 1e9;*WAI"]
+
+
+def test_batch_respects_buffer_limit_and_flushes_before_query() -> None:
+    scpi, ft = _scpi(["1"], batch_limit=20)
+    with scpi.batch():
+        scpi.write("SOUR1:POW -10")
+        scpi.write("SOUR1:POW -5")
+        scpi.write("INIT1:CONT OFF")
+        assert scpi.query("*OPC?") == "1"
+        scpi.write("INIT1:CONT ON")
+    assert ft.writes == ["SOUR1:POW -10", "SOUR1:POW -5", "INIT1:CONT OFF", "*OPC?",
+                         "INIT1:CONT ON"]
+
+
+class FakeVNA(Instrument):
+    def set_power(self, p: float) -> int:
+        self.scpi.write(f"SOUR1:POW {p}")
+        return 1
+
+    def set_points(self, n: int) -> int:
+        self.scpi.write(f"SENS1:SWE:POIN {n}")
+        return 1
+
+
+def test_sequencer_batch_action(tmp_path: Path) -> None:
+    scpi, ft = _scpi()
+    spec = {
+        "name": "batch",
+        "steps": [
+            {"batch": {"do": [
+                {"call": {"inst": "VNA", "method": "set_power", "args": [-10]}},
+                {"call": {"inst": "VNA", "method": "set_points", "args": [201]}},
+            ]}},
+            {"call": {"inst": "VNA", "method": "set_power", "args": [0]}},
+        ],
+    }
+    writer = JsonlWriter(tmp_path / "out.jsonl")
+    ctx = Context(instruments={"VNA": FakeVNA(scpi)},  # type: ignore[arg-type]
+                  writer=writer, cal_store=None, cal_cache={})
+    Sequence(spec["name"], spec).run(ctx)
+    writer.close()
+    assert ft.writes == ["SOUR1:POW -10;:SENS1:SWE:POIN 201", "SOUR1:POW 0"]
@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import pytest
+
+from loadpull.core.results import JsonlWriter
+from loadpull.core.scpi import Scpi, ScpiError
+from loadpull.core.sequencing import Context, Sequence
+from loadpull.core.transport import FakeTransport
+from loadpull.instruments.base import Instrument
+
+
+def _scpi(responses: list[str], policy: str) -> tuple[Scpi, FakeTransport]:
+    ft = FakeTransport(responses=responses)
+    ft.open()
+    return Scpi(ft, err_policy=policy), ft
+
+
+def test_query_policy_polls_after_every_query() -> None:
+    scpi, ft = _scpi(["1", "0,No error"], "query")
+    assert scpi.query("*OPC?") == "1"
+    assert ft.writes == ["*OPC?", "SYST:ERR?"]
+
+
+def test_piggyback_policy_uses_one_round_trip() -> None:
+    scpi, ft = _scpi(["1;0,No error"], "piggyback")
+    assert scpi.query("*OPC?") == "1"
+    assert ft.writes == ["*OPC?;:SYST:ERR?"]
+
+
+def test_piggyback_policy_attributes_pending_writes() -> None:
+    scpi, _ = _scpi(["1;-113,Undefined header", "0,No error"], "piggyback")
+    scpi.write("BAD:CMD")
+    with pytest.raises(ScpiError) as exc:
+        scpi.query("*OPC?")
+    assert exc.value.commands == ["BAD:CMD", "*OPC?"]
+    assert exc.value.errors == ["-113,Undefined header"]
+
+
+def test_manual_policy_defers_and_drains_queue() -> None:
+    scpi, ft = _scpi(["1", "2", "-222,Data out of range", "-113,Undefined header", "0,No error"],
+                     "manual")
+    scpi.query("*OPC?")
+    scpi.query("READ?")
+    assert "SYST:ERR?" not in ft.writes
+    with pytest.raises(ScpiError) as exc:
+        scpi.check_errors()
+    assert exc.value.commands == ["*OPC?", "READ?"]
+    assert len(exc.value.errors) == 2
+    assert not scpi.pending_check
+
+
+class FakeDMM(Instrument):
+    def read(self) -> float:
+        return float(self.scpi.query("READ?"))
+
+
+SPEC = {
+    "name": "err_policy",
+    "steps": [
+        {"sweep": {"var": "i", "from": 0, "to": 1, "step": 1, "do": [
+            {"measure": {"inst": "DMM", "method": "read", "save_as": "v"}},
+            {"measure": {"inst": "DMM", "method": "read", "save_as": "w"}},
+        ]}},
+    ],
+}
+
+
+@pytest.mark.parametrize("policy, polls", [("action", 4), ("point", 2)])
+def test_sequencer_drains_errors_at_boundaries(tmp_path: Path, policy: str, polls: int) -> None:
+    responses = []
+    for _ in range(2):
+        if policy == "action":
+            responses += ["1.0", "0,No error", "2.0", "0,No error"]
+        else:
+            responses += ["1.0", "2.0", "0,No error"]
+    scpi, ft = _scpi(responses, policy)
+    writer = JsonlWriter(tmp_path / "out.jsonl")
+    ctx = Context(instruments={"DMM": FakeDMM(scpi)},  # type: ignore[arg-type]
+                  writer=writer, cal_store=None, cal_cache={})
+    Sequence(SPEC["name"], SPEC).run(ctx)
+    writer.close()
+    # action: one drain per measure; point: one per sweep point
+    assert ft.writes.count("SYST:ERR?") == polls
+
+
+def test_piggyback_keeps_semicolons_inside_error_message() -> None:
+    scpi, _ = _scpi(['1.5;-222,"Data out of range;SOUR:POW 100"', "0,No error"], "piggyback")
+    with pytest.raises(ScpiError) as exc:
+        scpi.query("SOUR:POW?")
+    assert exc.value.errors == ['-222,"Data out of range;SOUR:POW 100"']
+
+
+def test_piggyback_splits_compound_response() -> None:
+    scpi, _ = _scpi(['1;2;+0,"No error"'], "piggyback")
+    assert scpi.query("A?;B?") == "1;2"
+
+
+def test_manual_policy_caps_unchecked_commands() -> None:
+    scpi, _ = _scpi(["0,No error"], "manual")
+    for i in range(scpi.max_unchecked + 10):
+        scpi.write(f"CMD {i}")
+    assert len(scpi._unchecked) == scpi.max_unchecked
+    assert scpi._unchecked[-1] == f"CMD {scpi.max_unchecked + 9}"
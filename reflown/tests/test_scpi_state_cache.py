@@ -0,0 +1,93 @@
+import pytest
+
+from loadpull.core.scpi import Scpi, ScpiError
+from loadpull.core.transport import FakeTransport
+from loadpull.instruments.Keysight_34400 import Keysight34400
+from loadpull.instruments.rohdeschwarz_ZVA import RSZVA
+
+
+def _scpi(responses: list[str] | None = None, **kwargs) -> tuple[Scpi, FakeTransport]:
+    ft = FakeTransport(responses=responses or [])
+    ft.open()
+    return Scpi(ft, err_poll=False, state_cache=True, **kwargs), ft
+
+
+def test_unchanged_settings_are_skipped() -> None:
+    scpi, ft = _scpi()
+    vna = RSZVA(scpi)
+    vna.set_power(-10)
+    vna.set_power(-10.0)
+    vna.set_points(1)
+    vna.set_points(1)
+    vna.set_power(-5)
+    assert ft.writes == ["SOUR1:POW -10", "SENS1:SWE:POIN 1", "SOUR1:POW -5"]
+    assert vna.state_cache_stats() == {"hits": 2, "misses": 3, "entries": 2}
+
+
+def test_cache_disabled_by_default() -> None:
+    ft = FakeTransport(responses=[])
+    ft.open()
+    vna = RSZVA(Scpi(ft, err_poll=False))
+    vna.set_power(-10)
+    vna.set_power(-10)
+    assert ft.writes == ["SOUR1:POW -10", "SOUR1:POW -10"]
+
+
+def test_frequency_settings_share_one_entry() -> None:
+    scpi, ft = _scpi()
+    vna = RSZVA(scpi)
+    vna.set_freq_fixed(2, "GHz")
+    vna.set_freq_fixed(2e9)
+    vna.set_freq_center(3e9)
+    vna.set_freq_fixed(2e9)
+    assert ft.writes == [
+        "SENS1:FREQ:STAR 2000000000.0;:SENS1:FREQ:STOP 2000000000.0",
+        "SENS1:FREQ:CENT 3000000000.0",
+        "SENS1:FREQ:STAR 2000000000.0;:SENS1:FREQ:STOP 2000000000.0",
+    ]
+
+
+def test_raw_writes_and_resets_invalidate() -> None:
+    scpi, ft = _scpi()
+    vna = RSZVA(scpi)
+    vna.set_atten(10, port=4)
+    scpi.write("POW:ATT 4, 20")  # raw write to the same node
+    vna.set_atten(10, port=4)
+    vna.set_continuous(False)
+    vna.preset()
+    vna.set_continuous(False)
+    vna.set_atten(10, port=4)
+    assert ft.writes.count("POW:ATT 4, 10") == 3
+    assert ft.writes.count("INIT1:CONT OFF") == 2
+
+
+def test_dmm_function_selection_is_one_setting() -> None:
+    scpi, ft = _scpi(["1.0", "2.0", "3.0"])
+    dmm = Keysight34400(scpi)
+    dmm.measure_resistance(four_wire=True)
+    dmm.measure_resistance(four_wire=True)
+    dmm.configure_resistance()
+    assert [w for w in ft.writes if w.startswith("CONF")] == ["CONF:FRES", "CONF:RES"]
+
+
+def test_scpi_error_clears_cache() -> None:
+    scpi, ft = _scpi(['-222,"Data out of range"', '0,"No error"'])
+    scpi.err_poll = True
+    scpi.err_policy = "manual"
+    scpi.write_setting("SOUR1:POW", 50)
+    with pytest.raises(ScpiError):
+        scpi.check_errors()
+    assert scpi.write_setting("SOUR1:POW", 50) is True
+    assert ft.writes.count("SOUR1:POW 50") == 2
+
+
+def test_dmm_function_change_invalidates_sense_settings() -> None:
+    scpi, ft = _scpi()
+    dmm = Keysight34400(scpi)
+    dmm.configure_resistance()
+    dmm.set_low_power_mode(True)
+    dmm.set_low_power_mode(True)
+    dmm.configure_voltage_dc()
+    dmm.configure_resistance()
+    dmm.set_low_power_mode(True)
+    assert ft.writes.count("SENS:RES:POW:LIM:STATE ON") == 2
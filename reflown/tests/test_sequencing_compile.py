@@ -0,0 +1,124 @@
+from pathlib import Path
+
+import pytest
+
+from loadpull.core.results import JsonlWriter
+from loadpull.core.sequencing import CallNode, Context, Env, Sequence, SweepNode, _flat_env
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def set_power(self, p: float, extra: dict | None = None) -> int:
+        self.calls.append(("set_power", p, extra))
+        return 1
+
+    def read(self) -> dict:
+        return {"v": len(self.calls)}
+
+
+def _ctx(tmp_path: Path, inst: Recorder) -> Context:
+    return Context(
+        instruments={"SRC": inst},
+        writer=JsonlWriter(tmp_path / "out.jsonl"),
+        cal_store=None,
+        cal_cache={"pwr": {"offset": 0.5}},
+    )
+
+
+def test_compile_binds_methods_and_templates(tmp_path: Path) -> None:
+    inst = Recorder()
+    spec = {
+        "name": "compiled",
+        "steps": [
+            {
+                "sweep": {
+                    "var": "p",
+                    "from": 0,
+                    "to": 2,
+                    "step": 1,
+                    "do": [
+                        {"call": {"inst": "SRC", "method": "set_power",
+                                  "args": ["${p}", {"off": "${cal.pwr.offset}", "tag": "x"}]}},
+                        {"measure": {"inst": "SRC", "method": "read", "save_as": "meas.last"}},
+                    ],
+                }
+            }
+        ],
+    }
+    ctx = _ctx(tmp_path, inst)
+    plan = Sequence(spec["name"], spec).compile(ctx)
+    sweep = plan.steps[0]
+    assert isinstance(sweep, SweepNode)
+    assert isinstance(sweep.body[0], CallNode)
+    assert sweep.body[0].method == inst.set_power
+
+    env: dict = {}
+    plan.run(ctx, env)
+    ctx.writer.close()
+    assert [c[1] for c in inst.calls] == [0.0, 1.0, 2.0]
+    assert inst.calls[0][2] == {"off": 0.5, "tag": "x"}
+    assert env["meas"]["last"] == {"v": 3}
+
+
+@pytest.mark.parametrize(
+    "step",
+    [
+        {"call": {"inst": "DMM", "method": "read"}},
+        {"call": {"inst": "SRC", "method": "missing"}},
+        {"sweep": {"var": "p", "from": 0, "to": 1}},
+        {"calibrate": {"name": "c", "do": []}},
+        {"bogus": {}},
+    ],
+)
+def test_structural_errors_surface_before_any_step(tmp_path: Path, step: dict) -> None:
+    inst = Recorder()
+    spec = {
+        "name": "bad",
+        "steps": [{"call": {"inst": "SRC", "method": "set_power", "args": [1]}}, step],
+    }
+    ctx = _ctx(tmp_path, inst)
+    ctx.fail_policy = "continue"
+    with pytest.raises(ValueError):
+        Sequence(spec["name"], spec).run(ctx)
+    ctx.writer.close()
+    assert inst.calls == []
+
+
+def test_env_flat_view_tracks_assignments() -> None:
+    env = Env({"freq": 1.0, "cal": {"a": 1}})
+    mark = env.rev
+    env["p"] = -10.0
+    env.assign(["meas", "wave"], {"a1": [1, 2], "b1": {"re": 0.1}})
+    env.assign(["cal"], 3)
+    env.assign(["meas", "wave"], {"a1": [3]})
+    assert env.flat == _flat_env(env)
+    assert list(env.flat) == ["freq", "p", "cal", "meas.wave.a1"]
+    changed, removed = env.delta(mark)
+    assert changed == {"p": -10.0, "cal": 3, "meas.wave.a1": [3]}
+    assert sorted(removed) == ["cal.a", "meas.wave.b1.re"]
+
+    cal_env = env.copy()
+    cal_env["p"] = 0.0
+    cal_env.assign(["meas", "wave", "b2"], 1)
+    assert env["p"] == -10.0 and env.flat["p"] == -10.0
+    assert env["meas"]["wave"] == {"a1": [3]}
+
+
+def test_env_dict_methods_update_flat_view() -> None:
+    data = {"meas": {"a": 1}, "p": 0.0}
+    env = Env(data)
+    env.assign(["meas", "b"], 2)
+    assert data == {"meas": {"a": 1}, "p": 0.0}
+    mark = env.rev
+    env.update({"p": 1.0}, q=2)
+    assert env.setdefault("r", {"s": 3}) == {"s": 3}
+    assert env.pop("meas") == {"a": 1, "b": 2}
+    assert env.pop("missing", None) is None
+    assert env.flat == _flat_env(env)
+    changed, removed = env.delta(mark)
+    assert changed == {"p": 1.0, "q": 2, "r.s": 3}
+    assert sorted(removed) == ["meas.a", "meas.b"]
+    env.clear()
+    assert env.flat == {} and not env
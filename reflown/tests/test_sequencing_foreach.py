@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from loadpull.core.results import JsonlWriter
+from loadpull.core.sequencing import Context, ForeachNode, Sequence
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def set(self, *args) -> None:
+        self.calls.append(args)
+
+
+def _run(tmp_path: Path, steps: list, env: dict | None = None) -> tuple[Recorder, object]:
+    inst = Recorder()
+    ctx = Context(instruments={"INST": inst}, writer=JsonlWriter(tmp_path / "out.jsonl"),
+                  cal_store=None, cal_cache={})
+    plan = Sequence("foreach", {"steps": steps}).compile(ctx)
+    plan.run(ctx, env or {})
+    ctx.writer.close()
+    return inst, plan
+
+
+def _set(*args: str) -> list:
+    return [{"call": {"inst": "INST", "method": "set", "args": list(args)}}]
+
+
+def test_values_list_and_env_array(tmp_path: Path) -> None:
+    steps = [
+        {"sweep": {"var": "v", "values": [1, "${a}", 3], "do": _set("${v}")}},
+        {"foreach": {"var": "p", "in": "${points}", "do": _set("${p.mag}")}},
+    ]
+    inst, plan = _run(tmp_path, steps, {"a": 2, "points": [{"mag": 0.1}, {"mag": 0.2}]})
+    assert isinstance(plan.steps[0], ForeachNode)
+    assert inst.calls == [(1,), (2,), (3,), (0.1,), (0.2,)]
+
+
+def test_csv_and_npy_files(tmp_path: Path) -> None:
+    csv_path = tmp_path / "sweep.csv"
+    csv_path.write_text("mag,deg,tag\n0.1,0,a\n0.2,90,b\n")
+    npy_path = tmp_path / "bias.npy"
+    np.save(npy_path, np.array([1.5, 2.5]))
+    steps = [
+        {"foreach": {"var": "pt", "in": str(csv_path), "do": _set("${pt.deg}", "${pt.tag}")}},
+        {"foreach": {"var": "m", "in": {"file": str(csv_path), "column": "mag"},
+                     "do": _set("${m}")}},
+        {"foreach": {"var": "b", "in": str(npy_path), "do": _set("${b}")}},
+    ]
+    inst, _ = _run(tmp_path, steps)
+    assert inst.calls == [(0.0, "a"), (90.0, "b"), (0.1,), (0.2,), (1.5,), (2.5,)]
+
+
+def test_product_nests_in_spec_order(tmp_path: Path) -> None:
+    steps = [{"sweep": {
+        "product": {"bias": [3.0, 3.3], "pin": {"from": -2, "to": 0, "step": 2}},
+        "do": [{"call": {"inst": "INST", "method": "set", "args": ["${bias}", "${pin}"]}}],
+    }}]
+    inst, _ = _run(tmp_path, steps)
+    assert inst.calls == [(3.0, -2.0), (3.0, 0.0), (3.3, -2.0), (3.3, 0.0)]
+
+
+def test_product_inner_source_sees_outer_var(tmp_path: Path) -> None:
+    steps = [{"foreach": {
+        "product": {"row": "${grid}", "col": "${row}"},
+        "do": [{"call": {"inst": "INST", "method": "set", "args": ["${col}"]}}],
+    }}]
+    inst, _ = _run(tmp_path, steps, {"grid": [[1, 2], [3]]})
+    assert inst.calls == [(1,), (2,), (3,)]
+
+
+def test_zip_walks_in_lockstep_and_checks_lengths(tmp_path: Path) -> None:
+    steps = [{"foreach": {
+        "zip": {"a": [1, 2], "b": ["x", "y"]},
+        "do": [{"call": {"inst": "INST", "method": "set", "args": ["${a}", "${b}"]}}],
+    }}]
+    inst, _ = _run(tmp_path, steps)
+    assert inst.calls == [(1, "x"), (2, "y")]
+    steps[0]["foreach"]["zip"]["b"] = ["x"]
+    with pytest.raises(ValueError):
+        _run(tmp_path, steps)
+
+
+def test_bad_source_fails(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        _run(tmp_path, [{"foreach": {"var": "v", "in": "${missing}", "do": []}}])
+    with pytest.raises(ValueError):
+        _run(tmp_path, [{"foreach": {"zip": [1, 2], "do": []}}])
@@ -0,0 +1,122 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from loadpull.core.results import JsonlWriter
+from loadpull.core.sequencing import Context, ParallelNode, Sequence
+
+
+class SlowInst:
+    """Instrument whose reads take a while and which detects concurrent use."""
+
+    def __init__(self, value: float, delay: float = 0.1):
+        self.value = value
+        self.delay = delay
+        self.busy = threading.Lock()
+        self.threads: set[str] = set()
+
+    def read(self) -> float:
+        if not self.busy.acquire(blocking=False):
+            raise AssertionError("driven from two threads at once")
+        try:
+            self.threads.add(threading.current_thread().name)
+            time.sleep(self.delay)
+            return self.value
+        finally:
+            self.busy.release()
+
+    def boom(self) -> None:
+        raise RuntimeError("boom")
+
+
+class Writer(JsonlWriter):
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.steps: list[str] = []
+
+    def write_point(self, test_name, step, payload, ts=None) -> None:
+        self.steps.append(f"{step}:{payload.get('inst')}")
+        super().write_point(test_name, step, payload)
+
+
+def _ctx(tmp_path: Path, **insts) -> Context:
+    return Context(instruments=insts, writer=Writer(tmp_path / "log.jsonl"), cal_store=None,
+                   cal_cache={})
+
+
+def _measure(inst: str, save_as: str, method: str = "read") -> dict:
+    return {"measure": {"inst": inst, "method": method, "save_as": save_as}}
+
+
+def test_lanes_run_concurrently_and_merge_in_spec_order(tmp_path: Path) -> None:
+    ctx = _ctx(tmp_path, DMM1=SlowInst(1.0), DMM2=SlowInst(2.0), BIAS=SlowInst(3.0))
+    spec = {"steps": [{"parallel": {"do": [
+        _measure("DMM1", "v.dmm1"),
+        _measure("DMM2", "v.dmm2"),
+        _measure("BIAS", "v.bias"),
+        _measure("DMM1", "v.dmm1_again"),
+    ]}}]}
+    plan = Sequence("par", spec).compile(ctx)
+    node = plan.steps[0]
+    assert isinstance(node, ParallelNode)
+    assert node.instruments == [["DMM1"], ["DMM2"], ["BIAS"]]
+
+    t0 = time.perf_counter()
+    env = plan.run(ctx, {})
+    elapsed = time.perf_counter() - t0
+    ctx.writer.close()
+    assert elapsed < 0.3  # 4 reads of 0.1 s, DMM1 twice in its lane
+    assert env["v"] == {"dmm1": 1.0, "dmm2": 2.0, "bias": 3.0, "dmm1_again": 1.0}
+    assert ctx.writer.steps == ["measure:read:DMM1", "measure:read:DMM1", "measure:read:DMM2",
+                                "measure:read:BIAS"]
+    assert len(ctx.instruments["DMM1"].threads) == 1
+
+
+def test_shared_transport_shares_a_lane(tmp_path: Path) -> None:
+    class Wrapped(SlowInst):
+        def __init__(self, scpi):
+            super().__init__(0.0, delay=0.0)
+            self.scpi = scpi
+
+    class Scpi:
+        t = object()
+
+    shared = Scpi()
+    ctx = _ctx(tmp_path, A=Wrapped(shared), B=Wrapped(shared), C=SlowInst(0.0, 0.0))
+    spec = {"steps": [{"parallel": [_measure("A", "a"), _measure("C", "c"), _measure("B", "b")]}]}
+    node = Sequence("par", spec).compile(ctx).steps[0]
+    assert node.instruments == [["A", "B"], ["C"]]
+
+
+def test_errors_surface_after_join(tmp_path: Path) -> None:
+    ctx = _ctx(tmp_path, DMM1=SlowInst(1.0, 0.0), DMM2=SlowInst(2.0))
+    spec = {"steps": [{"parallel": [_measure("DMM1", "x", "boom"), _measure("DMM2", "y")]}]}
+    plan = Sequence("par", spec).compile(ctx)
+    env = {}
+    with pytest.raises(RuntimeError, match="boom"):
+        plan.run(ctx, env)
+    ctx.writer.close()
+    assert "measure:read:DMM2" in ctx.writer.steps
+
+
+def test_results_not_allowed_inside(tmp_path: Path) -> None:
+    ctx = _ctx(tmp_path, DMM1=SlowInst(1.0))
+    spec = {"steps": [{"parallel": [_measure("DMM1", "x"), {"results_update": {}}]}]}
+    with pytest.raises(ValueError, match="results"):
+        Sequence("par", spec).compile(ctx)
+
+
+def test_lane_threads_end_with_the_run(tmp_path: Path) -> None:
+    ctx = _ctx(tmp_path, DMM1=SlowInst(1.0, 0.01), DMM2=SlowInst(2.0, 0.01))
+    spec = {"steps": [{"sweep": {"var": "i", "from": 0, "to": 2, "step": 1, "do": [
+        {"parallel": {"do": [_measure("DMM1", "a"), _measure("DMM2", "b")]}},
+    ]}}]}
+    plan = Sequence("par", spec).compile(ctx)
+    plan.run(ctx, {})
+    node = plan.steps[0].body[0]
+    assert isinstance(node, ParallelNode) and node._pool is None
+    assert not [t for t in threading.enumerate() if t.name.startswith("loadpull-lane")]
+    plan.run(ctx, {})  # still runnable after the pool was released
+    ctx.writer.close()
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from loadpull.core.transforms import TransformRegistry, default_registry
+from loadpull.core.transforms.registry import columns
+
+FREQ = [1e9, 2e9, 3e9]
+
+
+def _same(a, b) -> None:
+    """Batch results (arrays) match per-payload results (lists/floats)."""
+    if isinstance(b, dict):
+        assert set(a) == set(b)
+        for k in b:
+            _same(a[k], b[k])
+    else:
+        np.testing.assert_allclose(np.asarray(a), np.asarray(b), atol=1e-12)
+
+
+def _capture(seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    wave = lambda: {"real": rng.normal(size=3).tolist(), "imag": rng.normal(size=3).tolist()}
+    return {"x": {"type": "frequency", "x_data": FREQ},
+            "a1": wave(), "b1": wave(), "a2": wave(), "b2": wave()}
+
+
+def _terms() -> dict:
+    c = lambda v: {"real": [v] * 3, "imag": [0.01] * 3}
+    return {"freq_hz": FREQ,
+            "directivity_input": c(0.02), "srcmatch_input": c(0.05), "refltrack_input": c(0.9),
+            "directivity_output": c(0.03), "srcmatch_output": c(0.04), "refltrack_output": c(1.1)}
+
+
+def test_apply_many_dispatches_to_batch_and_falls_back() -> None:
+    reg = TransformRegistry()
+    calls = []
+
+    def single(payload, cal):
+        calls.append("one")
+        return {"y": payload["x"] * 2}
+
+    def batch(cols, cal):
+        calls.append("batch")
+        return {"y": cols["x"] * 2, "k": cal["k"]}
+
+    reg.register("double", single, batch=batch, per_row=("y",))
+    out = reg.apply_many("double", [{"x": 1.0}, {"x": [2.0, 3.0]}], {"k": 1})  # ragged: no stack
+    assert calls == ["one", "one"] and out[1]["y"] == [2.0, 3.0, 2.0, 3.0]
+    calls.clear()
+    out = reg.apply_many("double", [{"x": 1.0}, {"x": 2.5}], {"k": 1})
+    assert calls == ["batch"]
+    assert out == [{"y": 2.0, "k": 1}, {"y": 5.0, "k": 1}]
+    assert isinstance(out[0]["y"], float)
+    reg.register("double", single)  # re-registering without batch drops it
+    assert reg.get_batch("double") is None
+    with pytest.raises(KeyError):
+        reg.apply_batch("double", {}, {})
+    with pytest.raises(ValueError, match="per_row"):
+        reg.register("double", single, batch=batch)
+
+
+def test_apply_many_splits_only_per_row_keys_into_lists() -> None:
+    reg = TransformRegistry()
+    reg.register("scale", lambda p, cal: {"y": (np.asarray(p["x"]) * 2).tolist(), "w": [1.0, 2.0]},
+                 batch=lambda cols, cal: {"y": cols["x"] * 2, "w": np.array([1.0, 2.0])},
+                 per_row=("y",))
+    payloads = [{"x": [1.0, 2.0, 3.0]}, {"x": [4.0, 5.0, 6.0]}]
+    out = reg.apply_many("scale", payloads, {})
+    # "w" has a leading axis of 2 == N but is shared, not split
+    assert out == [reg.apply("scale", p, {}) for p in payloads]
+    assert type(out[1]["y"]) is list and type(out[1]["w"]) is list
+
+
+def test_columns_stack_complex_and_share_cal_objects() -> None:
+    cal = {"gain": 1}
+    cols = columns([{"w": {"real": [1, 2], "imag": [0, 1]}, "cal": cal, "n": 1},
+                    {"w": {"real": [3, 4], "imag": [1, 0]}, "cal": cal, "n": 1}])
+    assert cols["w"].shape == (2, 2) and cols["w"][1, 0] == 3 + 1j
+    assert cols["cal"] is cal
+    assert cols["n"].tolist() == [1, 1]
+    with pytest.raises(ValueError):
+        columns([{"a": 1}, {"b": 1}])
+
+
+@pytest.mark.parametrize("method, payloads", [
+    ("z2gamma", [{"real": 50.0 + i, "imag": 10.0, "z0": 50.0} for i in range(3)]),
+    ("z2gamma", [{"real": [20.0, 30.0], "imag": float(i)} for i in range(3)]),
+    ("set_plot_gamma", [{"mag": 0.1 * i, "deg": 30.0 * i} for i in range(3)]),
+    ("set_plot_gamma", [{"real": [0.1, 0.2], "imag": [0.0, 0.1 * i]} for i in range(3)]),
+    ("corr_gamma", [{"wave_data": _capture(i)} for i in range(3)]),
+    ("corr_power", [{"power": 1.0 + i} for i in range(3)]),
+])
+def test_batch_matches_single(method, payloads) -> None:
+    reg = default_registry()
+    cal = {"power_offset": 0.5}
+    assert reg.get_batch(method) is not None
+    single = [reg.apply(method, p, cal) for p in payloads]
+    batched = reg.apply_many(method, payloads, cal)
+    for a, b in zip(batched, single):
+        _same(a, b)
+
+
+def test_corr_waves_batch_shares_terms_and_matches_single() -> None:
+    reg = default_registry()
+    terms = _terms()
+    payloads = [{"wave_data": _capture(i), "terms": terms} for i in range(4)]
+    single = [reg.apply("corr_waves", p, {}) for p in payloads]
+    cols = columns(payloads)
+    assert cols["terms"] is terms
+    out = reg.apply_batch("corr_waves", cols, {})
+    assert out["gamma_L"]["real"].shape == (4, 3)
+    for a, b in zip(reg.apply_many("corr_waves", payloads, {}), single):
+        _same(a, b)
+    gam = reg.apply_many("corr_gamma",
+                         [{"wave_data": p["wave_data"], "terms": terms} for p in payloads], {})
+    _same(gam[2]["gamma_L"], single[2]["gamma_L"])
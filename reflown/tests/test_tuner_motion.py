@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from loadpull.core.tunerpath import MotionModel
+from loadpull.instruments.Focus_CCMT1808 import FocusCCMT1808
+
+
+class FakeCCMT:
+    """Focus controller whose axes move at a fixed speed after each POS command."""
+
+    def __init__(self, speed: float = 20000.0, overhead_s: float = 0.01):
+        self.speed = speed
+        self.overhead_s = overhead_s
+        self.axes = [0, 0, 0]
+        self.busy_until = 0.0
+        self.log: list[str] = []
+
+    def query(self, cmd: str) -> str:
+        self.log.append(cmd)
+        if cmd.startswith("POS?"):
+            return "A1={} A2={} A3={}".format(*self.axes)
+        if cmd.startswith("POS"):
+            vals = [int(v) for v in cmd.split()[2::2]]
+            dist = max(abs(a - b) for a, b in zip(vals, self.axes))
+            self.axes = vals
+            self.busy_until = time.perf_counter() + self.overhead_s + dist / self.speed
+            return "POS OK"
+        if cmd.startswith("STATUS?"):
+            busy = time.perf_counter() < self.busy_until
+            return "STATUS: 0x0001" if busy else "STATUS: 0x0000"
+        raise AssertionError(cmd)
+
+    def read(self) -> str:
+        raise TimeoutError
+
+
+def _tuner(**cfg) -> FocusCCMT1808:
+    t = FocusCCMT1808.__new__(FocusCCMT1808)
+    t._inst = FakeCCMT()
+    t._axis_limits = {1: 10000, 2: 10000, 3: 10000}
+    t._step_size = 1.0
+    t._init_motion({"axis_speed_sps": 5000.0, "move_overhead_s": 0.0, "motion_poll_s": 0.002,
+                    **cfg})
+    return t
+
+
+def test_moves_skip_pos_queries_and_wait_for_completion() -> None:
+    t = _tuner()
+    targets = [{"x": 2000, "y_low": 500}, {"x": 500, "y_low": 1500}, {"x": 1500, "y_low": 0}]
+    for target in targets:
+        out = t.move_all(target)
+        assert out == {"x": target["x"], "y_low": target["y_low"], "y_high": 0}
+        assert time.perf_counter() >= t._inst.busy_until
+    # Only the first move had to read the position
+    assert sum(cmd.startswith("POS?") for cmd in t._inst.log) == 1
+    stats = t.motion_stats()
+    assert stats["moves"] == 3 and stats["pos_queries_skipped"] == 2
+
+
+def test_model_learns_speed() -> None:
+    t = _tuner()
+    for i in range(8):
+        t.move_all({"x": 4000 if i % 2 else 0})
+    # Started at 5000 steps/s; the fake moves at 20000 steps/s
+    assert t.motion.speed["x"] > 10000
+    assert abs(t.motion_stats()["residual_s"]) < 0.05
+
+
+def test_track_position_off_reads_back() -> None:
+    t = _tuner(track_position=False)
+    t.move_all({"x": 100})
+    t.move_all({"x": 200})
+    assert sum(cmd.startswith("POS?") for cmd in t._inst.log) == 4
+
+
+def test_motion_model_overhead_from_short_moves() -> None:
+    m = MotionModel(speed=1000.0, overhead_s=0.0, alpha=0.5)
+    for _ in range(10):
+        m.observe({"x": 0}, {"x": 0}, 0.2, m.predict({"x": 0}, {"x": 0}))
+    assert m.overhead_s == pytest.approx(0.2, rel=0.01)
+    assert m.predict({"x": 0}, {"x": 1000}) == pytest.approx(1.2, rel=0.01)
+
+
+def test_move_timeout_raises_and_forgets_position() -> None:
+    t = _tuner()
+    t.move_all({"x": 1000})
+    t._inst.speed = 1.0  # the next move takes ~1000 s
+    with pytest.raises(TimeoutError):
+        t._move("POS A1 2000 A2 0 A3 0", {"x": 1000, "y_low": 0, "y_high": 0},
+                {"x": 2000, "y_low": 0, "y_high": 0}, timeout_s=0.05)
+    assert t._commanded is None
+    t._inst.busy_until = 0.0  # the move finishes later: its end position is read, not assumed
+    reads = sum(cmd.startswith("POS?") for cmd in t._inst.log)
+    assert t._known_pos() == {"x": 2000, "y_low": 0, "y_high": 0}
+    assert sum(cmd.startswith("POS?") for cmd in t._inst.log) == reads + 1
@@ -0,0 +1,118 @@
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from loadpull.core import tunercal
+from loadpull.core.tunercal import CalPoint, TunerCal
+
+
+def _write_cal(path: Path, freqs=(8.0, 9.0, 10.0), n=40, seed=0) -> Path:
+    rng = np.random.default_rng(seed)
+    lines = ["! Probe\tFrequency\tPt Number\tX pos\tY pos\tGamma s11\tPhi s11\tExtra"]
+    for f in freqs:
+        for i in range(n):
+            mag, deg = rng.uniform(0, 0.95), rng.uniform(-180, 180)
+            lines.append(f"1\t{f}\t{i}\t{i * 10}\t{i * 7}\t{mag:.6f}\t{deg:.4f}\t0")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _reference(points: list[CalPoint], freq: float, gamma: complex) -> CalPoint:
+    freqs = sorted({p.freq_ghz for p in points})
+    nf = min(freqs, key=lambda f: abs(f - freq))
+    return min((p for p in points if p.freq_ghz == nf), key=lambda p: abs(p.gamma_complex - gamma))
+
+
+@pytest.mark.parametrize("kdtree_min", [10**9, 1])
+def test_nearest_matches_linear_scan(tmp_path: Path, monkeypatch, kdtree_min: int) -> None:
+    monkeypatch.setattr(tunercal._FreqTable, "kdtree_min", kdtree_min)
+    cal = TunerCal.from_txt(_write_cal(tmp_path / "cal.txt"))
+    points = cal.points
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        f = rng.uniform(7, 11)
+        g = complex(*rng.uniform(-0.7, 0.7, 2))
+        best, df, dist = cal.nearest(f, g)
+        ref = _reference(points, f, g)
+        assert (best.x, best.y, best.freq_ghz) == (ref.x, ref.y, ref.freq_ghz)
+        assert dist == pytest.approx(abs(ref.gamma_complex - g))
+        assert df == pytest.approx(abs(ref.freq_ghz - f))
+
+
+def test_nearest_many_matches_nearest(tmp_path: Path) -> None:
+    cal = TunerCal.from_txt(_write_cal(tmp_path / "cal.txt"))
+    rng = np.random.default_rng(2)
+    targets = rng.uniform(-0.6, 0.6, 300) + 1j * rng.uniform(-0.6, 0.6, 300)
+    freqs = rng.choice([8.0, 9.1, 10.4], 300)
+    res = cal.nearest_many(freqs, targets)
+    for i in range(0, 300, 17):
+        best, df, dist = cal.nearest(freqs[i], targets[i])
+        assert (res["x"][i], res["y"][i]) == (best.x, best.y)
+        assert res["dist"][i] == pytest.approx(dist)
+        assert res["freq_delta"][i] == pytest.approx(df)
+    scalar = cal.nearest_many(9.0, targets[:5])
+    assert np.all(scalar["freq_ghz"] == 9.0)
+
+
+def test_frequency_tolerance_and_missing_y() -> None:
+    cal = TunerCal([CalPoint(8.0, 1, None, 0.1, 0.0), CalPoint(8.0, 2, None, 0.5, 90.0)])
+    best, _, _ = cal.nearest(8.0, 0.5j)
+    assert best.x == 2 and best.y is None
+    assert math.isnan(cal.nearest_many(8.0, [0.1])["y"][0])
+    with pytest.raises(ValueError):
+        cal.nearest(9.0, 0j, freq_tolerance_ghz=0.5)
+
+
+def _model(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Smooth slide-screw-like tuner: |Γ| grows with probe depth y, phase rotates with x."""
+    return (0.9 * y / 1000.0) * np.exp(-1j * 2 * np.pi * x / 2000.0)
+
+
+def test_solver_beats_nearest_on_sparse_cal() -> None:
+    xs, ys = np.meshgrid(np.arange(0, 2001, 100), np.arange(0, 1001, 100))
+    x, y = xs.ravel(), ys.ravel()
+    g = _model(x, y)
+    cal = TunerCal.from_arrays(np.full(len(x), 9.0), x, y, np.abs(g), np.degrees(np.angle(g)))
+
+    rng = np.random.default_rng(3)
+    tx, ty = rng.uniform(150, 1850, 200), rng.uniform(200, 950, 200)
+    targets = _model(tx, ty)
+    res = cal.solve_many(9.0, targets)
+    reached = np.abs(_model(res["x"], res["y"]) - targets)
+    snapped = cal.nearest_many(9.0, targets)["dist"]
+    assert np.median(reached) < 0.1 * np.median(snapped)
+    assert np.all(res["err"] >= np.abs(res["gamma"] - targets) - 1e-12)
+    assert np.median(res["err"]) < 0.02
+    assert not np.allclose(res["x"], np.round(res["x"]))  # fractional steps
+
+
+def test_solver_falls_back_without_y_axis() -> None:
+    cal = TunerCal([CalPoint(8.0, i, None, 0.1 * i, 0.0) for i in range(5)])
+    res = cal.solve_many(8.0, [0.21])
+    assert res["x"][0] == 2 and res["err"][0] == pytest.approx(0.01)
+
+
+def test_load_uses_npz_cache(tmp_path: Path, monkeypatch) -> None:
+    src = _write_cal(tmp_path / "cal.txt")
+    cal = TunerCal.load(src)
+    assert (tmp_path / "cal.txt.npz").exists()
+
+    tunercal._MEMO.clear()
+    monkeypatch.setattr(TunerCal, "from_txt", staticmethod(lambda p: pytest.fail("re-parsed")))
+    cached = TunerCal.load(src)
+    assert np.array_equal(cached.x, cal.x) and np.allclose(cached.gamma, cal.gamma)
+    assert TunerCal.load(src) is cached  # per-process memo
+
+    # Touched but unchanged content: hash still matches
+    tunercal._MEMO.clear()
+    import os
+    os.utime(src, ns=(1, 1))
+    TunerCal.load(src)
+    monkeypatch.undo()
+
+    # Changed content invalidates the cache
+    tunercal._MEMO.clear()
+    _write_cal(src, freqs=(8.0,), n=5, seed=9)
+    assert len(TunerCal.load(src)) == 5
@@ -0,0 +1,51 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from loadpull.core.transforms import default_registry
+from loadpull.core.tunerpath import order_positions, path_travel
+
+
+def _brute_force(pos: np.ndarray, start) -> float:
+    return min(path_travel(pos, perm, start) for perm in itertools.permutations(range(len(pos))))
+
+
+@pytest.mark.parametrize("start", [None, [0.0, 0.0, 0.0]])
+def test_order_is_permutation_and_near_optimal(start) -> None:
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        pos = rng.integers(0, 5000, size=(7, 3)).astype(float)
+        order, travel = order_positions(pos, start=start)
+        assert sorted(order.tolist()) == list(range(len(pos)))
+        assert travel == pytest.approx(path_travel(pos, order, start))
+        assert travel <= 1.1 * _brute_force(pos, start)
+
+
+def test_ring_sweep_travel_drops() -> None:
+    # Rings in angle order with the x axis wrapping around the phase: a typical sweep file
+    ang = np.tile(np.linspace(-180, 180, 18, endpoint=False), 4)
+    ring = np.repeat(np.arange(4), 18)
+    pos = np.stack([(ang + 180) * 40, ring * 900 + 100, np.zeros_like(ang)], axis=1)
+    order, travel = order_positions(pos, start=pos[0])
+    assert sorted(order) == list(range(len(pos)))
+    assert travel < 0.6 * path_travel(pos, start=pos[0])
+
+
+def test_max_metric_and_validation() -> None:
+    pos = np.array([[0, 0, 0], [10, 3, 0], [20, 0, 0]], dtype=float)
+    assert path_travel(pos, metric="max") == 20.0
+    with pytest.raises(ValueError):
+        order_positions(pos, metric="l2")
+
+
+def test_sweep_point_follows_order(tmp_path) -> None:
+    path = tmp_path / "sweep.csv"
+    path.write_text("mag,deg,real,imag\n0.1,0,0,0\n0.2,90,0,0\n0.3,180,0,0\n")
+    reg = default_registry()
+    order = [2, 0, 1]
+    point = reg.apply("loadpull_sweep_point", {"file": str(path), "index": 1, "order": order}, {})
+    assert point == {"gamma_mag": 0.1, "gamma_deg": 0.0, "orig_index": 0}
+    assert reg.apply("loadpull_sweep_point", {"file": str(path), "index": 3, "order": order},
+                     {}) == {}
+    assert reg.apply("loadpull_sweep_point", {"file": str(path), "index": 2}, {})["orig_index"] == 2
@@ -0,0 +1,76 @@
+import numpy as np
+
+from loadpull.core.scpi import Scpi
+from loadpull.core.transport import FakeTransport
+from loadpull.instruments.rohdeschwarz_ZVA import RSZVA
+
+
+def _zva(responses: list, fmt: str = "REAL,64") -> tuple[RSZVA, FakeTransport]:
+    ft = FakeTransport(responses=responses)
+    ft.open()
+    zva = RSZVA(Scpi(ft, err_poll=False))
+    zva.set_data_format(fmt)
+    return zva, ft
+
+
+def _block(values) -> bytes:
+    payload = np.asarray(values, dtype="<f8").tobytes()
+    size = str(len(payload)).encode()
+    return b"#" + str(len(size)).encode() + size + payload + b"\n"
+
+
+def _wave_values() -> list[float]:
+    # 2 points, 4 traces: each trace holds re/im pairs (trace index, point index)
+    data = []
+    for t in range(4):
+        data += [float(f"{t}.{p}") for p in range(2) for _ in (0, 1)]
+    return data
+
+
+def test_capture_point_uses_single_sweep_ascii() -> None:
+    data = ",".join(str(v) for v in _wave_values())
+    zva, ft = _zva(["1", "LIN;'Trca1,Trcb1,Trca2,Trcb2';1e9,2e9;" + data], fmt="ASC")
+
+    out = zva.capture_point()
+
+    assert sum(1 for w in ft.writes if "INIT1:IMM" in w) == 1
+    assert out["x"] == {"type": "frequency", "x_data": [1e9, 2e9]}
+    assert out["a1"]["real"] == [0.0, 0.1]
+    assert out["b1"]["imag"] == [1.0, 1.1]
+    assert out["a2"]["real"] == [2.0, 2.1]
+    assert out["b2"]["real"] == [3.0, 3.1]
+
+
+def test_capture_point_binary_blocks() -> None:
+    blocks = _block([1e9, 2e9]).rstrip(b"\n") + b";" + _block(_wave_values())
+    zva, ft = _zva(["1", "LIN;'Trca1,Trcb1,Trca2,Trcb2'", blocks])
+
+    out = zva.capture_point()
+
+    assert "FORM:DATA REAL,64;:FORM:BORD NORM" in ft.writes
+    assert sum(1 for w in ft.writes if "INIT1:IMM" in w) == 1
+    assert isinstance(out["b2"]["real"], np.ndarray)
+    np.testing.assert_array_equal(out["x"]["x_data"], [1e9, 2e9])
+    np.testing.assert_array_equal(out["a1"]["real"], [0.0, 0.1])
+    np.testing.assert_array_equal(out["b2"]["imag"], [3.0, 3.1])
+
+
+def test_fetch_sdata_binary_block() -> None:
+    zva, ft = _zva([_block([1.0, -1.0, 0.5, 0.25])])
+
+    out = zva.fetch_sdata()
+
+    assert ft.writes[-1] == "CALC1:DATA? SDATA"
+    np.testing.assert_array_equal(out["real"], [1.0, 0.5])
+    np.testing.assert_array_equal(out["imag"], [-1.0, 0.25])
+    assert "csv" not in out
+
+
+def test_capture_point_rejects_missing_wave_trace() -> None:
+    zva, _ = _zva(["1", "LIN;'Trca1';1e9;1,2"], fmt="ASC")
+    try:
+        zva.capture_point()
+    except RuntimeError as exc:
+        assert "Trcb1" in str(exc)
+    else:
+        raise AssertionError("expected RuntimeError")
@@ -6,6 +6,8 @@ import shutil
 from pathlib import Path
 from typing import Iterable, List
 
+from .loaders import iter_jsonl
+
 
 def _normalize_value(val):
     if val is None:
@@ -38,19 +40,10 @@ def jsonl_to_csv(in_path: str | Path, out_path: str | Path) -> int:
 
     # First pass: collect headers
     headers: set[str] = set()
-    with src.open("r", encoding="utf-8") as fp:
-        for line in fp:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rec = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if isinstance(rec, dict):
-                for k in rec.keys():
-                    if _include_field(str(k)):
-                        headers.add(str(k))
+    for rec in iter_jsonl(src):
+        for k in rec.keys():
+            if _include_field(str(k)):
+                headers.add(str(k))
 
     fieldnames = sorted(headers)
 
@@ -60,20 +53,10 @@ def jsonl_to_csv(in_path: str | Path, out_path: str | Path) -> int:
     with dst.open("w", encoding="utf-8", newline="") as out_fp:
         writer = csv.DictWriter(out_fp, fieldnames=fieldnames)
         writer.writeheader()
-        with src.open("r", encoding="utf-8") as in_fp:
-            for line in in_fp:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    rec = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if not isinstance(rec, dict):
-                    continue
-                row = {k: _normalize_value(rec.get(k, "")) for k in fieldnames}
-                writer.writerow(row)
-                rows += 1
+        for rec in iter_jsonl(src):
+            row = {k: _normalize_value(rec.get(k, "")) for k in fieldnames}
+            writer.writerow(row)
+            rows += 1
     return rows
 
 
@@ -1,23 +1,15 @@
 from __future__ import annotations
 
 import csv
-import json
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, Callable
 
+from loadpull.core.results import iter_records
+
 
 def iter_jsonl(path: Path) -> Iterator[dict]:
-    with path.open("r", encoding="utf-8") as fp:
-        for line in fp:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rec = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if isinstance(rec, dict):
-                yield rec
+    """Yield records, expanding delta-encoded logs (see loadpull.core.results)."""
+    yield from iter_records(path)
 
 
 def iter_csv(path: Path) -> Iterator[dict]: